@@ -0,0 +1,64 @@
+"""
+basket 주문 전송 시간 비교 (주문별 순차 호출 vs send_basket_orders)
+
+실행 방법:
+    python benchmarks/adhoc/bench_basket.py
+
+localhost stand-in 서버에 SERVER_DELAY만큼의 처리 시간을 주고, 실전 투자의 기본 속도 제한(초당 20건)을 적용한다.
+basket 전송은 속도 제한이 허용하는 만큼 주문을 동시에 보내므로, 전체 시간은 속도 제한에 의해 정해진다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from harness import StandInServer, KEY_INFO, ACCOUNT_INFO  # pylint: disable=import-error
+
+from pykis import Api, DomainInfo  # pylint: disable=wrong-import-order
+
+ORDER_COUNT = 60
+SERVER_DELAY = 0.1
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    orders = [(f"{i:06d}", "buy", 1, 10000) for i in range(ORDER_COUNT)]
+
+    with StandInServer(server_delay=SERVER_DELAY) as server:
+        domain = DomainInfo(url=server.url)
+        for hash_mode in ["request", "skip"]:
+            api = Api(KEY_INFO, domain, ACCOUNT_INFO, hash_mode=hash_mode)
+            api.create_token()
+
+            start = time.perf_counter()
+            for ticker, _, amount, price in orders:
+                api.buy_kr_stock(ticker, amount, price)
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = api.send_basket_orders(orders)
+            basket = time.perf_counter() - start
+            assert result["성공"].all()
+
+            print(f"{ORDER_COUNT} orders (hash_mode={hash_mode}): "
+                  f"sequential {sequential:6.2f} s | basket {basket:6.2f} s | "
+                  f"basket latency median {result['응답시간'].median() * 1000:6.1f} ms")
+            api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+API 응답 -> DataFrame 변환 속도 비교 (기존 apply 방식 vs schema 기반 변환)
+
+실행 방법:
+    python benchmarks/adhoc/bench_convert.py
+
+기존 방식은 dict list로 DataFrame을 만든 뒤 column별 apply(pd.to_numeric),
+행 단위 apply(매도/매수 변환, 거래소 코드 변환), rename을 순서대로 실행한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+import random
+
+from harness import measure, print_summary, Json  # pylint: disable=import-error
+
+import pandas as pd  # pylint: disable=wrong-import-order
+from pykis.market_code_map import MarketCodeMap  # pylint: disable=wrong-import-order
+from pykis.response_converter import KR_STOCK_BALANCE_SCHEMA, \
+    OS_ORDERS_SCHEMA  # pylint: disable=wrong-import-order
+from pykis.schema import to_dataframe  # pylint: disable=wrong-import-order
+
+REPEAT = 200
+ROW_COUNTS = [100, 1000, 10000]
+
+
+def kr_balance_rows(count: int) -> List[Json]:
+    """
+    국내 주식 잔고 조회 output 형식의 데이터
+    """
+    return [{
+        "pdno": f"{i:06d}", "prdt_name": f"종목{i % 50}",
+        "hldg_qty": str(random.randint(1, 1000)),
+        "ord_psbl_qty": str(random.randint(1, 1000)),
+        "pchs_avg_pric": f"{random.random() * 1e5:.4f}",
+        "evlu_pfls_rt": f"{random.random() * 10:.2f}", "prpr": str(random.randint(1000, 100000)),
+        "bfdy_cprs_icdc": str(random.randint(-1000, 1000)), "fltt_rt": f"{random.random():.2f}",
+    } for i in range(count)]
+
+
+def os_order_rows(count: int) -> List[Json]:
+    """
+    미체결 해외 주식 주문 조회 output 형식의 데이터
+    """
+    markets = ["NASD", "NYS", "TKSE", "SHAA"]
+    return [{
+        "odno": f"{i:010d}", "pdno": f"TICK{i % 30}", "ft_ord_qty": str(random.randint(1, 100)),
+        "ft_ccld_qty": "0", "nccs_qty": str(random.randint(1, 100)),
+        "ft_ord_unpr3": f"{random.random() * 500:.4f}",
+        "sll_buy_dvsn_cd": random.choice(["01", "02"]),
+        "ord_tmd": "093000", "ord_gno_brno": "06010", "orgn_odno": "",
+        "ovrs_excg_cd": random.choice(markets), "tr_crcy_cd": "USD", "prcs_stat_name": "완료",
+        "rjct_rson_name": "", "rjct_rson": "",
+    } for i in range(count)]
+
+
+def legacy_kr_balance(rows: List[Json]) -> pd.DataFrame:
+    """
+    기존 방식의 국내 주식 잔고 변환
+    """
+    tdf = pd.DataFrame(rows)
+    tdf.set_index("pdno", inplace=True)
+    cf1 = ["prdt_name", "hldg_qty", "ord_psbl_qty", "pchs_avg_pric",
+           "evlu_pfls_rt", "prpr", "bfdy_cprs_icdc", "fltt_rt"]
+    cf2 = ["종목명", "보유수량", "매도가능수량", "매입단가", "수익율", "현재가", "전일대비", "등락"]
+    tdf = tdf[cf1]
+    tdf[cf1[1:]] = tdf[cf1[1:]].apply(pd.to_numeric)
+    return tdf.rename(columns=dict(zip(cf1, cf2)))
+
+
+def legacy_os_orders(rows: List[Json], market_code_map: MarketCodeMap) -> pd.DataFrame:
+    """
+    기존 방식의 미체결 해외 주식 주문 변환
+    """
+    data = pd.DataFrame(rows)
+    data.set_index("odno", inplace=True)
+    rename_map = {
+        "pdno": "종목코드", "ft_ord_qty": "주문수량", "ft_ccld_qty": "체결수량",
+        "nccs_qty": "미체결수량", "ft_ord_unpr3": "주문가격", "sll_buy_dvsn_cd": "매수매도구분",
+        "ord_tmd": "시간", "ord_gno_brno": "주문점", "orgn_odno": "원번호",
+        "ovrs_excg_cd": "해외거래소코드", "tr_crcy_cd": "거래통화코드",
+        "prcs_stat_name": "처리상태명", "rjct_rson_name": "거부사유명", "rjct_rson": "거부사유",
+    }
+    data = data[rename_map.keys()]
+    data["sll_buy_dvsn_cd"] = data["sll_buy_dvsn_cd"].apply(
+        lambda value: "매도" if value == "01" else "매수")
+    data["ovrs_excg_cd"] = data["ovrs_excg_cd"].apply(market_code_map.to_3)
+    return data.rename(columns=rename_map)
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    random.seed(0)
+    market_code_map = MarketCodeMap()
+    os_schema = OS_ORDERS_SCHEMA.with_mapping("ovrs_excg_cd", market_code_map.map_4_to_3)
+
+    for count in ROW_COUNTS:
+        print(f"--- {count} rows")
+        balance = kr_balance_rows(count)
+        orders = os_order_rows(count)
+        repeat = max(REPEAT * 100 // count, 10)
+
+        def kr_balance_apply(rows=balance):
+            legacy_kr_balance(rows)
+
+        def kr_balance_schema(rows=balance):
+            to_dataframe(rows, KR_STOCK_BALANCE_SCHEMA)
+
+        def os_orders_apply(rows=orders):
+            legacy_os_orders(rows, market_code_map)
+
+        def os_orders_schema(rows=orders):
+            to_dataframe(rows, os_schema)
+
+        print_summary("kr balance: apply", measure(kr_balance_apply, repeat))
+        print_summary("kr balance: schema", measure(kr_balance_schema, repeat))
+        print_summary("os orders: apply", measure(os_orders_apply, repeat))
+        print_summary("os orders: schema", measure(os_orders_schema, repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+hedged request 사용 여부에 따른 시세 조회 응답 시간 비교
+
+실행 방법:
+    python benchmarks/adhoc/bench_hedging.py
+
+localhost stand-in 서버는 시세 조회 request의 TAIL_RATIO 비율을 TAIL_DELAY만큼 늦게 응답한다.
+HedgePolicy를 사용하면 응답이 최근 응답 시간의 percentile보다 늦어질 때 request를 한번 더 보내므로
+p99 응답 시간이 늦은 응답의 처리 시간 대신 보통 응답의 처리 시간에 가까워진다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+from harness import StandInServer, measure, print_summary, KEY_INFO  # pylint: disable=import-error
+
+from pykis import Api, DomainInfo, HedgePolicy, RateLimiter  # pylint: disable=wrong-import-order
+
+REPEAT = 1000
+SERVER_DELAY = 0.005
+TAIL_RATIO = 0.03
+TAIL_DELAY = 0.2
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    random.seed(0)
+    with StandInServer(server_delay=SERVER_DELAY, tail_ratio=TAIL_RATIO,
+                       tail_delay=TAIL_DELAY) as server:
+        domain = DomainInfo(url=server.url)
+        policies = [("no hedging", None),
+                    ("HedgePolicy(percentile=90, budget=0.1)",
+                     HedgePolicy(percentile=90, budget=0.1))]
+
+        for name, policy in policies:
+            # 서버 응답 시간만 비교하기 위해 속도 제한을 넉넉하게 설정한다.
+            rate_limiter = RateLimiter(domain, rates={"total": 1000, "quote": 1000})
+            api = Api(KEY_INFO, domain, rate_limiter=rate_limiter, hedge_policy=policy)
+            api.create_token()
+
+            def fetch(api=api):
+                api.get_kr_quote("005930", max_age=0)
+
+            print_summary(name, measure(fetch, REPEAT, warmup=50))
+            if policy is not None:
+                print(f"{'':<40} hedges {policy.hedges} / {policy.requests} requests, "
+                      f"{policy.hedge_wins} won")
+            api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+metrics 기록 여부에 따른 request 처리 overhead 비교
+
+실행 방법:
+    python benchmarks/adhoc/bench_metrics.py
+
+네트워크 시간을 제외하고 client 쪽 처리 시간만 비교하기 위해, 미리 만든 응답을 바로 반환하는
+in-memory transport로 send_get_request를 호출한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from harness import measure, print_summary, Json  # pylint: disable=import-error
+
+from pykis import APIResponse, RawResponse, Transport, \
+    send_get_request, enable_metrics, disable_metrics  # pylint: disable=wrong-import-order
+
+REPEAT = 200
+BATCH = 1000
+
+URL = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-price"
+HEADERS = {"tr_id": "FHKST01010100", "content-type": "application/json"}
+PARAMS = {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": "005930"}
+BODY = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.",
+        "output": {f"field_{i:02d}": str(i * 100) for i in range(75)}}
+
+
+class InMemoryTransport(Transport):
+    """
+    네트워크 없이 미리 만든 응답을 반환하는 transport
+    """
+
+    def __init__(self, response: RawResponse) -> None:
+        super().__init__()
+        self.response = response
+
+    def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        return self.response
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    response = RawResponse(200, {"tr_id": "FHKST01010100"}, json.dumps(BODY).encode("utf-8"))
+    transport = InMemoryTransport(response)
+
+    def baseline():
+        for _ in range(BATCH):
+            res = APIResponse(transport.get(URL, HEADERS, PARAMS))
+            res.raise_if_error()
+
+    def send():
+        for _ in range(BATCH):
+            send_get_request(URL, HEADERS, PARAMS, transport=transport)
+
+    print(f"time per {BATCH} requests (client side only)")
+    print_summary("APIResponse only (no instrumentation)", measure(baseline, REPEAT))
+
+    disable_metrics()
+    print_summary("send_get_request, metrics disabled", measure(send, REPEAT))
+
+    metrics = enable_metrics()
+    print_summary("send_get_request, metrics enabled", measure(send, REPEAT))
+    disable_metrics()
+
+    print(metrics.summary())
+
+
+if __name__ == "__main__":
+    main()
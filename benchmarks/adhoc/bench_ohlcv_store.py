@@ -0,0 +1,84 @@
+"""
+OhlcvStore 읽기 속도 측정
+
+실행 방법:
+    python benchmarks/adhoc/bench_ohlcv_store.py
+
+임시 폴더에 2,000 종목 x 10년 일봉을 저장한 뒤, 전체 종목을 한번에 읽는 시간과
+종목별로 최근 1년만 읽는 시간, 종목별로 읽어서 처리할 때의 최대 메모리 사용량을 측정한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tempfile
+import time
+import tracemalloc
+
+import harness  # pylint: disable=import-error,unused-import
+
+import numpy as np  # pylint: disable=wrong-import-order
+import pandas as pd  # pylint: disable=wrong-import-order
+from pykis import OhlcvStore  # pylint: disable=wrong-import-order
+
+TICKER_COUNT = 2000
+DATES = pd.bdate_range("2015-01-01", "2024-12-31", name="Date")
+
+
+def make_ohlcv(seed: int) -> pd.DataFrame:
+    """
+    임의의 일봉 데이터
+    """
+    rng = np.random.default_rng(seed)
+    close = 10000 + rng.integers(-100, 100, len(DATES)).cumsum()
+    return pd.DataFrame({
+        "Open": close, "High": close + 100, "Low": close - 100, "Close": close,
+        "Volume": rng.integers(1000, 100000, len(DATES)),
+    }, index=DATES)
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    tickers = [f"{i:06d}" for i in range(TICKER_COUNT)]
+    with tempfile.TemporaryDirectory() as path:
+        store = OhlcvStore(path)
+        start = time.perf_counter()
+        for i, ticker in enumerate(tickers):
+            store.write(ticker, make_ohlcv(i))
+        print(f"write {TICKER_COUNT} tickers x {len(DATES)} rows: "
+              f"{time.perf_counter() - start:6.2f} s")
+
+        start = time.perf_counter()
+        data = store.read_many(tickers)
+        print(f"read_many (all rows, {len(data)} rows): {time.perf_counter() - start:6.2f} s, "
+              f"{data.memory_usage(deep=True).sum() / 2**20:.0f} MiB")
+        del data
+
+        start = time.perf_counter()
+        for ticker in tickers:
+            store.read(ticker, start="2024-01-01")
+        print(f"read per ticker (last 1 year): {time.perf_counter() - start:6.2f} s")
+
+        # 종목별로 읽고 버리면 전체 데이터 크기와 관계없이 한 종목 분량의 메모리만 사용한다.
+        tracemalloc.start()
+        closes = [store.read(ticker)["Close"].iloc[-1] for ticker in tickers]
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"read per ticker (all rows, {len(closes)} tickers): peak {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+hash_mode에 따른 국내 주식 주문 latency 비교
+
+실행 방법:
+    python benchmarks/adhoc/bench_order.py
+
+localhost stand-in 서버에 SERVER_DELAY만큼의 처리 시간을 주어 실제 서버와의 왕복 시간을 흉내낸다.
+hash_mode="request"는 주문마다 /uapi/hashkey 왕복이 추가되므로 주문 latency가 약 2배가 된다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from harness import StandInServer, measure, print_summary, \
+    KEY_INFO, ACCOUNT_INFO  # pylint: disable=import-error
+
+from pykis import Api, DomainInfo, RateLimiter  # pylint: disable=wrong-import-order
+
+REPEAT = 200
+SERVER_DELAY = 0.005
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    with StandInServer(server_delay=SERVER_DELAY) as server:
+        domain = DomainInfo(url=server.url)
+        unlimited = {"total": None, "quote": None, "account": None, "order": None}
+
+        for hash_mode in ["request", "skip"]:
+            api = Api(KEY_INFO, domain, ACCOUNT_INFO, hash_mode=hash_mode,
+                      rate_limiter=RateLimiter(domain, rates=unlimited))
+            api.create_token()
+
+            def order(api=api):
+                api.buy_kr_stock("005930", 1, 71000)
+
+            print_summary(f"buy_kr_stock (hash_mode={hash_mode})", measure(order, REPEAT))
+            api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+RealtimeClient의 실시간 체결가 수신 처리량 측정
+
+실행 방법:
+    python benchmarks/adhoc/bench_realtime.py
+
+localhost WebSocket stand-in 서버가 H0STCNT0 형식의 frame을 최대한 빠르게 보내고,
+client가 frame을 KrTrade로 변환하여 async iterator로 전달하는 처리량을 측정한다.
+중간에 한번 연결을 끊어서 재연결 후 재등록까지 함께 확인한다. (websockets 필요)
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+
+import harness  # pylint: disable=import-error,unused-import
+
+import websockets  # pylint: disable=wrong-import-order
+from pykis.realtime import RealtimeClient, KrTrade  # pylint: disable=wrong-import-order
+
+FRAMES_PER_CONNECTION = 20000
+RECORDS_PER_FRAME = 3
+
+TRADE_FIELDS = ["005930", "093000", "71000", "2", "-100", "-0.14", "71050.12", "71100", "71500",
+                "70500", "71100", "71000", "10", "123456", "8765432100", "100", "200", "100",
+                "120.5", "5000", "6000", "1", "55.1", "98.2", "090000", "5", "-100", "091500",
+                "2", "400", "093000", "5", "-500", "20240102", "20", "N", "1000", "2000",
+                "30000", "40000", "0.05", "100000", "123.4", "0", "N", "71100"]
+
+
+async def stand_in_handler(connection, *_) -> None:
+    """
+    등록 요청을 받으면 체결가 frame을 보내고, 보낸 뒤에는 연결을 끊는다.
+    """
+    message = json.loads(await connection.recv())
+    ticker = message["body"]["input"]["tr_key"]
+    await connection.send(json.dumps({
+        "header": {"tr_id": "H0STCNT0", "tr_key": ticker, "encrypt": "N"},
+        "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": "SUBSCRIBE SUCCESS"},
+    }))
+    await connection.send(json.dumps({"header": {"tr_id": "PINGPONG",
+                                                 "datetime": "20240102093000"}}))
+
+    data = "^".join(TRADE_FIELDS * RECORDS_PER_FRAME)
+    frame = f"0|H0STCNT0|{RECORDS_PER_FRAME:03d}|{data}"
+    for _ in range(FRAMES_PER_CONNECTION):
+        await connection.send(frame)
+    await connection.close()
+
+
+async def run() -> None:
+    """
+    benchmark 실행
+    """
+    async with websockets.serve(stand_in_handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = RealtimeClient(approval_key="benchmark", url=f"ws://127.0.0.1:{port}",
+                                reconnect_delay=0.01)
+        async with client:
+            await client.subscribe_trades("005930")
+
+            expected = FRAMES_PER_CONNECTION * RECORDS_PER_FRAME
+            for round_index in range(2):
+                count = 0
+                start = time.perf_counter()
+                async for record in client:
+                    assert isinstance(record, KrTrade) and record.price == 71000
+                    count += 1
+                    if count == expected:
+                        break
+                elapsed = time.perf_counter() - start
+                name = "first connection" if round_index == 0 else "after reconnect"
+                print(f"{name:<20} {count} records in {elapsed:6.3f} s "
+                      f"({count / elapsed:10.0f} records/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,112 @@
+"""
+APIResponse 생성 비용 비교 (기존 eager 방식 vs lazy 방식, json vs orjson)
+
+실행 방법:
+    python benchmarks/adhoc/bench_response.py
+
+시세 polling에서처럼 현재가 조회 응답을 받아 return code 확인 후 output의 값 하나만 읽는 비용을 측정한다.
+네트워크 비용을 제외하기 위해 미리 만들어둔 requests.Response를 사용한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Optional
+import json
+
+from harness import measure, print_summary, Json  # pylint: disable=import-error
+
+import requests  # pylint: disable=wrong-import-order
+from requests.structures import CaseInsensitiveDict  # pylint: disable=wrong-import-order
+from pykis import APIResponse, set_json_decoder  # pylint: disable=wrong-import-order
+
+REPEAT = 200
+BATCH = 1000
+
+# 국내 주식 현재가 시세 응답의 output field 수와 비슷하게 구성
+QUOTE_OUTPUT = {f"field_{i:02d}": str(i * 100) for i in range(75)}
+QUOTE_OUTPUT.update({"stck_prpr": "71000", "stck_mxpr": "92300", "stck_llam": "49700"})
+QUOTE_BODY = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.",
+              "output": QUOTE_OUTPUT}
+HEADERS = {
+    "Content-Type": "application/json;charset=UTF-8", "Date": "Tue, 02 Jan 2024 00:30:00 GMT",
+    "Connection": "keep-alive", "Keep-Alive": "timeout=5", "Transfer-Encoding": "chunked",
+    "tr_id": "FHKST01010100", "tr_cont": "", "gt_uid": "0123456789abcdef0123456789abcdef",
+}
+
+
+class LegacyAPIResponse:  # pylint: disable=too-few-public-methods
+    """
+    기존 방식의 APIResponse. 모든 값을 생성 시점에 계산한다.
+    """
+
+    def __init__(self, resp: requests.Response) -> None:
+        self.http_code: int = resp.status_code
+        self.header: Json = {key: resp.headers.get(key)
+                             for key in resp.headers.keys() if key.islower()}
+        self.body: Json = resp.json()
+        self.message: str = self.body.get("msg", self.body.get("msg1", ""))
+        self.return_code: Optional[str] = self.body.get("rt_cd", None)
+        self.outputs: List[Json] = [self.body[target] for target in ["output", "output1", "output2"]
+                                    if target in self.body]
+
+
+def make_response() -> requests.Response:
+    """
+    현재가 조회 응답
+    """
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers = CaseInsensitiveDict(HEADERS)
+    resp._content = json.dumps(QUOTE_BODY).encode("utf-8")  # pylint: disable=protected-access
+    resp.encoding = "utf-8"
+    return resp
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    resp = make_response()
+
+    def legacy():
+        for _ in range(BATCH):
+            res = LegacyAPIResponse(resp)
+            assert res.return_code == "0" and res.outputs[0]["stck_prpr"] == "71000"
+
+    def lazy():
+        for _ in range(BATCH):
+            res = APIResponse(resp)
+            res.raise_if_error()
+            assert res.outputs[0]["stck_prpr"] == "71000"
+
+    print(f"time per {BATCH} responses")
+    print_summary("eager + resp.json()", measure(legacy, REPEAT))
+
+    set_json_decoder(json.loads)
+    print_summary("lazy + json.loads", measure(lazy, REPEAT))
+
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        print("orjson이 설치되어 있지 않아 orjson 측정을 생략합니다. (pip install orjson)")
+    else:
+        set_json_decoder(orjson.loads)  # pylint: disable=no-member
+        print_summary("lazy + orjson.loads", measure(lazy, REPEAT))
+
+    set_json_decoder()
+
+
+if __name__ == "__main__":
+    main()
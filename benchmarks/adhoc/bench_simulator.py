@@ -0,0 +1,77 @@
+"""
+가상 거래소(SimulatedExchange)의 주문 처리 속도 측정
+
+실행 방법:
+    python benchmarks/adhoc/bench_simulator.py
+
+SimulatorTransport(socket 없음)와 SimulatorServer(localhost HTTP)로 같은 주문을 보내서
+호가창 체결 비용과 HTTP 왕복 비용을 나누어 본다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from harness import measure, print_summary, \
+    KEY_INFO, ACCOUNT_INFO  # pylint: disable=import-error
+
+from pykis import Api, DomainInfo, RateLimiter, \
+    SimulatedExchange, SimulatorServer, SimulatorTransport  # pylint: disable=wrong-import-order
+
+REPEAT = 2000
+TICKER = "005930"
+BASE_PRICE = 70000
+
+
+def create_exchange() -> SimulatedExchange:
+    """
+    측정용 가상 거래소를 만든다.
+    """
+    exchange = SimulatedExchange(initial_cash=10 ** 12)
+    exchange.add_ticker(TICKER, BASE_PRICE)
+    exchange.add_liquidity(TICKER, levels=10, amount=10 ** 6)
+    return exchange
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    exchange = create_exchange()
+
+    def submit():   # 체결되는 매수 + 매도 (API 없이 호가창만)
+        exchange.submit_order("12345678-01", TICKER, True, 1)
+        exchange.submit_order("12345678-01", TICKER, False, 1)
+
+    print_summary("submit_order (buy + sell, direct)", measure(submit, REPEAT))
+
+    api = Api(KEY_INFO, account_info=ACCOUNT_INFO, hash_mode="skip",
+              transport=SimulatorTransport(create_exchange()),
+              rate_limiter=RateLimiter.unlimited())
+
+    def trade(api=api):
+        api.buy_kr_stock(TICKER, 1, 0)
+        api.sell_kr_stock(TICKER, 1, 0)
+
+    print_summary("buy + sell (SimulatorTransport)", measure(trade, REPEAT))
+
+    with SimulatorServer(create_exchange()) as server:
+        api = Api(KEY_INFO, DomainInfo(url=server.url), ACCOUNT_INFO, hash_mode="skip",
+                  rate_limiter=RateLimiter.unlimited())
+        print_summary("buy + sell (SimulatorServer)",
+                      measure(lambda: trade(api), REPEAT // 10))
+        api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+일회성 requests.get/post 방식과 keep-alive Transport 방식의 request latency 비교
+
+실행 방법:
+    python benchmarks/adhoc/bench_transport.py
+
+localhost stand-in 서버를 사용하므로 TLS handshake 비용은 포함되지 않는다.
+실제 서버(openapi.koreainvestment.com:9443)에서는 매 요청마다 TLS handshake가 추가되므로
+두 방식의 차이는 이 benchmark의 결과보다 더 크게 나타난다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from harness import StandInServer, measure, print_summary  # pylint: disable=import-error
+
+from pykis.request_utility import send_get_request, get_base_headers  # pylint: disable=wrong-import-order
+from pykis.transport import Transport  # pylint: disable=wrong-import-order
+
+REPEAT = 500
+
+
+def main() -> None:
+    """
+    benchmark 실행
+    """
+    with StandInServer() as server, Transport() as transport:
+        url = f"{server.url}/uapi/domestic-stock/v1/quotations/inquire-price"
+        headers = get_base_headers()
+        params = {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": "005930"}
+
+        def one_shot():
+            send_get_request(url, headers, params)
+
+        def pooled():
+            send_get_request(url, headers, params, transport=transport)
+
+        print_summary("one-shot requests.get", measure(one_shot, REPEAT))
+        print_summary("keep-alive Transport", measure(pooled, REPEAT))
+
+
+if __name__ == "__main__":
+    main()
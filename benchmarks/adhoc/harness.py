@@ -0,0 +1,153 @@
+"""
+ad-hoc benchmark 공용 유틸리티 모듈
+
+ad-hoc benchmark들은 실제 한국투자증권 서버 대신 localhost에 띄운 stand-in 서버를 사용하므로
+네트워크 환경이나 API key 없이 실행할 수 있다. 결과는 사람이 읽는 text로 출력하며,
+commit 간에 비교할 결과는 benchmarks/suite.py를 사용한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Any, List, Tuple
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+# benchmarks 폴더의 common 모듈(src 경로 추가, 가짜 key/계좌 정보)을 사용한다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from common import KEY_INFO, ACCOUNT_INFO, Json  # pylint: disable=import-error,wrong-import-position,unused-import
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    KIS API의 응답 형식을 흉내내는 request handler.
+    HTTP/1.1 keep-alive를 지원한다.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_delay: float = 0.0
+    tail_ratio: float = 0.0
+    tail_delay: float = 0.0
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _reply(self, body: Json) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        시세 조회 응답. tail_ratio 비율의 request는 tail_delay만큼 더 늦게 응답한다.
+        """
+        slow = random.random() < self.tail_ratio
+        time.sleep(self.server_delay + (self.tail_delay if slow else 0.0))
+        self._reply({"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.",
+                     "output": {"stck_prpr": "71000", "stck_mxpr": "92300", "stck_llam": "49700"}})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        token, hashkey, 주문 응답
+        """
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.server_delay)
+
+        if self.path == "/oauth2/tokenP":
+            self._reply({"access_token": "benchmark-token", "token_type": "Bearer",
+                         "expires_in": 86400})
+        elif self.path == "/uapi/hashkey":
+            self._reply({"HASH": "0" * 64})
+        else:
+            self._reply({"rt_cd": "0", "msg_cd": "APBK0013", "msg1": "주문 전송 완료 되었습니다.",
+                         "output": {"KRX_FWDG_ORD_ORGNO": "06010", "ODNO": "0000001234",
+                                    "ORD_TMD": "090000"}})
+
+
+class StandInServer:
+    """
+    localhost에서 동작하는 KIS API stand-in 서버
+    """
+
+    def __init__(self, server_delay: float = 0.0,
+                 tail_ratio: float = 0.0, tail_delay: float = 0.0) -> None:
+        """
+        server_delay: 모든 request의 처리 시간 (초)
+        tail_ratio: 시세 조회 request 중 늦게 응답할 비율 (0~1)
+        tail_delay: 늦게 응답하는 request에 추가되는 처리 시간 (초)
+        """
+        handler = type("Handler", (StandInHandler,), {"server_delay": server_delay,
+                                                      "tail_ratio": tail_ratio,
+                                                      "tail_delay": tail_delay})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        stand-in 서버의 base url
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def measure(function: Callable[[], Any], repeat: int, warmup: int = 5) -> List[float]:
+    """
+    function을 repeat번 실행하여 각 실행 시간(초)을 list로 반환한다.
+    """
+    for _ in range(warmup):
+        function()
+
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed.append(time.perf_counter() - start)
+    return elapsed
+
+
+def summarize(elapsed: List[float]) -> Tuple[float, float, float]:
+    """
+    실행 시간 목록의 (평균, 중앙값, p99)를 ms 단위로 반환한다.
+    """
+    ordered = sorted(elapsed)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (statistics.mean(elapsed) * 1000, statistics.median(elapsed) * 1000, p99 * 1000)
+
+
+def print_summary(name: str, elapsed: List[float]) -> None:
+    """
+    실행 시간 요약을 출력한다.
+    """
+    mean, median, p99 = summarize(elapsed)
+    print(f"{name:<40} mean {mean:8.3f} ms | median {median:8.3f} ms | p99 {p99:8.3f} ms")
@@ -0,0 +1,38 @@
+"""
+pykis benchmark 공용 설정 모듈
+
+benchmark는 repository를 clone한 상태에서 바로 실행할 수 있도록 src 경로를 추가하고,
+실제 한국투자증권 계정 대신 사용할 가짜 key/계좌 정보를 제공한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+Json = Dict[str, Any]
+
+KEY_INFO = {
+    "appkey": "benchmark-appkey",
+    "appsecret": "benchmark-appsecret",
+}
+
+ACCOUNT_INFO = {
+    "account_code": "12345678",
+    "product_code": "01",
+}
@@ -0,0 +1,181 @@
+"""
+benchmark에 사용할 KIS API 응답 payload 모음
+
+실제 API 응답과 같은 field 구성과 크기로 만든 고정된(seed를 사용하는) 응답 body를 제공한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+import json
+import random
+
+from common import Json  # pylint: disable=import-error
+
+from pykis import RawResponse  # pylint: disable=wrong-import-order
+
+OK = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다."}
+
+RESPONSE_HEADERS = {
+    "Content-Type": "application/json;charset=UTF-8", "Date": "Tue, 02 Jan 2024 00:30:00 GMT",
+    "Connection": "keep-alive", "Keep-Alive": "timeout=5", "Transfer-Encoding": "chunked",
+    "gt_uid": "0123456789abcdef0123456789abcdef",
+}
+
+# 국내 주식 현재가 시세(inquire-price) output의 field 이름
+QUOTE_FIELDS = [
+    "iscd_stat_cls_code", "marg_rate", "rprs_mrkt_kor_name", "new_hgpr_lwpr_cls_code",
+    "bstp_kor_isnm", "temp_stop_yn", "oprc_rang_cont_yn", "clpr_rang_cont_yn", "crdt_able_yn",
+    "grmn_rate_cls_code", "elw_pblc_yn", "stck_prpr", "prdy_vrss", "prdy_vrss_sign", "prdy_ctrt",
+    "acml_tr_pbmn", "acml_vol", "prdy_vrss_vol_rate", "stck_oprc", "stck_hgpr", "stck_lwpr",
+    "stck_mxpr", "stck_llam", "stck_sdpr", "wghn_avrg_stck_prc", "hts_frgn_ehrt",
+    "frgn_ntby_qty", "pgtr_ntby_qty", "pvt_scnd_dmrs_prc", "pvt_frst_dmrs_prc", "pvt_pont_val",
+    "pvt_frst_dmsp_prc", "pvt_scnd_dmsp_prc", "dmrs_val", "dmsp_val", "cpfn", "rstc_wdth_prc",
+    "stck_fcam", "stck_sspr", "aspr_unit", "hts_deal_qty_unit_val", "lstn_stcn", "hts_avls",
+    "per", "pbr", "stac_month", "vol_tnrt", "eps", "bps", "d250_hgpr", "d250_hgpr_date",
+    "d250_hgpr_vrss_prpr_rate", "d250_lwpr", "d250_lwpr_date", "d250_lwpr_vrss_prpr_rate",
+    "stck_dryy_hgpr", "dryy_hgpr_vrss_prpr_rate", "dryy_hgpr_date", "stck_dryy_lwpr",
+    "dryy_lwpr_vrss_prpr_rate", "dryy_lwpr_date", "w52_hgpr", "w52_hgpr_vrss_prpr_ctrt",
+    "w52_hgpr_date", "w52_lwpr", "w52_lwpr_vrss_prpr_ctrt", "w52_lwpr_date", "whol_loan_rmnd_rate",
+    "ssts_yn", "stck_shrn_iscd", "fcam_cnnm", "cpfn_cnnm", "frgn_hldn_qty", "vi_cls_code",
+    "ovtm_vi_cls_code", "last_ssts_cntg_qty", "invt_caful_yn", "mrkt_warn_cls_code",
+    "short_over_yn", "sltr_yn",
+]
+
+# 국내 주식 잔고(inquire-balance) output1의 field 이름
+KR_BALANCE_FIELDS = [
+    "pdno", "prdt_name", "trad_dvsn_name", "bfdy_buy_qty", "bfdy_sll_qty", "thdt_buyqty",
+    "thdt_sll_qty", "hldg_qty", "ord_psbl_qty", "pchs_avg_pric", "pchs_amt", "prpr", "evlu_amt",
+    "evlu_pfls_amt", "evlu_pfls_rt", "evlu_erng_rt", "loan_dt", "loan_amt", "stln_slng_chgs",
+    "expd_dt", "fltt_rt", "bfdy_cprs_icdc", "item_mgna_rt_name", "grta_rt_name", "sbst_pric",
+    "stck_loan_unpr",
+]
+
+# 정정/취소 가능 국내 주식 주문(inquire-psbl-rvsecncl) output의 field 이름
+KR_ORDER_FIELDS = [
+    "ord_gno_brno", "odno", "orgn_odno", "ord_dvsn_name", "pdno", "prdt_name",
+    "rvse_cncl_dvsn_name", "ord_qty", "ord_unpr", "ord_tmd", "tot_ccld_qty", "tot_ccld_amt",
+    "psbl_qty", "sll_buy_dvsn_cd", "ord_dvsn_cd", "mgco_aptm_odno",
+]
+
+# 미체결 해외 주식 주문(inquire-nccs) output의 field 이름
+OS_ORDER_FIELDS = [
+    "ord_dt", "ord_gno_brno", "odno", "orgn_odno", "pdno", "prdt_name", "sll_buy_dvsn_cd",
+    "sll_buy_dvsn_cd_name", "rvse_cncl_dvsn_cd", "rvse_cncl_dvsn_cd_name", "rjct_rson",
+    "rjct_rson_name", "ord_tmd", "tr_mket_name", "tr_crcy_cd", "natn_cd", "natn_kor_name",
+    "ft_ord_qty", "ft_ccld_qty", "nccs_qty", "ft_ord_unpr3", "ft_ccld_unpr3", "ft_ccld_amt3",
+    "ovrs_excg_cd", "prcs_stat_name", "loan_type_cd", "loan_dt", "usa_amk_exts_rqst_yn",
+]
+
+
+def _value(rng: random.Random, field: str, index: int) -> str:  # pylint: disable=too-many-return-statements
+    """
+    field 이름에 어울리는 임의의 값을 문자열로 반환한다.
+    """
+    if field in ("pdno", "stck_shrn_iscd"):
+        return f"{index * 7 % 1000000:06d}"
+    if field in ("odno", "orgn_odno", "mgco_aptm_odno"):
+        return f"{index + 1:010d}"
+    if field.endswith("name") or field.endswith("isnm") or field.endswith("cnnm"):
+        return f"종목{index % 50}"
+    if field.endswith("_dt") or field.endswith("date"):
+        return "20240102"
+    if field.endswith("tmd"):
+        return f"{9 + index % 6:02d}{index % 60:02d}00"
+    if field == "sll_buy_dvsn_cd":
+        return rng.choice(["01", "02"])
+    if field == "ovrs_excg_cd":
+        return rng.choice(["NASD", "NYSE", "TKSE", "SEHK"])
+    if field.endswith("_cd") or field.endswith("code") or field.endswith("_yn"):
+        return rng.choice(["00", "01", "N", "Y"])
+    if field.endswith("rt") or field.endswith("rate") or field.endswith("ctrt") \
+            or field.endswith("pric") or field.endswith("unpr3"):
+        return f"{rng.uniform(-30, 30) if 'rt' in field else rng.uniform(100, 100000):.4f}"
+    return str(rng.randint(0, 10000000))
+
+
+def make_rows(fields: List[str], count: int, seed: int = 0) -> List[Json]:
+    """
+    fields로 구성된 count개의 output row를 반환한다.
+    """
+    rng = random.Random(seed)
+    return [{field: _value(rng, field, index) for field in fields} for index in range(count)]
+
+
+def quote_body() -> Json:
+    """
+    국내 주식 현재가 시세 응답 body (output 1 row)
+    """
+    output = make_rows(QUOTE_FIELDS, 1)[0]
+    output.update({"stck_prpr": "71000", "stck_mxpr": "92300", "stck_llam": "49700"})
+    return dict(OK, output=output)
+
+
+def kr_balance_body(rows: int = 100, seed: int = 0) -> Json:
+    """
+    국내 주식 잔고 조회 응답 body (output1 rows개, output2 1 row)
+    """
+    summary = make_rows(["dnca_tot_amt", "nxdy_excc_amt", "prvs_rcdl_excc_amt", "tot_evlu_amt",
+                         "nass_amt", "pchs_amt_smtl_amt", "evlu_amt_smtl_amt"], 1, seed)
+    return dict(OK, output1=make_rows(KR_BALANCE_FIELDS, rows, seed), output2=summary,
+                ctx_area_fk100="12345678^01^N^N^01^01^N^", ctx_area_nk100=f"{seed:020d}")
+
+
+def kr_orders_body(rows: int = 100, seed: int = 0) -> Json:
+    """
+    정정/취소 가능 국내 주식 주문 조회 응답 body (output rows개)
+    """
+    return dict(OK, output=make_rows(KR_ORDER_FIELDS, rows, seed),
+                ctx_area_fk100="12345678^01^0^0^", ctx_area_nk100=f"{seed:020d}")
+
+
+def os_orders_body(rows: int = 100, seed: int = 0) -> Json:
+    """
+    미체결 해외 주식 주문 조회 응답 body (output rows개)
+    """
+    return dict(OK, output=make_rows(OS_ORDER_FIELDS, rows, seed),
+                ctx_area_fk200="12345678^01^", ctx_area_nk200=f"{seed:020d}")
+
+
+def daily_ohlcv_body(rows: int = 100, seed: int = 0) -> Json:
+    """
+    국내 주식 기간별 시세(inquire-daily-itemchartprice) 응답 body (output2 rows개)
+    """
+    rng = random.Random(seed)
+    start = date(2024, 1, 2)
+    output2 = []
+    for index in range(rows):
+        close = rng.randint(50000, 90000)
+        output2.append({
+            "stck_bsop_date": (start - timedelta(days=index)).strftime("%Y%m%d"),
+            "stck_clpr": str(close), "stck_oprc": str(close - 100), "stck_hgpr": str(close + 500),
+            "stck_lwpr": str(close - 500), "acml_vol": str(rng.randint(10 ** 5, 10 ** 7)),
+            "acml_tr_pbmn": str(rng.randint(10 ** 9, 10 ** 12)), "flng_cls_code": "00",
+            "prtt_rate": "0.00", "mod_yn": "N", "prdy_vrss_sign": "2",
+            "prdy_vrss": str(rng.randint(-1000, 1000)), "revl_issu_reas": "",
+        })
+    output1 = make_rows(["hts_kor_isnm", "stck_prpr", "prdy_vrss", "acml_vol"], 1, seed)[0]
+    return dict(OK, output1=output1, output2=output2)
+
+
+def raw_response(body: Json, tr_id: str, tr_cont: str = "D",
+                 headers: Optional[Dict[str, str]] = None) -> RawResponse:
+    """
+    body를 json으로 직렬화한 HTTP 응답을 반환한다.
+    tr_cont: 연속 조회 여부 (F, M-다음 page 있음, D, E-마지막 page)
+    """
+    response_headers = dict(RESPONSE_HEADERS, tr_id=tr_id, tr_cont=tr_cont, **(headers or {}))
+    return RawResponse(200, response_headers, json.dumps(body).encode("utf-8"))
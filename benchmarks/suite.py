@@ -0,0 +1,405 @@
+"""
+request/응답 변환 hot path의 offline micro-benchmark 모음
+
+실행 방법:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --compare results.json          # 이전 결과와 비교
+    python benchmarks/suite.py --quick --filter convert        # 일부 case만 빠르게 실행
+
+네트워크 없이 payloads 모듈의 고정된 응답을 사용하므로, 같은 환경에서 실행한 결과는 commit 간에 비교할 수 있다.
+각 case의 초당 실행 횟수(ops/s)와 실행 1회당 memory 할당량(tracemalloc peak, 남은 양)을 측정한다.
+새로운 hot path의 측정은 이 모듈에 Case로 추가한다. localhost 서버를 사용하는 등 결과를 비교할 수 없는
+측정은 benchmarks/adhoc 폴더에 있다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+from common import KEY_INFO, ACCOUNT_INFO, Json  # pylint: disable=import-error
+import payloads  # pylint: disable=import-error,wrong-import-order
+
+import numpy as np  # pylint: disable=wrong-import-order
+import pandas as pd  # pylint: disable=wrong-import-order
+from pykis import APIResponse, AccessToken, DomainInfo, MarketCodeMap, RateLimiter, \
+    SimulatedExchange, SimulatorTransport, Api, TickRingBuffer, Transport, RawResponse, \
+    send_continuous_query, send_get_request, merge_json, Metrics, enable_metrics, \
+    disable_metrics  # pylint: disable=wrong-import-order
+from pykis.base_api import BaseApi  # pylint: disable=wrong-import-order
+from pykis.response_converter import kr_stock_balance_to_dataframe, kr_orders_to_dataframe, \
+    os_orders_to_dataframe, kr_ohlcv_range_to_dataframe  # pylint: disable=wrong-import-order
+from pykis.realtime import parse_frame, TRADE_TR_ID  # pylint: disable=wrong-import-order
+
+SCHEMA_VERSION = 1
+
+CONTINUOUS_PAGES = 5
+
+TICKS = 10_000
+
+SIMULATOR_TICKER = "005930"
+
+
+class Case(NamedTuple):
+    """
+    benchmark case
+    """
+    name: str                       # 결과 비교에 사용하는 고유한 이름 (group/설명)
+    function: Callable[[], Any]     # 측정할 함수
+
+
+def _create_api() -> BaseApi:
+    """
+    유효한 token이 발급된 상태의 BaseApi를 반환한다. (HTTP 통신은 하지 않는다.)
+    """
+    api = BaseApi(KEY_INFO, DomainInfo(kind="real"), ACCOUNT_INFO)
+    api.token = AccessToken.from_json({"value": "Bearer benchmark-token",
+                                       "valid_until": "2999-01-01T00:00:00"})
+    return api
+
+
+def _decoded(raw) -> APIResponse:
+    """
+    body를 미리 decode한 응답을 반환한다. (변환 시간만 측정하기 위해 사용)
+    """
+    res = APIResponse(raw)
+    res.raise_if_error()
+    return res
+
+
+def _parse(raw) -> Any:
+    """
+    응답을 decode하고 오류 여부를 검사한 뒤 output을 반환한다.
+    """
+    res = APIResponse(raw)
+    res.raise_if_error()
+    return res.outputs
+
+
+def _continuous_balance(api: BaseApi) -> Callable[[], pd.DataFrame]:
+    """
+    CONTINUOUS_PAGES개 page로 나뉜 국내 주식 잔고를 연속 조회하는 함수를 반환한다.
+    page마다 request 생성, header 생성, 응답 decode, DataFrame 변환과 병합을 모두 거친다.
+    """
+    raws = [payloads.raw_response(payloads.kr_balance_body(seed=page), "TTTC8434R",
+                                  "D" if page == CONTINUOUS_PAGES - 1 else "M")
+            for page in range(CONTINUOUS_PAGES)]
+
+    def request_function(extra_header: Json, extra_param: Json) -> APIResponse:
+        req = api._kr_total_balance_request(extra_header, extra_param)  # pylint: disable=protected-access
+        api._build_headers(req)  # pylint: disable=protected-access
+        cursor = req.params.get("CTX_AREA_NK100")
+        return APIResponse(raws[int(cursor) + 1 if cursor else 0])
+
+    return lambda: send_continuous_query(request_function, kr_stock_balance_to_dataframe)
+
+
+class _InMemoryTransport(Transport):
+    """
+    네트워크 없이 미리 만든 응답을 반환하는 transport
+    """
+
+    def __init__(self, response: RawResponse) -> None:
+        super().__init__()
+        self.response = response
+
+    def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        return self.response
+
+
+def _send_quote(metrics: bool) -> Callable[[], APIResponse]:
+    """
+    in-memory transport로 현재가 조회 request를 보내는 함수를 반환한다.
+    metrics: True인 경우 metrics를 기록하는 상태에서 보낸다.
+    """
+    transport = _InMemoryTransport(payloads.raw_response(payloads.quote_body(), "FHKST01010100"))
+    url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-price"
+    headers = {"tr_id": "FHKST01010100", "content-type": "application/json"}
+    params = {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": "005930"}
+    recorder = Metrics()
+
+    def send() -> APIResponse:
+        if metrics:
+            enable_metrics(recorder)
+        try:
+            return send_get_request(url, headers, params, transport=transport)
+        finally:
+            disable_metrics()
+
+    return send
+
+
+def _trade_frame(records: int) -> str:
+    """
+    체결가(H0STCNT0) record records개로 이루어진 실시간 frame을 반환한다.
+    """
+    fields = ["0"] * 46
+    fields[:3] = ["005930", "093000", "71000"]
+    fields[33] = "20240102"
+    data = "^".join(fields * records)
+    return f"0|{TRADE_TR_ID}|{records:03d}|{data}"
+
+
+def _parse_trade_frame(records: int) -> Callable[[], List[Any]]:
+    """
+    체결가 record records개로 이루어진 실시간 frame을 해석하는 함수를 반환한다.
+    """
+    frame = _trade_frame(records)
+    return lambda: parse_frame(frame)
+
+
+def _tick_buffer() -> TickRingBuffer:
+    """
+    TICKS개의 tick이 가득 찬 ring buffer를 반환한다. (1초 간격)
+    """
+    buffer = TickRingBuffer(capacity=TICKS)
+    for i in range(TICKS):
+        buffer.append(70000.0 + i % 50, 10.0, timestamp=1_704_153_600.0 + i)
+    return buffer
+
+
+def _simulator_trade() -> Callable[[], None]:
+    """
+    호가가 충분히 쌓인 가상 거래소에 Api로 체결되는 시장가 매수 + 매도 주문을 내는 함수를 반환한다.
+    """
+    exchange = SimulatedExchange(initial_cash=10 ** 15)
+    exchange.add_ticker(SIMULATOR_TICKER, 70000)
+    exchange.add_liquidity(SIMULATOR_TICKER, levels=10, amount=10 ** 9)
+    api = Api(KEY_INFO, account_info=ACCOUNT_INFO, hash_mode="skip",
+              transport=SimulatorTransport(exchange), rate_limiter=RateLimiter.unlimited())
+
+    def trade() -> None:
+        api.buy_kr_stock(SIMULATOR_TICKER, 1, 0)
+        api.sell_kr_stock(SIMULATOR_TICKER, 1, 0)
+
+    return trade
+
+
+def build_cases() -> List[Case]:
+    """
+    모든 benchmark case를 반환한다.
+    """
+    api = _create_api()
+    quote_req = BaseApi._kr_current_price_request("005930")  # pylint: disable=protected-access
+    next_page_req = api._kr_orders_request(  # pylint: disable=protected-access
+        {"tr_cont": "N"}, {"CTX_AREA_FK100": "12345678^01^0^0^", "CTX_AREA_NK100": "1" * 20})
+    header_parts = [{"content-type": "application/json"}, api.get_api_key_data(),
+                    {"tr_id": "TTTC8036R"}, {"authorization": api.token.value}, {"tr_cont": "N"}]
+
+    quote_raw = payloads.raw_response(payloads.quote_body(), "FHKST01010100")
+    balance_raw = payloads.raw_response(payloads.kr_balance_body(), "TTTC8434R", "M")
+    orders_raw = payloads.raw_response(payloads.kr_orders_body(), "TTTC8036R")
+    os_orders_raw = payloads.raw_response(payloads.os_orders_body(), "TTTS3018R")
+    ohlcv_raw = payloads.raw_response(payloads.daily_ohlcv_body(), "FHKST03010100")
+
+    balance_res = _decoded(balance_raw)
+    orders_res = _decoded(orders_raw)
+    os_orders_res = _decoded(os_orders_raw)
+    ohlcv_res = _decoded(ohlcv_raw)
+    market_code_map = MarketCodeMap()
+    ticks = _tick_buffer()
+
+    return [
+        Case("headers/merge_json_5", lambda: merge_json(header_parts)),
+        Case("headers/quote", lambda: api._build_headers(quote_req)),  # pylint: disable=protected-access
+        Case("headers/next_page", lambda: api._build_headers(next_page_req)),  # pylint: disable=protected-access
+        Case("response/quote_1_row", lambda: _parse(quote_raw)),
+        Case("response/kr_balance_100_rows", lambda: _parse(balance_raw)),
+        Case("response/kr_orders_100_rows", lambda: _parse(orders_raw)),
+        Case("convert/kr_balance_100_rows", lambda: kr_stock_balance_to_dataframe(balance_res)),
+        Case("convert/kr_orders_100_rows", lambda: kr_orders_to_dataframe(orders_res)),
+        Case("convert/os_orders_100_rows",
+             lambda: os_orders_to_dataframe(os_orders_res, market_code_map)),
+        Case("convert/kr_daily_ohlcv_100_rows", lambda: kr_ohlcv_range_to_dataframe([ohlcv_res])),
+        Case(f"continuous/kr_balance_{CONTINUOUS_PAGES}x100_rows", _continuous_balance(api)),
+        Case("metrics/send_quote_disabled", _send_quote(metrics=False)),
+        Case("metrics/send_quote_enabled", _send_quote(metrics=True)),
+        Case("realtime/parse_trade_frame_3_records", _parse_trade_frame(3)),
+        Case("tick_buffer/append", lambda: ticks.append(70000.0, 1.0)),
+        Case(f"tick_buffer/window_{TICKS}", ticks.window),
+        Case(f"tick_buffer/to_ohlcv_1min_{TICKS}", lambda: ticks.to_ohlcv("1min")),
+        Case("simulator/buy_sell_market", _simulator_trade()),
+    ]
+
+
+def measure_time(function: Callable[[], Any], rounds: int,
+                 min_time: float) -> Tuple[int, List[float]]:
+    """
+    function의 실행 1회당 시간(초)을 rounds번 측정한다.
+    한 round는 min_time초 이상 걸리도록 실행 횟수를 정한다.
+    (한 round의 실행 횟수, round별 실행 1회당 시간의 list)를 반환한다.
+    """
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return number, [total / number for total in timer.repeat(rounds, number)]
+
+
+def measure_allocations(function: Callable[[], Any], samples: int = 5) -> Tuple[float, float]:
+    """
+    function의 실행 1회당 (최대 할당량, 실행 후 남은 할당량)을 KiB 단위로 반환한다. (samples번 중 중앙값)
+    """
+    function()   # 처음 실행할 때만 생기는 cache 등은 제외한다.
+    peaks, retained = [], []
+    for _ in range(samples):
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            function()
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peaks.append((peak - before) / 1024)
+        retained.append((after - before) / 1024)
+    return statistics.median(peaks), statistics.median(retained)
+
+
+def run_case(case: Case, rounds: int, min_time: float) -> Json:
+    """
+    case를 측정한 결과를 반환한다.
+    """
+    number, times = measure_time(case.function, rounds, min_time)
+    median = statistics.median(times)
+    peak, retained = measure_allocations(case.function)
+    return {
+        "ops_per_sec": 1 / median,
+        "median_us": median * 1e6,
+        "min_us": min(times) * 1e6,
+        "stdev_pct": statistics.stdev(times) / median * 100 if len(times) > 1 else 0.0,
+        "rounds": rounds,
+        "number": number,
+        "peak_kib": peak,
+        "retained_kib": retained,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """
+    현재 checkout된 commit hash를 반환한다. git을 사용할 수 없는 경우 None
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_meta() -> Json:
+    """
+    결과 비교에 필요한 실행 환경 정보를 반환한다.
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel,unused-import
+        has_orjson = True
+    except ImportError:
+        has_orjson = False
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "orjson": has_orjson,
+    }
+
+
+def compare(old: Json, new: Json, threshold: float, file=sys.stdout) -> List[str]:
+    """
+    두 결과의 case별 ops/s를 비교한 표를 출력하고, threshold 비율 이상 느려진 case 이름들을 반환한다.
+    ratio는 new/old ops/s이다. (1보다 크면 빨라진 것)
+    """
+    regressions = []
+    print(f"\n{'case':<40} {'old ops/s':>12} {'new ops/s':>12} {'ratio':>7}", file=file)
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            print(f"{name:<40} {'-':>12} {result['ops_per_sec']:12.1f}", file=file)
+            continue
+        ratio = result["ops_per_sec"] / before["ops_per_sec"]
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  slower"
+            regressions.append(name)
+        elif ratio > 1 + threshold:
+            flag = "  faster"
+        print(f"{name:<40} {before['ops_per_sec']:12.1f} {result['ops_per_sec']:12.1f} "
+              f"{ratio:6.2f}x{flag}", file=file)
+    return regressions
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="결과를 저장할 json 파일 경로 (- 인 경우 stdout)")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="비교할 이전 결과 json 파일 경로")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="비교할 때 느려졌다고 판단하는 ops/s 감소 비율 (기본값 0.1)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="느려진 case가 있으면 exit code 1로 종료")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 case만 실행")
+    parser.add_argument("--quick", action="store_true", help="측정 횟수를 줄여서 빠르게 실행")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    benchmark를 실행한다.
+    """
+    args = _parse_args(argv)
+    rounds, min_time = (3, 0.05) if args.quick else (7, 0.2)
+    log = sys.stderr if args.output == "-" else sys.stdout
+
+    results: Dict[str, Json] = {}
+    for case in build_cases():
+        if args.filter not in case.name:
+            continue
+        result = results[case.name] = run_case(case, rounds, min_time)
+        print(f"{case.name:<40} {result['ops_per_sec']:12.1f} ops/s | "
+              f"median {result['median_us']:10.2f} us | ±{result['stdev_pct']:4.1f}% | "
+              f"peak {result['peak_kib']:8.1f} KiB | retained {result['retained_kib']:6.1f} KiB",
+              file=log)
+
+    report = {"meta": collect_meta(), "results": results}
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(json.load(file), report, args.threshold, log)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
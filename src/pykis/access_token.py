@@ -17,7 +17,8 @@ pykis의 AccessToken 클래스를 담기 위한 모듈
 # limitations under the License.
 
 from datetime import datetime, timedelta
-from typing import NamedTuple, Optional
+from typing import Any, Callable, Dict, NamedTuple, Optional
+import threading
 
 
 class AccessToken:
@@ -51,3 +52,83 @@ class AccessToken:
         return self.value is not None and \
             self.valid_until is not None and \
             datetime.now() < self.valid_until
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Token을 json 형식의 데이터로 변환한다.
+        """
+        valid_until = self.valid_until.isoformat() if self.valid_until is not None else None
+        return {"value": self.value, "valid_until": valid_until}
+
+    @staticmethod
+    def from_json(data: Dict[str, Any]) -> "AccessToken":
+        """
+        json 형식의 데이터로부터 Token을 생성한다.
+        """
+        token = AccessToken()
+        token.value = data.get("value")
+        valid_until = data.get("valid_until")
+        token.valid_until = datetime.fromisoformat(valid_until) if valid_until else None
+        return token
+
+
+class TokenRenewer:
+    """
+    Token의 유효기한이 끝나기 전에 background thread에서 Token을 미리 갱신하는 클래스.
+    request를 보내는 thread가 Token 발급을 기다리지 않도록 한다.
+    """
+
+    def __init__(self, token: AccessToken, renew: Callable[[], None],
+                 renew_before: float = 300, retry_interval: float = 10) -> None:
+        """
+        token: 갱신할 Token
+        renew: Token을 갱신하는 함수
+        renew_before: 유효기한 몇 초 전에 갱신할지
+        retry_interval: 갱신에 실패한 경우 다시 시도할 간격 (초)
+        """
+        self.token: AccessToken = token
+        self.renew: Callable[[], None] = renew
+        self.renew_before: float = renew_before
+        self.retry_interval: float = retry_interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pykis-token-renewer",
+                                        daemon=True)
+
+    def start(self) -> None:
+        """
+        background 갱신을 시작한다.
+        """
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        background 갱신을 중지한다.
+        """
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def seconds_until_renewal(self) -> float:
+        """
+        다음 갱신 시각까지 남은 시간(초)을 반환한다.
+        """
+        if self.token.valid_until is None:
+            return 0.0
+        remaining = (self.token.valid_until - datetime.now()).total_seconds()
+        return remaining - self.renew_before
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            delay = self.seconds_until_renewal()
+            if delay > 0:
+                # 대기 중 다른 곳에서 Token이 갱신되었을 수 있으므로 대기 후 다시 계산한다.
+                self._stop_event.wait(delay)
+                continue
+
+            try:
+                self.renew()
+            except Exception:  # pylint: disable=broad-except
+                pass    # 다음 시도에서 다시 갱신한다. Token이 만료되면 request 시점에 발급된다.
+
+            if self.seconds_until_renewal() <= 0:
+                self._stop_event.wait(self.retry_interval)
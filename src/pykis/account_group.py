@@ -0,0 +1,163 @@
+"""
+하나의 appkey로 여러 계좌를 함께 조회하는 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+import pandas as pd
+
+from .request_utility import Json
+from .utility import map_concurrently, gather_concurrently
+
+ACCOUNT_INDEX_NAME = "계좌번호"
+
+
+def account_label(account_info: Json) -> str:
+    """
+    계좌 정보를 "종합계좌번호-상품코드" 형식의 문자열로 반환한다. (ex> 12345678-01)
+    """
+    return f"{account_info['account_code']}-{account_info['product_code']}"
+
+
+def concat_by_account(labels: List[str], datas: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    계좌별 DataFrame들을 계좌번호를 첫번째 index level로 하는 하나의 DataFrame으로 합친다.
+    비어있는 DataFrame은 제외하며, 모두 비어있는 경우 빈 DataFrame을 반환한다.
+    """
+    pairs = [(label, data) for label, data in zip(labels, datas) if not data.empty]
+    if not pairs:
+        return pd.DataFrame()
+    return pd.concat([data for _, data in pairs], keys=[label for label, _ in pairs],
+                     names=[ACCOUNT_INDEX_NAME])
+
+
+class AccountGroup:
+    """
+    하나의 appkey에 속한 여러 계좌를 함께 조회하는 facade.
+    계좌별 Api 객체는 api의 token, 연결 pool, rate limiter를 공유하므로,
+    계좌 수만큼 token을 발급하거나 연결을 열지 않고, 전체 호출 속도도 하나의 제한 안에서 나누어 쓴다.
+    """
+
+    def __init__(self, api: Any, accounts: Iterable[Json]) -> None:
+        """
+        api: 공유할 Api 객체. 사용이 끝나면 api를 close한다.
+        accounts: 계좌 정보 목록.
+                  [{ "account_code" : "[계좌번호 앞 8자리 숫자]", "product_code" : "[계좌번호 뒤 2자리 숫자]" }, ...]
+        """
+        self.api = api
+        self.apis: Dict[str, Any] = {
+            account_label(account_info): api.for_account(account_info)
+            for account_info in accounts
+        }
+
+    @property
+    def accounts(self) -> List[str]:
+        """
+        계좌번호 목록 (ex> ["12345678-01", "12345678-22"])
+        """
+        return list(self.apis)
+
+    def _fan_out(self, query: Callable[[Any], pd.DataFrame], max_workers: int) -> pd.DataFrame:
+        """
+        모든 계좌에 대해 query를 동시에 실행하고 결과를 계좌번호 index level로 합친다.
+        """
+        labels = self.accounts
+        datas = map_concurrently(lambda label: query(self.apis[label]), labels,
+                                 max_workers=max_workers)
+        return concat_by_account(labels, datas)
+
+    def get_kr_stock_balance(self, max_workers: int = 8) -> pd.DataFrame:
+        """
+        모든 계좌의 국내 주식 잔고를 동시에 조회한다.
+        max_workers: 동시에 조회할 계좌의 최대 개수
+        return: Api.get_kr_stock_balance의 결과에 계좌번호 index level을 앞에 추가한 DataFrame
+        """
+        return self._fan_out(lambda api: api.get_kr_stock_balance(), max_workers)
+
+    def get_os_stock_balance(self, market_codes: Optional[Iterable[str]] = None,
+                             held_only: bool = False, max_workers: int = 8) -> pd.DataFrame:
+        """
+        모든 계좌의 해외 주식 잔고를 동시에 조회한다. (파라미터는 Api.get_os_stock_balance 참고)
+        max_workers: 동시에 조회할 계좌의 최대 개수. 계좌별 거래소 조회에도 같은 값을 사용한다.
+        return: Api.get_os_stock_balance의 결과에 계좌번호 index level을 앞에 추가한 DataFrame
+        """
+        codes = list(market_codes) if market_codes is not None else None
+        return self._fan_out(lambda api: api.get_os_stock_balance(codes, held_only, max_workers),
+                             max_workers)
+
+    def get_kr_orders(self, max_workers: int = 8) -> pd.DataFrame:
+        """
+        모든 계좌의 취소/정정 가능한 국내 주식 주문을 동시에 조회한다.
+        max_workers: 동시에 조회할 계좌의 최대 개수
+        return: Api.get_kr_orders의 결과에 계좌번호 index level을 앞에 추가한 DataFrame
+        """
+        return self._fan_out(lambda api: api.get_kr_orders(), max_workers)
+
+
+class AsyncAccountGroup:
+    """
+    AccountGroup의 asyncio 버전. 계좌별 AsyncApi 객체는 api의 token, 연결 pool, rate limiter를 공유한다.
+    """
+
+    def __init__(self, api: Any, accounts: Iterable[Json]) -> None:
+        """
+        api: 공유할 AsyncApi 객체. 사용이 끝나면 api를 close한다.
+        accounts: 계좌 정보 목록. (AccountGroup 참고)
+        """
+        self.api = api
+        self.apis: Dict[str, Any] = {
+            account_label(account_info): api.for_account(account_info)
+            for account_info in accounts
+        }
+
+    @property
+    def accounts(self) -> List[str]:
+        """
+        계좌번호 목록 (ex> ["12345678-01", "12345678-22"])
+        """
+        return list(self.apis)
+
+    async def _fan_out(self, query: Callable[[Any], Awaitable[pd.DataFrame]],
+                       max_workers: int) -> pd.DataFrame:
+        """
+        모든 계좌에 대해 query를 동시에 실행하고 결과를 계좌번호 index level로 합친다.
+        """
+        labels = self.accounts
+        datas = await gather_concurrently(lambda label: query(self.apis[label]), labels,
+                                          max_workers=max_workers)
+        return concat_by_account(labels, datas)
+
+    async def get_kr_stock_balance(self, max_workers: int = 100) -> pd.DataFrame:
+        """
+        AccountGroup.get_kr_stock_balance의 asyncio 버전
+        """
+        return await self._fan_out(lambda api: api.get_kr_stock_balance(), max_workers)
+
+    async def get_os_stock_balance(self, market_codes: Optional[Iterable[str]] = None,
+                                   held_only: bool = False,
+                                   max_workers: int = 100) -> pd.DataFrame:
+        """
+        AccountGroup.get_os_stock_balance의 asyncio 버전
+        """
+        codes = list(market_codes) if market_codes is not None else None
+        return await self._fan_out(
+            lambda api: api.get_os_stock_balance(codes, held_only, max_workers), max_workers)
+
+    async def get_kr_orders(self, max_workers: int = 100) -> pd.DataFrame:
+        """
+        AccountGroup.get_kr_orders의 asyncio 버전
+        """
+        return await self._fan_out(lambda api: api.get_kr_orders(), max_workers)
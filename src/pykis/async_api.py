@@ -0,0 +1,761 @@
+"""
+pykis의 asyncio 기반 public api를 담기 위한 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+import asyncio
+import copy
+import time
+import pandas as pd
+
+from .request_utility import Json, APIRequestParameter, APIResponse, \
+    send_get_request_async, send_post_request_async
+from .domain_info import DomainInfo
+from .utility import to_namedtuple, send_continuous_query_async, gather_concurrently, \
+    concat_dataframes, aiter_continuous_query, ContinuationCursor, QueryPage, DateLike, TimeLike
+from .transport import AsyncTransport
+from .base_api import BaseApi, KR_MARKET_OPEN
+from .basket import BasketOrders, BasketResult, OrderItem, to_basket_orders, to_cancel_orders, \
+    select_orders, basket_results_to_dataframe, cancel_results_to_dataframe, \
+    send_basket_order_async
+from .quote import KrQuote, QuoteCache
+from .hedging import HedgePolicy
+from .rate_limiter import RateLimiter
+from .token_store import TokenStore
+from .response_converter import kr_ohlcv_to_dataframe, kr_stock_balance_to_dataframe, \
+    os_stock_balance_to_dataframe, kr_orders_to_dataframe, \
+    kr_quotes_to_dataframe, os_quotes_to_dataframe, kr_ohlcv_range_to_dataframe
+
+
+class AsyncApi(BaseApi):  # pylint: disable=too-many-public-methods
+    """
+    pykis의 asyncio 기반 public api를 나타내는 클래스.
+    Api와 동일한 기능을 coroutine으로 제공한다. (aiohttp 필요)
+    """
+
+    def __init__(self, key_info: Json,  # pylint: disable=too-many-arguments
+                 domain_info: DomainInfo = DomainInfo(kind="real"),
+                 account_info: Optional[Json] = None, *,
+                 transport: Optional[AsyncTransport] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 token_store: Optional[TokenStore] = None,
+                 quote_cache: Optional[QuoteCache] = None,
+                 hash_mode: str = "request",
+                 hedge_policy: Optional[HedgePolicy] = None) -> None:
+        """
+        key_info: API 사용을 위한 인증키 정보. appkey, appsecret
+        domain_info: domain 정보 (실전/모의/etc)
+        account_info: 사용할 계좌 정보.
+                    { "account_code" : "[계좌번호 앞 8자리 숫자]", "product_code" : "[계좌번호 뒤 2자리 숫자]" }
+        transport: asyncio HTTP 전송 계층. 지정하지 않은 경우 기본 설정의 연결 pool을 생성한다.
+        rate_limiter: API 호출 속도 제한. 지정하지 않은 경우 domain의 기본 제한 값을 사용한다.
+        token_store: 발급받은 token을 process 간에 공유하기 위한 저장소. 지정하지 않은 경우 공유하지 않는다.
+        quote_cache: 현재가 시세 snapshot cache. 지정하지 않은 경우 상한가/하한가만 재사용하는 기본 설정의 cache를 생성한다.
+        hash_mode: 주문 request의 hash key 처리 방식. 기본값 "request"
+                   request-주문마다 /uapi/hashkey로 hash key를 발급받아 header에 추가한다.
+                   skip-hash key 없이 주문한다. (hash key는 선택 사항이며, 주문마다 1번의 왕복이 줄어든다.)
+        hedge_policy: 응답이 늦은 시세 조회 request를 한번 더 보내서 먼저 도착한 응답을 사용하는 정책.
+                      지정하지 않은 경우 사용하지 않는다. (HedgePolicy 참고)
+        """
+        super().__init__(key_info, domain_info, account_info, rate_limiter, token_store,
+                         quote_cache=quote_cache, hash_mode=hash_mode,
+                         hedge_policy=hedge_policy)
+        self.transport: AsyncTransport = transport if transport is not None else AsyncTransport()
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._token_owner: "AsyncApi" = self   # token 발급 lock을 가진 객체 (for_account 참고)
+
+    async def __aenter__(self) -> "AsyncApi":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def for_account(self, account_info: Json) -> "AsyncApi":
+        """
+        token, 연결 pool, rate limiter, 시세 cache를 이 객체와 공유하고 계좌만 다른 AsyncApi 객체를 반환한다.
+        반환된 객체는 close하지 않는다. (연결 pool은 이 객체를 close할 때 닫힌다.)
+        account_info: 사용할 계좌 정보. (set_account 참고)
+        """
+        view = copy.copy(self)
+        view.set_account(account_info)
+        return view
+
+    # 인증-----------------
+
+    async def create_token(self) -> None:
+        """
+        access token을 발급한다.
+        token 저장소를 사용하는 경우, 저장소에 유효한 token이 있으면 새로 발급하지 않고 저장된 token을 사용한다.
+        """
+        if self.token_store is None:
+            await self._issue_token()
+            return
+
+        # 파일 lock, 파일 읽기/쓰기는 event loop를 멈추지 않도록 executor thread에서 실행한다.
+        loop = asyncio.get_running_loop()
+        key = self._token_key()
+        async with self.token_store.lock_async(key):
+            if not await loop.run_in_executor(None, self._load_stored_token):
+                await self._issue_token()
+                await loop.run_in_executor(None, self.token_store.save, key, self.token)
+
+    async def _issue_token(self) -> None:
+        """
+        서버에 access token 발급을 요청한다.
+        """
+        req = self._create_token_request()
+        response = await self._send_post_request(req)
+        body = to_namedtuple("body", response.body)
+
+        self.token.create(body)
+
+    async def get_approval_key(self) -> str:
+        """
+        실시간 시세(WebSocket) 접속키를 발급받아 반환한다.
+        """
+        req = self._approval_key_request()
+        response = await self._send_post_request(req)
+        return response.body["approval_key"]
+
+    async def _ensure_token(self) -> None:
+        """
+        token이 유효하지 않은 경우 새로 발급한다.
+        동시에 여러 coroutine이 호출해도 token 발급은 한번만 실행된다.
+        """
+        if self.token.is_valid():
+            return
+
+        # token 저장소 확인(create_token)은 파일을 읽으므로 lock 안에서 한번만 한다.
+        async with self._shared_token_lock():
+            if not self.token.is_valid():
+                await self.create_token()
+
+    def _shared_token_lock(self) -> asyncio.Lock:
+        """
+        token 발급 lock을 반환한다. for_account로 만든 객체는 원래 객체의 lock을 공유한다.
+        """
+        if self._token_owner is not self:
+            return self._token_owner._shared_token_lock()  # pylint: disable=protected-access
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        return self._token_lock
+
+    async def set_hash_key(self, header: Json, param: Json) -> None:
+        """
+        header에 hash key 설정한다.
+        """
+        hash_key = await self.get_hash_key(param)
+        header["hashkey"] = hash_key
+
+    async def get_hash_key(self, params: Json) -> str:
+        """
+        hash key 값을 가져온다.
+        """
+        req = self._hash_key_request(params)
+        response = await self._send_post_request(req)
+
+        return response.body["HASH"]
+
+    # 인증-----------------
+
+    # 시세 조회------------
+    async def get_kr_quote(self, ticker: str, max_age: Optional[float] = None) -> KrQuote:
+        """
+        국내 주식 현재가 시세 snapshot을 반환한다.
+        cache에 저장된 지 max_age초가 지나지 않은 snapshot이 있으면 API를 호출하지 않는다.
+        ticker: 종목코드
+        max_age: 허용할 최대 경과 시간(초). 지정하지 않은 경우 quote_cache의 ttl을 사용한다. 0인 경우 항상 새로 조회한다.
+        return: 해당 종목 현재가 시세 snapshot
+        """
+        quote = self.quote_cache.get(ticker, max_age)
+        if quote is None:
+            info = await self._get_kr_stock_current_price_info(ticker)
+            quote = KrQuote.from_output(ticker, info)
+            self.quote_cache.put(quote)
+        return quote
+
+    async def get_kr_current_price(self, ticker: str) -> int:
+        """
+        국내 주식 현재가를 반환한다.
+        get_kr_quote를 사용하므로, quote_cache의 ttl을 지정한 경우 ttl초 이내에 조회한 현재가를 반환할 수 있다.
+        (기본 설정에서는 항상 새로 조회한다.)
+        ticker: 종목코드
+        return: 해당 종목 현재가 (단위: 원)
+        """
+        quote = await self.get_kr_quote(ticker)
+        return quote.price
+
+    async def get_kr_max_price(self, ticker: str) -> int:
+        """
+        국내 주식의 상한가를 반환한다. 상한가는 다음 장 시작 전까지 cache된 값을 사용한다.
+        ticker: 종목코드
+        return: 해당 종목의 상한가 (단위: 원)
+        """
+        limits = self.quote_cache.get_limits(ticker)
+        if limits is not None:
+            return limits[0]
+        quote = await self.get_kr_quote(ticker, max_age=0)
+        return quote.max_price
+
+    async def get_kr_min_price(self, ticker: str) -> int:
+        """
+        국내 주식의 하한가를 반환한다. 하한가는 다음 장 시작 전까지 cache된 값을 사용한다.
+        ticker: 종목코드
+        return: 해당 종목의 하한가 (단위: 원)
+        """
+        limits = self.quote_cache.get_limits(ticker)
+        if limits is not None:
+            return limits[1]
+        quote = await self.get_kr_quote(ticker, max_age=0)
+        return quote.min_price
+
+    async def _get_kr_stock_current_price_info(self, ticker: str) -> Json:
+        """
+        국내 주식 현재가 시세 정보를 반환한다.
+        """
+        req = self._kr_current_price_request(ticker)
+        res = await self._send_get_request(req)
+        return res.outputs[0]
+
+    async def get_kr_ohlcv(self, ticker: str, time_unit: str = "D") -> pd.DataFrame:
+        """
+        해당 종목코드의 과거 가격 정보를 DataFrame으로 반환한다.
+        ticker: 종목 코드
+        time_unit: 기간 분류 코드 (D/day-일, W/week-주, M/month-월)
+        데이터는 최근 30 일/주/월 데이터로 제한됨
+        """
+        req = self._kr_history_request(ticker, time_unit)
+        res = await self._send_get_request(req, raise_flag=False)
+        return kr_ohlcv_to_dataframe(res)
+
+    async def get_kr_ohlcv_range(self, ticker: str,  # pylint: disable=too-many-arguments
+                                 start: DateLike, end: Optional[DateLike] = None,
+                                 time_unit: str = "D", *, adjusted: bool = True,
+                                 max_workers: int = 100) -> pd.DataFrame:
+        """
+        해당 종목코드의 start ~ end 기간 가격 정보를 DataFrame으로 반환한다.
+        기간을 API가 한번에 반환할 수 있는 구간(최대 100개의 봉)들로 나누어 동시에 조회한다.
+        조회 속도는 rate_limiter의 제한을 따른다.
+        ticker: 종목 코드
+        start, end: 조회 시작일, 종료일 (포함). date, datetime 또는 문자열(ex> "20200102"). end가 None인 경우 오늘
+        time_unit: 기간 분류 코드 (D/day-일, W/week-주, M/month-월, Y/year-년)
+        adjusted: True인 경우 수정주가, False인 경우 원주가
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: Date를 index로 하는 DataFrame (Open, High, Low, Close, Volume). 날짜 순서로 정렬되어 있다.
+        """
+        jobs = self._kr_ohlcv_range_requests([ticker], start, end, time_unit, adjusted)
+        responses = await gather_concurrently(self._send_ticker_request, jobs,
+                                              max_workers=max_workers)
+        return kr_ohlcv_range_to_dataframe(responses)
+
+    async def get_kr_ohlcv_ranges(self, tickers: Iterable[str],  # pylint: disable=too-many-arguments
+                                  start: DateLike, end: Optional[DateLike] = None,
+                                  time_unit: str = "D", *, adjusted: bool = True,
+                                  max_workers: int = 100) -> pd.DataFrame:
+        """
+        여러 종목의 start ~ end 기간 가격 정보를 동시에 조회하여 하나의 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다. (파라미터는 get_kr_ohlcv_range 참고)
+        tickers: 종목코드 목록
+        return: (종목코드, Date)를 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        jobs = self._kr_ohlcv_range_requests(tickers, start, end, time_unit, adjusted)
+        responses = await gather_concurrently(self._send_ticker_request, jobs,
+                                              max_workers=max_workers)
+        return self._per_ticker_dataframe(tickers, jobs, responses,
+                                          kr_ohlcv_range_to_dataframe)
+
+    async def get_kr_minute_ohlcv(self, ticker: str,  # pylint: disable=too-many-arguments
+                                  start: TimeLike = KR_MARKET_OPEN, end: Optional[TimeLike] = None,
+                                  interval: Union[int, str] = 1, *,
+                                  max_workers: int = 100) -> pd.DataFrame:
+        """
+        해당 종목코드의 당일 분봉을 DataFrame으로 반환한다.
+        API가 한번에 반환하는 30개의 봉 단위로 나누어 동시에 조회한다. 조회 속도는 rate_limiter의 제한을 따른다.
+        ticker: 종목 코드
+        start, end: 조회 시작/종료 시각 (포함). time, datetime 또는 문자열(ex> "090000", "09:30").
+                    end가 None인 경우 현재 시각까지
+        interval: 봉 간격. 분 단위 정수 또는 pandas offset 문자열 (ex> 5, 15, 60, "5min")
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 봉 시작 시각(Date)을 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+        """
+        jobs = self._kr_minute_ohlcv_requests([ticker], start, end)
+        responses = await gather_concurrently(self._send_ticker_request, jobs,
+                                              max_workers=max_workers)
+        return self._kr_minute_ohlcv_to_dataframe(responses, start, end, interval)
+
+    async def get_kr_minute_ohlcvs(self, tickers: Iterable[str],  # pylint: disable=too-many-arguments
+                                   start: TimeLike = KR_MARKET_OPEN, end: Optional[TimeLike] = None,
+                                   interval: Union[int, str] = 1, *,
+                                   max_workers: int = 100) -> pd.DataFrame:
+        """
+        여러 종목의 당일 분봉을 동시에 조회하여 하나의 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다. (파라미터는 get_kr_minute_ohlcv 참고)
+        tickers: 종목코드 목록
+        return: (종목코드, Date)를 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        jobs = self._kr_minute_ohlcv_requests(tickers, start, end)
+        responses = await gather_concurrently(self._send_ticker_request, jobs,
+                                              max_workers=max_workers)
+
+        def to_dataframe(ticker_responses: List[APIResponse]) -> pd.DataFrame:
+            return self._kr_minute_ohlcv_to_dataframe(ticker_responses, start, end, interval)
+
+        return self._per_ticker_dataframe(tickers, jobs, responses, to_dataframe)
+
+    async def _send_ticker_request(self, job: Tuple[str, APIRequestParameter]) \
+            -> APIResponse:
+        """
+        (종목코드, request 파라미터)의 request를 보낸다.
+        """
+        _, req = job
+        return await self._send_get_request(req)
+
+    async def _get_os_stock_current_price_info(self, ticker: str, market_code: str) -> Json:
+        """
+        해외 주식 현재가 시세 정보를 반환한다.
+        """
+        req = self._os_current_price_request(ticker, market_code)
+        res = await self._send_get_request(req)
+        return res.outputs[0]
+
+    async def get_os_current_price(self, ticker: str, market_code: str) -> float:
+        """
+        해외 주식 현재가를 반환한다.
+        ticker: 종목코드
+        market_code: 거래소 코드 (NYS-뉴욕, NAS-나스닥, AMS-아멕스, etc)
+        return: 해당 종목 현재가 (단위: 해당 화폐)
+        """
+        info = await self._get_os_stock_current_price_info(ticker, market_code)
+        return float(info["last"])
+
+    async def get_kr_quotes(self, tickers: Iterable[str], max_workers: int = 100) -> pd.DataFrame:
+        """
+        여러 국내 주식의 현재가 시세를 동시에 조회하여 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다.
+        tickers: 종목코드 목록
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 종목코드를 index로 하는 DataFrame (현재가, 상한가, 하한가, 거래량, 전일대비, 등락률, 오류)
+        """
+        tickers = list(tickers)
+        results = await gather_concurrently(self._get_kr_stock_current_price_info, tickers,
+                                            max_workers=max_workers, return_exceptions=True)
+        return kr_quotes_to_dataframe(tickers, results)
+
+    async def get_os_quotes(self, items: Iterable[Tuple[str, str]],
+                            max_workers: int = 100) -> pd.DataFrame:
+        """
+        여러 해외 주식의 현재가 시세를 동시에 조회하여 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다.
+        items: (거래소 코드, 종목코드) 목록. ex> [("NAS", "TSLA"), ("NYS", "KO")]
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 종목코드를 index로 하는 DataFrame (거래소코드, 현재가, 전일종가, 거래량, 전일대비, 등락률, 오류)
+        """
+        items = [(market_code.upper(), ticker.upper()) for market_code, ticker in items]
+
+        async def request_function(item: Tuple[str, str]) -> Json:
+            market_code, ticker = item
+            return await self._get_os_stock_current_price_info(ticker, market_code)
+
+        results = await gather_concurrently(request_function, items,
+                                            max_workers=max_workers, return_exceptions=True)
+        return os_quotes_to_dataframe(items, results)
+
+    # 시세 조회------------
+
+    # 잔고 조회------------
+    async def get_kr_buyable_cash(self) -> int:
+        """
+        구매 가능 현금(원화) 조회
+        return: 해당 계좌의 구매 가능한 현금(원화)
+        """
+        req = self._kr_buyable_cash_request()
+        res = await self._send_get_request(req)
+        output = res.outputs[0]
+        return int(output["ord_psbl_cash"])
+
+    async def get_kr_stock_balance(self) -> pd.DataFrame:
+        """
+        국내 주식 잔고 조회
+        return: 국내 주식 잔고 정보를 DataFrame으로 반환
+        """
+        return await send_continuous_query_async(self._get_kr_total_balance,
+                                                 kr_stock_balance_to_dataframe)
+
+    def iter_kr_stock_balance(self, cursor: Optional[ContinuationCursor] = None,
+                              max_pages: Optional[int] = None) -> AsyncIterator[QueryPage]:
+        """
+        국내 주식 잔고를 page 단위로 조회하면서 하나씩 반환하는 async generator.
+        cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+        max_pages: 조회할 최대 page 수. 지정하지 않은 경우 끝까지 조회한다.
+        """
+        return aiter_continuous_query(self._get_kr_total_balance, kr_stock_balance_to_dataframe,
+                                      cursor=cursor, max_pages=max_pages)
+
+    async def get_kr_deposit(self) -> int:
+        """
+        국내 주식 잔고의 총 예수금을 반환한다.
+        """
+        res = await self._get_kr_total_balance()
+
+        output2 = res.outputs[1]
+        return int(output2[0]["dnca_tot_amt"])
+
+    async def get_os_stock_balance(self, market_codes: Optional[Iterable[str]] = None,
+                                   held_only: bool = False,
+                                   max_workers: int = 100) -> pd.DataFrame:
+        """
+        해외 주식 잔고를 DataFrame으로 반환한다.
+        거래소별 조회는 동시에 실행되며, 결과는 거래소 코드 목록 순서대로 합쳐진다.
+        market_codes: 조회할 거래소 코드 목록. 지정하지 않은 경우 모든 거래소를 조회한다.
+        held_only: True인 경우 보유 종목이 있는 거래소만 조회한다.
+        max_workers: 동시에 보낼 request의 최대 개수
+        """
+        codes = self._os_market_codes(market_codes, self._os_balance_market_codes())
+        if held_only:
+            held = await self.get_os_held_market_codes()
+            codes = [code for code in codes if code in held]
+
+        datas = await gather_concurrently(self._get_os_stock_balance, codes,
+                                          max_workers=max_workers)
+        return concat_dataframes(datas)
+
+    async def get_os_held_market_codes(self) -> List[str]:
+        """
+        보유 종목이 있는 해외 거래소의 잔고 조회용 거래소 코드 목록을 반환한다.
+        """
+        req = self._os_present_balance_request()
+        res = await self._send_get_request(req)
+        holdings = res.outputs[0] if res.outputs else []
+        return self._held_os_balance_market_codes(item.get("ovrs_excg_cd", "") for item in holdings)
+
+    async def _get_os_stock_balance(self, market_code: str) -> pd.DataFrame:
+        """
+        해외 주식 잔고 조회
+        """
+
+        async def request_function(*args, **kwargs):
+            return await self._get_os_total_balance(market_code, *args, **kwargs)
+
+        return await send_continuous_query_async(request_function, os_stock_balance_to_dataframe,
+                                                 is_kr=False)
+
+    async def _get_os_total_balance(self, market_code: str, extra_header: Json = None,
+                                    extra_param: Json = None) -> APIResponse:
+        """
+        해외 주식 잔고의 조회 전체 결과를 반환한다.
+        """
+        req = self._os_total_balance_request(market_code, extra_header, extra_param)
+        return await self._send_get_request(req)
+
+    async def _get_kr_total_balance(self, extra_header: Json = None,
+                                    extra_param: Json = None) -> APIResponse:
+        """
+        국내 주식 잔고의 조회 전체 결과를 반환한다.
+        """
+        req = self._kr_total_balance_request(extra_header, extra_param)
+        return await self._send_get_request(req)
+
+    # 잔고 조회------------
+
+    # 주문 조회------------
+
+    async def _get_kr_orders_once(self, extra_header: Optional[Json] = None,
+                                  extra_param: Optional[Json] = None) -> APIResponse:
+        """
+        취소/정정 가능한 국내 주식 주문 목록을 반환한다.
+        한번만 실행.
+        """
+        req = self._kr_orders_request(extra_header, extra_param)
+        return await self._send_get_request(req)
+
+    async def _get_os_orders_once(self, markert_code: str, extra_header: Json = None,
+                                  extra_param: Json = None) -> APIResponse:
+        """
+        취소/정정 가능한 해외 주식 주문 목록을 반환한다.
+        한번만 실행.
+        """
+        req = self._os_orders_request(markert_code, extra_header, extra_param)
+        return await self._send_get_request(req)
+
+    async def get_kr_orders(self) -> pd.DataFrame:
+        """
+        취소/정정 가능한 국내 주식 주문 목록을 DataFrame으로 반환한다.
+        """
+        return await send_continuous_query_async(self._get_kr_orders_once,
+                                                 kr_orders_to_dataframe)
+
+    def iter_kr_orders(self, cursor: Optional[ContinuationCursor] = None,
+                       max_pages: Optional[int] = None) -> AsyncIterator[QueryPage]:
+        """
+        취소/정정 가능한 국내 주식 주문 목록을 page 단위로 조회하면서 하나씩 반환하는 async generator.
+        cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+        max_pages: 조회할 최대 page 수. 지정하지 않은 경우 끝까지 조회한다.
+        """
+        return aiter_continuous_query(self._get_kr_orders_once, kr_orders_to_dataframe,
+                                      cursor=cursor, max_pages=max_pages)
+
+    async def get_os_orders(self, market_codes: Optional[Iterable[str]] = None,
+                            max_workers: int = 100) -> pd.DataFrame:
+        """
+        미체결 해외 주식 주문 목록을 DataFrame으로 반환한다.
+        거래소별 조회는 동시에 실행되며, 결과는 거래소 코드 목록 순서대로 합쳐진다.
+        market_codes: 조회할 거래소 코드 목록. 지정하지 않은 경우 모든 거래소를 조회한다.
+        max_workers: 동시에 보낼 request의 최대 개수
+        """
+        async def query(code: str) -> pd.DataFrame:
+            return await send_continuous_query_async(self._os_orders_request_function(code),
+                                                     self._os_orders_to_dataframe, is_kr=False)
+
+        codes = self._os_market_codes(market_codes, self._os_order_market_codes())
+        outputs = await gather_concurrently(query, codes, max_workers=max_workers)
+        return concat_dataframes(outputs)
+
+    def iter_os_orders(self, market_code: str, cursor: Optional[ContinuationCursor] = None,
+                       max_pages: Optional[int] = None) -> AsyncIterator[QueryPage]:
+        """
+        한 거래소의 미체결 해외 주식 주문 목록을 page 단위로 조회하면서 하나씩 반환하는 async generator.
+        market_code: 거래소 코드
+        cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+        max_pages: 조회할 최대 page 수. 지정하지 않은 경우 끝까지 조회한다.
+        """
+        code = self.market_code_map.to_4(market_code)
+        return aiter_continuous_query(self._os_orders_request_function(code),
+                                      self._os_orders_to_dataframe, is_kr=False,
+                                      cursor=cursor, max_pages=max_pages)
+
+    def _os_orders_request_function(self, market_code: str
+                                    ) -> Callable[..., Awaitable[APIResponse]]:
+        """
+        한 거래소의 미체결 해외 주식 주문 연속 조회에 사용할 coroutine 함수를 반환한다.
+        """
+        async def request_function(*args, **kwargs):
+            return await self._get_os_orders_once(market_code, *args, **kwargs)
+
+        return request_function
+
+    # 주문 조회------------
+
+    # 매매-----------------
+    async def buy_kr_stock(self, ticker: str, amount: int, price: int) -> Json:
+        """
+        국내 주식 매수(현금)
+        ticker: 종목코드
+        amount: 주문 수량
+        price: 주문 가격
+        """
+        req = self._kr_order_request(ticker, amount, price, True)
+        response = await self._send_post_request(req)
+        return response.outputs[0]
+
+    async def sell_kr_stock(self, ticker: str, amount: int, price: int) -> Json:
+        """
+        국내 주식 매도(현금)
+        ticker: 종목코드
+        amount: 주문 수량
+        price: 주문 가격
+        """
+        req = self._kr_order_request(ticker, amount, price, False)
+        response = await self._send_post_request(req)
+        return response.outputs[0]
+
+    async def buy_os_stock(self, market_code: str, ticker: str,
+                           amount: int, price: float) -> Json:
+        """
+        해외 주식 매수 주문
+        ticker: 종목 코드
+        market_code: 거래소 코드
+        amount: 주문 수량
+        price: 매매 가격 (1주당 가격, 해당 화폐)
+        """
+        req = self._os_order_request(ticker, market_code, amount, price, True)
+        response = await self._send_post_request(req)
+        return response.outputs[0]
+
+    async def sell_os_stock(self, market_code: str, ticker: str,
+                            amount: int, price: float) -> Json:
+        """
+        해외 주식 매도 주문
+        ticker: 종목 코드
+        market_code: 거래소 코드
+        amount: 주문 수량
+        price: 매매 가격 (1주당 가격, 해당 화폐)
+        """
+        req = self._os_order_request(ticker, market_code, amount, price, False)
+        response = await self._send_post_request(req)
+        return response.outputs[0]
+
+    async def send_basket_orders(self, orders: BasketOrders, max_workers: int = 100, *,
+                                 max_retries: int = 3, retry_delay: float = 0.1) -> pd.DataFrame:
+        """
+        여러 주문을 동시에 전송하고 결과를 DataFrame으로 반환한다.
+        전송 속도는 rate_limiter의 주문 제한을 따른다. (파라미터는 Api.send_basket_orders 참고)
+        """
+        results = await self._send_orders(to_basket_orders(orders), self._basket_order_request,
+                                          max_workers, max_retries, retry_delay)
+        return basket_results_to_dataframe(results)
+
+    async def _send_orders(self, orders: List[OrderItem],  # pylint: disable=too-many-arguments
+                           build_request: Callable[[OrderItem], APIRequestParameter],
+                           max_workers: int, max_retries: int, retry_delay: float
+                           ) -> List[BasketResult]:
+        """
+        주문(또는 취소) 목록을 동시에 전송하고 주문 순서대로 결과를 반환한다.
+        """
+        started = time.perf_counter()
+
+        async def send_request(req: APIRequestParameter) -> APIResponse:
+            return await self._send_post_request(req, raise_flag=False)
+
+        async def send(order: OrderItem) -> BasketResult:
+            return await send_basket_order_async(order, build_request, send_request,
+                                                 started=started, max_retries=max_retries,
+                                                 retry_delay=retry_delay)
+
+        return await gather_concurrently(send, orders, max_workers=max_workers)
+
+    # 매매-----------------
+
+    # 정정/취소-------------
+    async def cancel_kr_order(self, order_number: str, amount: Optional[int] = None,
+                              order_branch: str = "06010") -> Json:
+        """
+        국내 주식 주문을 취소한다.
+        order_number: 주문 번호.
+        amount: 취소할 수량. 지정하지 않은 경우 잔량 전부 취소.
+        return: 서버 response.
+        """
+        req = self._revise_cancel_kr_order_request(order_number, True, 1, amount, order_branch)
+        res = await self._send_post_request(req)
+        return res.body
+
+    async def cancel_all_kr_orders(self, tickers: Optional[Iterable[str]] = None,
+                                   side: Optional[str] = None, max_workers: int = 100, *,
+                                   max_retries: int = 3, retry_delay: float = 0.1) -> pd.DataFrame:
+        """
+        미체결된 모든 국내 주식 주문들을 동시에 취소하고 결과를 DataFrame으로 반환한다.
+        호출 속도는 rate_limiter의 주문 제한을 따른다. (파라미터는 Api.cancel_all_kr_orders 참고)
+        """
+        data = select_orders(await self.get_kr_orders(), tickers, side)
+        orders = to_cancel_orders(data, "정정취소가능수량")
+        results = await self._send_orders(orders, self._cancel_order_request,
+                                          max_workers, max_retries, retry_delay)
+        return cancel_results_to_dataframe(results)
+
+    async def cancel_os_order(self, market_code: str, ticker: str,
+                              order_number: str, amount: int) -> Json:
+        """
+        해외 주식 주문을 취소한다.
+        market_code: 거래소 코드
+        ticker: 종목코드
+        order_number: 주문 번호.
+        amount: 취소할 수량
+        return: 서버 response.
+        """
+        req = self._revise_cancel_os_order_request(ticker, market_code, order_number, amount)
+        res = await self._send_post_request(req)
+        return res.body
+
+    async def cancel_all_os_orders(self,  # pylint: disable=too-many-arguments
+                                   market_codes: Optional[Iterable[str]] = None,
+                                   tickers: Optional[Iterable[str]] = None,
+                                   side: Optional[str] = None, max_workers: int = 100, *,
+                                   max_retries: int = 3, retry_delay: float = 0.1) -> pd.DataFrame:
+        """
+        미체결된 모든 해외 주식 주문들을 동시에 취소하고 결과를 DataFrame으로 반환한다.
+        (파라미터는 Api.cancel_all_os_orders 참고)
+        """
+        data = await self.get_os_orders(market_codes, max_workers=max_workers)
+        data = select_orders(data, tickers, side)
+        orders = to_cancel_orders(data, "미체결수량", "해외거래소코드")
+        results = await self._send_orders(orders, self._cancel_order_request,
+                                          max_workers, max_retries, retry_delay)
+        return cancel_results_to_dataframe(results)
+
+    async def revise_kr_order(self, order_number: str,
+                              price: int,
+                              amount: Optional[int] = None,
+                              order_branch: str = "06010") -> Json:
+        """
+        국내 주식 주문의 가격을 정정한다.
+        order_number: 주문 번호.
+        price: 정정할 1주당 가격.
+        amount: 정정할 수량. 지정하지 않은 경우 잔량 전부 정정.
+        return: 서버 response.
+        """
+        req = self._revise_cancel_kr_order_request(order_number, False, price,
+                                                   amount, order_branch)
+        res = await self._send_post_request(req)
+        return res.body
+
+    # 정정/취소-------------
+
+    # HTTTP----------------
+
+    async def close(self) -> None:
+        """
+        HTTP 연결 pool을 닫는다.
+        """
+        await self.transport.close()
+
+    async def _send_get_request(self, req: APIRequestParameter,
+                                raise_flag: bool = True) -> APIResponse:
+        """
+        HTTP GET method로 request를 보내고 response를 반환한다.
+        """
+        url = self.domain.get_url(req.url_path)
+        headers = await self._parse_headers(req)
+        await self.rate_limiter.acquire_async(req)
+        if self.hedge_policy is None or not self.hedge_policy.applies_to(req):
+            return await send_get_request_async(url, headers, req.params, self.transport,
+                                                raise_flag=raise_flag)
+
+        async def send() -> APIResponse:
+            return await send_get_request_async(url, headers, req.params, self.transport,
+                                                raise_flag=False)
+
+        res = await self.hedge_policy.send_async(req, send, self.rate_limiter)
+        if raise_flag:
+            res.raise_if_error()
+        return res
+
+    async def _send_post_request(self, req: APIRequestParameter,
+                                 raise_flag: bool = True) -> APIResponse:
+        """
+        HTTP POST method로 request를 보내고 response를 반환한다.
+        """
+        url = self.domain.get_url(req.url_path)
+        headers = await self._parse_headers(req)
+
+        if self._needs_hash_key(req):
+            await self.set_hash_key(headers, req.params)
+        await self.rate_limiter.acquire_async(req)
+        return await send_post_request_async(url, headers, req.params, self.transport,
+                                             raise_flag=raise_flag)
+
+    async def _parse_headers(self, req: APIRequestParameter) -> Json:
+        """
+        API에 request에 필요한 header를 구해서 반환한다.
+        인증이 필요한 request인데 token이 유효하지 않은 경우 token을 새로 발급한다.
+        """
+        if req.requires_authentication:
+            await self._ensure_token()
+
+        return self._build_headers(req)
+
+    # HTTTP----------------
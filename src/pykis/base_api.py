@@ -0,0 +1,806 @@
+"""
+Api, AsyncApi가 공유하는 request 생성 로직을 담기 위한 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, Iterable, NamedTuple, Optional, List, Tuple, Union
+from datetime import datetime
+import pandas as pd
+
+from .request_utility import Json, APIRequestParameter, APIResponse, get_base_headers
+from .domain_info import DomainInfo
+from .access_token import AccessToken
+from .utility import merge_json, to_namedtuple, none_to_empty_dict, \
+    get_continuous_query_code, get_order_tr_id_from_market_code, \
+    get_revise_cancel_tr_id_from_market_code, \
+    get_currency_code_from_market_code, get_kr_period_code, DateLike, TimeLike, to_date, \
+    to_seconds, split_date_range, resample_ohlcv
+from .market_code_map import MarketCodeMap
+from .rate_limiter import RateLimiter
+from .token_store import TokenStore, get_token_key
+from .quote import QuoteCache, KST
+from .hedging import HedgePolicy
+from .basket import BasketOrder, CancelOrder
+from .response_converter import os_orders_to_dataframe, kr_minute_ohlcv_to_dataframe
+
+# 주문 request의 hash key 처리 방식.
+# hash key는 request 변조 방지를 위한 선택 사항이므로 생략할 수 있다.
+HASH_MODES = ("request", "skip")
+
+# 기간별 시세 조회 API는 한번에 최대 100개의 봉을 반환하므로,
+# 기간 분류 코드별로 100개를 넘지 않는 조회 구간의 길이(일)
+KR_OHLCV_RANGE_WINDOW_DAYS = {"D": 139, "W": 693, "M": 2900, "Y": 36000}
+
+# 국내 주식 정규장 시작/종료 시각
+KR_MARKET_OPEN = "090000"
+KR_MARKET_CLOSE = "153000"
+
+# 당일 분봉 조회 API는 한번에 최대 30개의 봉을 반환하므로, 30분 간격으로 나누어 조회한다.
+KR_MINUTE_OHLCV_WINDOW_SECONDS = 30 * 60
+
+
+class BaseApi:  # pylint: disable=too-many-instance-attributes
+    """
+    Api, AsyncApi의 공통 부분을 나타내는 클래스.
+    HTTP 통신은 하지 않고, API별 request 파라미터를 생성하는 역할만 한다.
+    """
+
+    def __init__(self, key_info: Json,  # pylint: disable=too-many-arguments
+                 domain_info: DomainInfo = DomainInfo(kind="real"),
+                 account_info: Optional[Json] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 token_store: Optional[TokenStore] = None, *,
+                 quote_cache: Optional[QuoteCache] = None,
+                 hash_mode: str = "request",
+                 hedge_policy: Optional[HedgePolicy] = None) -> None:
+        """
+        key_info: API 사용을 위한 인증키 정보. appkey, appsecret
+        domain_info: domain 정보 (실전/모의/etc)
+        account_info: 사용할 계좌 정보.
+                    { "account_code" : "[계좌번호 앞 8자리 숫자]", "product_code" : "[계좌번호 뒤 2자리 숫자]" }
+        rate_limiter: API 호출 속도 제한. 지정하지 않은 경우 domain의 기본 제한 값을 사용한다.
+        token_store: 발급받은 token을 process 간에 공유하기 위한 저장소. 지정하지 않은 경우 공유하지 않는다.
+        quote_cache: 현재가 시세 snapshot cache. 지정하지 않은 경우 기본 설정의 cache를 생성한다.
+        hash_mode: 주문 request의 hash key 처리 방식.
+                   request-주문마다 hash key를 발급받아 header에 추가, skip-hash key 없이 주문
+        hedge_policy: 응답이 늦은 조회 request를 한번 더 보내는 정책. 지정하지 않은 경우 사용하지 않는다.
+        """
+        if hash_mode not in HASH_MODES:
+            raise RuntimeError(f"hash_mode는 {HASH_MODES} 중 하나여야 합니다.")
+
+        self.key: Json = key_info
+        self.domain: DomainInfo = domain_info
+        self.token: AccessToken = AccessToken()
+        self.account: Optional[NamedTuple] = None
+        self.rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None \
+            else RateLimiter(domain_info)
+        self.token_store: Optional[TokenStore] = token_store
+        self.quote_cache: QuoteCache = quote_cache if quote_cache is not None else QuoteCache()
+        self.hash_mode: str = hash_mode
+        self.hedge_policy: Optional[HedgePolicy] = hedge_policy
+
+        self.set_account(account_info)
+        self.market_code_map = MarketCodeMap()
+
+    def set_account(self, account_info: Optional[Json]) -> None:
+        """
+        사용할 계좌 정보를 설정한다.
+        account_info: 사용할 계좌 정보.
+                    { "account_code" : "[계좌번호 앞 8자리 숫자]", "product_code" : "[계좌번호 뒤 2자리 숫자]" }
+        """
+        if account_info is not None:
+            self.account = to_namedtuple("account", account_info)
+
+    def need_authentication(self) -> bool:
+        """
+        authentication이 필요한지 여부를 반환한다.
+        token 저장소에 유효한 token이 있는 경우 저장된 token을 사용한다.
+        """
+        if self.token.is_valid():
+            return False
+        return not self._load_stored_token()
+
+    def _token_key(self) -> str:
+        """
+        token 저장소에서 사용할 key를 반환한다.
+        """
+        return get_token_key(self.key["appkey"], self.domain)
+
+    def _load_stored_token(self) -> bool:
+        """
+        token 저장소에서 유효한 token을 불러온다. 성공한 경우 True를 반환한다.
+        """
+        if self.token_store is None:
+            return False
+
+        stored = self.token_store.load(self._token_key())
+        if stored is None or not stored.is_valid():
+            return False
+
+        self.token.value = stored.value
+        self.token.valid_until = stored.valid_until
+        return True
+
+    def get_api_key_data(self) -> Json:
+        """
+        사용자의 api key 데이터를 반환한다.
+        """
+        return self.key
+
+    # 인증-----------------
+
+    def _create_token_request(self) -> APIRequestParameter:
+        """
+        access token 발급 request 파라미터를 반환한다.
+        """
+        url_path = "/oauth2/tokenP"
+
+        params = merge_json([
+            self.get_api_key_data(),
+            {
+                "grant_type": "client_credentials"
+            }
+        ])
+
+        return APIRequestParameter(url_path, tr_id=None, params=params,
+                                   requires_authentication=False, requires_hash=False)
+
+    def _approval_key_request(self) -> APIRequestParameter:
+        """
+        실시간 (WebSocket) 접속키 발급 request 파라미터를 반환한다.
+        """
+        url_path = "/oauth2/Approval"
+
+        params = {
+            "grant_type": "client_credentials",
+            "appkey": self.key["appkey"],
+            "secretkey": self.key["appsecret"],
+        }
+
+        return APIRequestParameter(url_path, tr_id=None, params=params,
+                                   requires_authentication=False, requires_hash=False)
+
+    @staticmethod
+    def _hash_key_request(params: Json) -> APIRequestParameter:
+        """
+        hash key 조회 request 파라미터를 반환한다.
+        """
+        url_path = "/uapi/hashkey"
+        return APIRequestParameter(url_path, tr_id=None, params=params,
+                                   requires_authentication=False, requires_hash=False)
+
+    # 인증-----------------
+
+    # 시세 조회------------
+
+    @staticmethod
+    def _kr_current_price_request(ticker: str) -> APIRequestParameter:
+        """
+        국내 주식 현재가 시세 조회 request 파라미터를 반환한다.
+        ticker: 종목코드
+        """
+        url_path = "/uapi/domestic-stock/v1/quotations/inquire-price"
+
+        tr_id = "FHKST01010100"
+
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": ticker
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    @staticmethod
+    def _kr_history_request(ticker: str, time_unit: str = "D") -> APIRequestParameter:
+        """
+        국내 주식 과거 가격 조회 request 파라미터를 반환한다.
+        ticker: 종목 코드
+        time_unit: 기간 분류 코드 (d/day-일, w/week-주, m/month-월)
+        """
+        url_path = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+        tr_id = "FHKST01010400"
+
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": ticker,
+            "FID_PERIOD_DIV_CODE": get_kr_period_code(time_unit),
+            "FID_ORG_ADJ_PRC": "0000000001"
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    @staticmethod
+    def _kr_ohlcv_range_request(ticker: str,  # pylint: disable=too-many-arguments
+                                start: DateLike, end: DateLike, time_unit: str = "D",
+                                adjusted: bool = True) -> APIRequestParameter:
+        """
+        국내 주식 기간별 시세 조회 request 파라미터를 반환한다. (최대 100개의 봉)
+        ticker: 종목 코드
+        start, end: 조회 시작일, 종료일 (포함)
+        time_unit: 기간 분류 코드 (d/day-일, w/week-주, m/month-월, y/year-년)
+        adjusted: True인 경우 수정주가, False인 경우 원주가
+        """
+        url_path = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        tr_id = "FHKST03010100"
+
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": ticker,
+            "FID_INPUT_DATE_1": to_date(start).strftime("%Y%m%d"),
+            "FID_INPUT_DATE_2": to_date(end).strftime("%Y%m%d"),
+            "FID_PERIOD_DIV_CODE": get_kr_period_code(time_unit),
+            "FID_ORG_ADJ_PRC": "0" if adjusted else "1",
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    @staticmethod
+    def _kr_ohlcv_range_requests(tickers: Iterable[str],  # pylint: disable=too-many-arguments
+                                 start: DateLike, end: Optional[DateLike],
+                                 time_unit: str, adjusted: bool) \
+            -> List[Tuple[str, APIRequestParameter]]:
+        """
+        여러 종목의 start ~ end 기간을 API가 한번에 반환할 수 있는 구간들로 나누어,
+        (종목코드, request 파라미터)의 list를 반환한다.
+        end: 조회 종료일. None인 경우 오늘
+        """
+        time_unit = get_kr_period_code(time_unit)
+        if time_unit not in KR_OHLCV_RANGE_WINDOW_DAYS:
+            raise RuntimeError(f"지원하지 않는 기간 분류 코드입니다: {time_unit}")
+
+        start = to_date(start)
+        end = datetime.now(KST).date() if end is None else to_date(end)
+        if start > end:
+            raise RuntimeError(f"조회 시작일({start})이 종료일({end})보다 늦습니다.")
+
+        windows = split_date_range(start, end, KR_OHLCV_RANGE_WINDOW_DAYS[time_unit])
+        return [(ticker, BaseApi._kr_ohlcv_range_request(ticker, window_start, window_end,
+                                                         time_unit, adjusted))
+                for ticker in tickers for window_start, window_end in windows]
+
+    @staticmethod
+    def _kr_minute_ohlcv_request(ticker: str, hour: int) -> APIRequestParameter:
+        """
+        국내 주식 당일 분봉 조회 request 파라미터를 반환한다. (hour 이전의 최대 30개의 봉)
+        ticker: 종목 코드
+        hour: 조회 기준 시각 (자정부터의 초)
+        """
+        url_path = "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+        tr_id = "FHKST03010200"
+
+        params = {
+            "FID_ETC_CLS_CODE": "",
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": ticker,
+            "FID_INPUT_HOUR_1": f"{hour // 3600:02d}{hour // 60 % 60:02d}{hour % 60:02d}",
+            "FID_PW_DATA_INCU_YN": "N",
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    @staticmethod
+    def _kr_minute_ohlcv_requests(tickers: Iterable[str], start: TimeLike,
+                                  end: Optional[TimeLike]) -> List[Tuple[str, APIRequestParameter]]:
+        """
+        여러 종목의 당일 start ~ end 분봉을 조회하기 위한 (종목코드, request 파라미터)의 list를 반환한다.
+        API는 기준 시각 이전의 최대 30개의 봉을 반환하므로, end부터 30분 간격의 기준 시각으로 나누어 조회한다.
+        거래가 없는 분이 있는 경우 각 조회 결과가 겹칠 수 있으나, 빠지는 봉은 없다.
+        end: 조회 종료 시각. None인 경우 현재 시각 (장 마감 이후에는 장 마감 시각)
+        """
+        start_seconds = to_seconds(start)
+        if end is None:
+            end_seconds = min(to_seconds(datetime.now(KST)), to_seconds(KR_MARKET_CLOSE))
+        else:
+            end_seconds = to_seconds(end)
+
+        hours = list(range(end_seconds, start_seconds - 1, -KR_MINUTE_OHLCV_WINDOW_SECONDS))
+        return [(ticker, BaseApi._kr_minute_ohlcv_request(ticker, hour))
+                for ticker in tickers for hour in hours]
+
+    @staticmethod
+    def _kr_minute_ohlcv_to_dataframe(responses: List[APIResponse], start: TimeLike,
+                                      end: Optional[TimeLike],
+                                      interval: Union[int, str]) -> pd.DataFrame:
+        """
+        당일 분봉 조회 결과 중 start ~ end 구간을 interval 단위의 봉으로 집계하여 반환한다.
+        """
+        data = kr_minute_ohlcv_to_dataframe(responses)
+        seconds = (data.index - data.index.normalize()).total_seconds()
+        mask = seconds >= to_seconds(start)
+        if end is not None:
+            mask &= seconds <= to_seconds(end)
+        data = data[mask]
+
+        if isinstance(interval, int):
+            interval = f"{interval}min"
+        if pd.Timedelta(interval) != pd.Timedelta(minutes=1):
+            data = resample_ohlcv(data, interval)
+        return data
+
+    @staticmethod
+    def _per_ticker_dataframe(tickers: List[str], jobs: List[Tuple[str, APIRequestParameter]],
+                              responses: List[APIResponse],
+                              to_dataframe: Callable[[List[APIResponse]], pd.DataFrame]) \
+            -> pd.DataFrame:
+        """
+        여러 종목의 조회 결과를 종목별로 to_dataframe으로 변환하여,
+        (종목코드, Date)를 index로 하는 하나의 DataFrame으로 합친다.
+        """
+        grouped = {ticker: [] for ticker in tickers}
+        for (ticker, _), res in zip(jobs, responses):
+            grouped[ticker].append(res)
+
+        if not tickers:
+            return pd.DataFrame()
+
+        datas = [to_dataframe(grouped[ticker]) for ticker in tickers]
+        return pd.concat(datas, keys=tickers, names=["종목코드"])
+
+    @staticmethod
+    def _os_current_price_request(ticker: str, market_code: str) -> APIRequestParameter:
+        """
+        해외 주식 현재가 시세 조회 request 파라미터를 반환한다.
+        ticker: 종목코드
+        market_code: 거래소 코드 (NYS-뉴욕, NAS-나스닥, AMS-아멕스, etc)
+        """
+        url_path = "/uapi/overseas-price/v1/quotations/price"
+
+        tr_id = "HHDFS00000300"
+        ticker = ticker.upper()
+        market_code = market_code.upper()
+
+        params = {
+            "AUTH": "",
+            "EXCD": market_code,
+            "SYMB": ticker
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    # 시세 조회------------
+
+    # 잔고 조회------------
+
+    def _kr_buyable_cash_request(self) -> APIRequestParameter:
+        """
+        구매 가능 현금(원화) 조회 request 파라미터를 반환한다.
+        """
+        url_path = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+        tr_id = "TTTC8908R"
+
+        if self.account is None:
+            msg = "계좌가 설정되지 않았습니다. set_account를 통해 계좌 정보를 설정해주세요."
+            raise RuntimeError(msg)
+
+        stock_code = ""
+        qry_price = 0
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            "PDNO": stock_code,
+            "ORD_UNPR": str(qry_price),
+            "ORD_DVSN": "02",
+            "CMA_EVLU_AMT_ICLD_YN": "Y",
+            "OVRS_ICLD_YN": "N"
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    @staticmethod
+    def _os_balance_market_codes() -> List[str]:
+        """
+        해외 주식 잔고 조회 대상 거래소 코드 목록을 반환한다.
+        """
+        return ["NASD", "SEHK", "SHAA", "SZAA", "TKSE", "HASE", "VNSE"]
+
+    def _os_market_codes(self, market_codes: Optional[Iterable[str]],
+                         default: List[str]) -> List[str]:
+        """
+        조회 대상 해외 거래소 코드 목록을 4글자 코드로 변환하여 반환한다. 중복된 코드는 제거한다.
+        market_codes가 None인 경우 default를 반환한다.
+        """
+        if market_codes is None:
+            return list(default)
+
+        codes = [self._to_os_balance_market_code(code) for code in market_codes]
+        return list(dict.fromkeys(codes))
+
+    def _to_os_balance_market_code(self, market_code: str) -> str:
+        """
+        거래소 코드를 4글자 코드로 변환한다. 잔고 조회 대상 거래소 코드(ex> SEHK)는 그대로 반환한다.
+        홍콩(HKS, SEHK)은 잔고 조회에만 사용하므로 market_code_map이 아닌 여기에서 변환한다.
+        """
+        market_code = market_code.upper()
+        if market_code == "HKS":
+            return "SEHK"
+        if market_code in self._os_balance_market_codes():
+            return market_code
+        return self.market_code_map.to_4(market_code)
+
+    def _held_os_balance_market_codes(self, exchange_codes: Iterable[str]) -> List[str]:
+        """
+        보유 종목의 거래소 코드 목록을 해외 주식 잔고 조회 대상 거래소 코드 목록으로 변환한다.
+        미국 거래소(나스닥/뉴욕/아멕스)는 NASD 한번의 조회로 모두 조회된다.
+        """
+        us_codes = {"NASD", "NAS", "NYSE", "NYS", "AMEX", "AMS"}
+        held = {"NASD" if code.upper() in us_codes else self._to_os_balance_market_code(code)
+                for code in exchange_codes if code}
+        return [code for code in self._os_balance_market_codes() if code in held]
+
+    def _os_present_balance_request(self) -> APIRequestParameter:
+        """
+        해외 주식 체결기준현재잔고 request 파라미터를 반환한다. 모든 거래소의 보유 종목을 한번에 조회한다.
+        """
+        url_path = "/uapi/overseas-stock/v1/trading/inquire-present-balance"
+        tr_id = "CTRP6504R"
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            "WCRC_FRCR_DVSN_CD": "02",  # 외화
+            "NATN_CD": "000",           # 전체 국가
+            "TR_MKET_CD": "00",         # 전체 시장
+            "INQR_DVSN_CD": "00",       # 전체
+        }
+
+        return APIRequestParameter(url_path, tr_id, params)
+
+    def _total_balance_request(self, is_kr: bool,
+                               extra_header: Json = None,
+                               extra_param: Json = None) -> APIRequestParameter:
+        """
+        주식 잔고 조회 request 파라미터를 반환한다.
+        """
+        if is_kr:
+            url_path = "/uapi/domestic-stock/v1/trading/inquire-balance"
+            tr_id = "TTTC8434R"
+        else:
+            url_path = "/uapi/overseas-stock/v1/trading/inquire-balance"
+            tr_id = "JTTT3012R"
+
+        extra_header = none_to_empty_dict(extra_header)
+        extra_param = none_to_empty_dict(extra_param)
+
+        extra_header = merge_json([{"tr_cont": ""}, extra_header])
+        query_code = get_continuous_query_code(is_kr)
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            f"CTX_AREA_FK{query_code}": "",
+            f"CTX_AREA_NK{query_code}": ""
+        }
+
+        params = merge_json([params, extra_param])
+        return APIRequestParameter(url_path, tr_id, params,
+                                   extra_header=extra_header)
+
+    def _os_total_balance_request(self, market_code: str, extra_header: Json = None,
+                                  extra_param: Json = None) -> APIRequestParameter:
+        """
+        해외 주식 잔고 조회 request 파라미터를 반환한다.
+        """
+        currency_code = get_currency_code_from_market_code(market_code)
+
+        extra_param = merge_json([{
+            "OVRS_EXCG_CD": market_code,
+            "TR_CRCY_CD": currency_code,
+        }, none_to_empty_dict(extra_param)])
+
+        is_kr = False
+
+        return self._total_balance_request(is_kr, extra_header, extra_param)
+
+    def _kr_total_balance_request(self, extra_header: Json = None,
+                                  extra_param: Json = None) -> APIRequestParameter:
+        """
+        국내 주식 잔고 조회 request 파라미터를 반환한다.
+        """
+        extra_param = merge_json([{
+            "AFHR_FLPR_YN": "N",
+            "FNCG_AMT_AUTO_RDPT_YN": "N",
+            "FUND_STTL_ICLD_YN": "N",
+            "INQR_DVSN": "01",
+            "OFL_YN": "N",
+            "PRCS_DVSN": "01",
+            "UNPR_DVSN": "01",
+        }, none_to_empty_dict(extra_param)])
+
+        is_kr = True
+
+        return self._total_balance_request(is_kr, extra_header, extra_param)
+
+    # 잔고 조회------------
+
+    # 주문 조회------------
+
+    def _kr_orders_request(self, extra_header: Optional[Json] = None,
+                           extra_param: Optional[Json] = None) -> APIRequestParameter:
+        """
+        취소/정정 가능한 국내 주식 주문 목록 조회 request 파라미터를 반환한다.
+        """
+        url_path = "/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl"
+        tr_id = "TTTC8036R"
+
+        extra_header = none_to_empty_dict(extra_header)
+        extra_param = none_to_empty_dict(extra_param)
+
+        extra_header = merge_json([{"tr_cont": ""}, extra_header])
+        query_code = get_continuous_query_code(True)
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            f"CTX_AREA_FK{query_code}": "",
+            f"CTX_AREA_NK{query_code}": "",
+            "INQR_DVSN_1": "0",
+            "INQR_DVSN_2": "0"
+        }
+
+        params = merge_json([params, extra_param])
+        return APIRequestParameter(url_path, tr_id, params,
+                                   extra_header=extra_header)
+
+    def _os_orders_request(self, markert_code: str, extra_header: Json = None,
+                           extra_param: Json = None) -> APIRequestParameter:
+        """
+        미체결 해외 주식 주문 목록 조회 request 파라미터를 반환한다.
+        """
+        url_path = "/uapi/overseas-stock/v1/trading/inquire-nccs"
+        tr_id = "JTTT3018R"
+
+        extra_header = none_to_empty_dict(extra_header)
+        extra_param = none_to_empty_dict(extra_param)
+        markert_code = self.market_code_map.to_4(markert_code)
+
+        extra_header = merge_json([{"tr_cont": ""}, extra_header])
+        query_code = get_continuous_query_code(False)
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            f"CTX_AREA_FK{query_code}": "",
+            f"CTX_AREA_NK{query_code}": "",
+            "OVRS_EXCG_CD": markert_code,
+            "SORT_SQN": "DS",
+        }
+
+        params = merge_json([params, extra_param])
+        return APIRequestParameter(url_path, tr_id, params,
+                                   extra_header=extra_header)
+
+    def _os_orders_to_dataframe(self, res: APIResponse) -> pd.DataFrame:
+        """
+        미체결 해외 주식 주문 조회 결과를 DataFrame으로 변환한다.
+        """
+        return os_orders_to_dataframe(res, self.market_code_map)
+
+    def _os_order_market_codes(self) -> List[str]:
+        """
+        미체결 해외 주식 주문 조회 대상 거래소 코드 목록을 반환한다.
+        """
+        return [code for code in self.market_code_map.codes_4 if code not in ["AMEX", "NYSE"]]
+
+    # 주문 조회------------
+
+    # 매매-----------------
+
+    def _kr_order_request(self, ticker: str, amount: int, price: int,
+                          buy: bool) -> APIRequestParameter:
+        """
+        국내 주식 매매(현금) request 파라미터를 반환한다.
+        """
+        order_type = "00"  # 00: 지정가, 01: 시장가, ...
+        if price <= 0:
+            price = 0
+            order_type = "01"   # 시장가
+
+        url_path = "/uapi/domestic-stock/v1/trading/order-cash"
+
+        if buy:
+            tr_id = "TTTC0802U"  # buy
+        else:
+            tr_id = "TTTC0801U"  # sell
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            "PDNO": ticker,
+            "ORD_DVSN": order_type,
+            "ORD_QTY": str(amount),
+            "ORD_UNPR": str(price),
+            "CTAC_TLNO": "",
+            # "SLL_TYPE": "01",
+            # "ALGO_NO": ""
+        }
+
+        return APIRequestParameter(url_path, tr_id=tr_id,
+                                   params=params, requires_authentication=True, requires_hash=True)
+
+    def _os_order_request(self, ticker: str, market_code: str,  # pylint: disable=too-many-arguments
+                          order_amount: int, price: float, buy: bool) -> APIRequestParameter:
+        """
+        해외 주식 매매 request 파라미터를 반환한다.
+        """
+        order_type = "00"  # 00: 지정가, 01: 시장가, ...
+        price_as_str = f"{price:.2f}"
+        market_code = self.market_code_map.to_4(market_code)
+
+        if price <= 0:
+            raise RuntimeError("[Error] 해외 주식 매매에서는 시장가를 지원하지 않습니다")
+
+        url_path = "/uapi/overseas-stock/v1/trading/order"
+
+        tr_id = get_order_tr_id_from_market_code(market_code, buy)
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            "PDNO": ticker,
+            "OVRS_EXCG_CD": market_code,
+            "ORD_DVSN": order_type,
+            "ORD_QTY": str(order_amount),
+            "OVRS_ORD_UNPR": price_as_str,
+            "ORD_SVR_DVSN_CD": "0",
+        }
+
+        return APIRequestParameter(url_path, tr_id=tr_id,
+                                   params=params, requires_authentication=True, requires_hash=True)
+
+    def _basket_order_request(self, order: BasketOrder) -> APIRequestParameter:
+        """
+        basket 주문 하나의 request 파라미터를 반환한다.
+        """
+        if order.is_kr():
+            return self._kr_order_request(order.ticker, order.amount, int(order.price),
+                                          order.is_buy())
+        return self._os_order_request(order.ticker, order.market_code, order.amount,
+                                      order.price, order.is_buy())
+
+    # 매매-----------------
+
+    # 정정/취소-------------
+
+    def _revise_cancel_kr_order_request(self,  # pylint: disable=too-many-arguments
+                                        order_number: str,
+                                        is_cancel: bool,
+                                        price: int,
+                                        amount: Optional[int] = None,
+                                        order_branch: str = "06010"
+                                        ) -> APIRequestParameter:
+        """
+        국내 주식 주문 정정/취소 request 파라미터를 반환한다.
+        order_number: 주문 번호
+        order_branch: 주문점(통상 06010)
+        amount: 정정/취소 적용할 주문의 수량
+        price: 정정할 주문의 가격
+        is_cancel: 정정구분(취소-True, 정정-False)
+        """
+        url_path = "/uapi/domestic-stock/v1/trading/order-rvsecncl"
+        tr_id = "TTTC0803U"
+
+        order_dv: str = "00"  # order_dv: 주문유형(00-지정가)
+        cancel_dv: str = "02" if is_cancel else "01"
+
+        apply_all = "N"  # apply_all: 잔량전부주문여부(Y-잔량전부, N-잔량일부)
+
+        if amount is None or amount <= 0:
+            apply_all = "Y"
+            amount = 1
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            "KRX_FWDG_ORD_ORGNO": order_branch,
+            "ORGN_ODNO": order_number,
+            "ORD_DVSN": order_dv,
+            "RVSE_CNCL_DVSN_CD": cancel_dv,
+            "ORD_QTY": str(amount),
+            "ORD_UNPR": str(price),
+            "QTY_ALL_ORD_YN": apply_all
+        }
+
+        return APIRequestParameter(url_path, tr_id=tr_id,
+                                   params=params, requires_authentication=True, requires_hash=True)
+
+    def _revise_cancel_os_order_request(self,  # pylint: disable=too-many-arguments
+                                        ticker: str,
+                                        market_code: str,
+                                        order_number: str,
+                                        amount: int, *,
+                                        is_cancel: bool = True,
+                                        price: float = 0
+                                        ) -> APIRequestParameter:
+        """
+        해외 주식 주문 정정/취소 request 파라미터를 반환한다.
+        ticker: 종목코드
+        market_code: 거래소 코드
+        order_number: 주문 번호
+        amount: 정정/취소 적용할 주문의 수량
+        is_cancel: 정정구분(취소-True, 정정-False)
+        price: 정정할 주문의 가격 (취소인 경우 무시)
+        """
+        url_path = "/uapi/overseas-stock/v1/trading/order-rvsecncl"
+        market_code = self.market_code_map.to_4(market_code)
+        tr_id = get_revise_cancel_tr_id_from_market_code(market_code)
+
+        params = {
+            "CANO": self.account.account_code,
+            "ACNT_PRDT_CD": self.account.product_code,
+            "OVRS_EXCG_CD": market_code,
+            "PDNO": ticker,
+            "ORGN_ODNO": order_number,
+            "RVSE_CNCL_DVSN_CD": "02" if is_cancel else "01",
+            "ORD_QTY": str(amount),
+            "OVRS_ORD_UNPR": "0" if is_cancel else f"{price:.2f}",
+            "ORD_SVR_DVSN_CD": "0",
+        }
+
+        return APIRequestParameter(url_path, tr_id=tr_id,
+                                   params=params, requires_authentication=True, requires_hash=True)
+
+    def _cancel_order_request(self, order: CancelOrder) -> APIRequestParameter:
+        """
+        취소할 주문 하나의 request 파라미터를 반환한다.
+        """
+        if order.is_kr():
+            return self._revise_cancel_kr_order_request(order.order_number, True, 1,
+                                                        order.amount, order.order_branch)
+        if order.amount is None:
+            raise RuntimeError("[Error] 해외 주식 주문 취소에는 취소할 수량이 필요합니다")
+        return self._revise_cancel_os_order_request(order.ticker, order.market_code,
+                                                    order.order_number, order.amount)
+
+    # 정정/취소-------------
+
+    # HTTTP----------------
+
+    def _needs_hash_key(self, req: APIRequestParameter) -> bool:
+        """
+        request를 보내기 전에 hash key를 발급받아야 하는지 여부를 반환한다.
+        """
+        return req.requires_hash and self.hash_mode == "request"
+
+    def _build_headers(self, req: APIRequestParameter) -> Json:
+        """
+        API에 request에 필요한 header를 구해서 반환한다.
+        인증이 필요한 request의 경우 유효한 token이 이미 발급되어 있어야 한다.
+        """
+
+        headers = [
+            get_base_headers(),
+            self.get_api_key_data(),
+        ]
+
+        tr_id = self.domain.adjust_tr_id(req.tr_id)
+
+        if tr_id is not None:
+            headers.append({"tr_id": tr_id})
+
+        if req.requires_authentication:
+            headers.append({
+                "authorization": self.token.value,
+            })
+
+        extra_header = none_to_empty_dict(req.extra_header)
+        headers.append(extra_header)
+
+        headers = merge_json(headers)
+
+        return headers
+
+    # HTTTP----------------
@@ -0,0 +1,344 @@
+"""
+여러 주문(basket) 또는 여러 주문의 취소를 동시에 전송하기 위한 주문/결과 타입 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Awaitable, Callable, Iterable, List, NamedTuple, Optional, Union
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+
+from .request_utility import APIRequestParameter, APIResponse, Json
+
+# 다시 보내도 되는 일시적인 오류의 응답 메시지 코드. (주문이 접수되지 않은 경우만 포함한다)
+# EGW00201: 초당 거래건수를 초과하였습니다.
+RETRY_MESSAGE_CODES = ("EGW00201",)
+
+# 국내 주식 주문으로 처리하는 거래소 코드
+KR_MARKET_CODES = ("", "KR", "KRX")
+
+_SIDES = {
+    "BUY": "buy", "B": "buy", "매수": "buy",
+    "SELL": "sell", "S": "sell", "매도": "sell",
+}
+
+
+class BasketOrder(NamedTuple):
+    """
+    basket에 포함된 주문 하나
+    ticker: 종목코드
+    side: 매수/매도 구분 (buy/sell, 매수/매도)
+    amount: 주문 수량
+    price: 주문 가격 (1주당 가격). 국내 주식은 0 이하인 경우 시장가 주문
+    market_code: 거래소 코드. None(또는 KRX)인 경우 국내 주식 주문, 그 외에는 해외 주식 주문 (ex> NAS, NYS)
+    """
+    ticker: str
+    side: str
+    amount: int
+    price: float = 0
+    market_code: Optional[str] = None
+
+    def is_buy(self) -> bool:
+        """
+        매수 주문인 경우 True를 반환한다.
+        """
+        return self.side == "buy"
+
+    def is_kr(self) -> bool:
+        """
+        국내 주식 주문인 경우 True를 반환한다.
+        """
+        return self.market_code is None or self.market_code.upper() in KR_MARKET_CODES
+
+
+class CancelOrder(NamedTuple):
+    """
+    취소할 미체결 주문 하나
+    order_number: 취소할 주문의 주문번호
+    ticker: 종목코드
+    side: 매수/매도 구분 (buy/sell)
+    amount: 취소할 수량. 국내 주식은 None인 경우 잔량 전부 취소
+    market_code: 거래소 코드. None인 경우 국내 주식 주문
+    order_branch: 주문점 (국내 주식, 통상 06010)
+    """
+    order_number: str
+    ticker: str
+    side: str
+    amount: Optional[int] = None
+    market_code: Optional[str] = None
+    order_branch: str = "06010"
+
+    def is_buy(self) -> bool:
+        """
+        매수 주문의 취소인 경우 True를 반환한다.
+        """
+        return self.side == "buy"
+
+    def is_kr(self) -> bool:
+        """
+        국내 주식 주문의 취소인 경우 True를 반환한다.
+        """
+        return self.market_code is None or self.market_code.upper() in KR_MARKET_CODES
+
+
+OrderItem = Union[BasketOrder, CancelOrder]
+
+
+class BasketResult(NamedTuple):
+    """
+    basket 주문(또는 취소) 하나의 전송 결과
+    """
+    order: OrderItem
+    success: bool
+    order_number: Optional[str]     # 주문번호
+    order_time: Optional[str]       # 주문시각 (HHMMSS)
+    code: str                       # 응답 메시지 코드
+    message: str                    # 응답 메시지 또는 예외 메시지
+    attempts: int                   # 전송 횟수
+    latency: float                  # 마지막 전송의 응답 시간 (초, 속도 제한 대기 및 hash key 발급 포함)
+    elapsed: float                  # basket 전송 시작부터 응답까지 걸린 시간 (초)
+
+
+BasketOrders = Union[pd.DataFrame, Iterable[Union[BasketOrder, Json, tuple]]]
+
+
+def _optional(value: Any) -> Any:
+    """
+    DataFrame의 빈 값(NaN, None)을 None으로 바꾼다.
+    """
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+
+def to_side(side: str) -> str:
+    """
+    매수/매도 구분(buy/sell, b/s, 매수/매도)을 buy 또는 sell로 변환한다.
+    """
+    value = _SIDES.get(str(side).upper())
+    if value is None:
+        raise RuntimeError(f"매수/매도 구분이 올바르지 않습니다: {side}")
+    return value
+
+
+def _to_basket_order(item: Union[BasketOrder, Json, tuple]) -> BasketOrder:
+    """
+    주문 하나를 BasketOrder로 변환한다.
+    """
+    if isinstance(item, dict):
+        order = BasketOrder(**item)
+    else:
+        order = BasketOrder(*item)
+
+    side = to_side(order.side)
+
+    amount = int(order.amount)
+    if amount <= 0:
+        raise RuntimeError(f"주문 수량이 올바르지 않습니다: {order.ticker}, {order.amount}")
+
+    price = _optional(order.price)
+    market_code = _optional(order.market_code)
+    return BasketOrder(str(order.ticker), side, amount,
+                       0 if price is None else price,
+                       None if market_code is None else str(market_code))
+
+
+def to_basket_orders(orders: BasketOrders) -> List[BasketOrder]:
+    """
+    주문 목록을 BasketOrder의 list로 변환한다.
+    orders: BasketOrder, dict, tuple의 목록 또는
+            ticker, side, amount, price(선택), market_code(선택) column을 가진 DataFrame
+    """
+    if isinstance(orders, pd.DataFrame):
+        columns = [column for column in BasketOrder._fields if column in orders.columns]
+        orders = orders[columns].to_dict("records")
+    return [_to_basket_order(item) for item in orders]
+
+
+def select_orders(data: pd.DataFrame, tickers: Optional[Iterable[str]] = None,
+                  side: Optional[str] = None) -> pd.DataFrame:
+    """
+    주문 조회 결과 DataFrame에서 지정한 종목, 매수/매도 구분의 주문만 골라서 반환한다.
+    tickers: 종목코드 목록. 지정하지 않은 경우 모든 종목
+    side: 매수/매도 구분 (buy/sell, 매수/매도). 지정하지 않은 경우 모두
+    """
+    if data.empty:
+        return data
+
+    selected = np.ones(len(data), dtype=bool)
+    if tickers is not None:
+        selected &= data["종목코드"].astype(str).isin([str(ticker) for ticker in tickers]).to_numpy()
+    if side is not None:
+        side_name = "매수" if to_side(side) == "buy" else "매도"
+        selected &= (data["매수매도구분"] == side_name).to_numpy()
+    return data[selected]
+
+
+def to_cancel_orders(data: pd.DataFrame, amount_column: str,
+                     market_column: Optional[str] = None) -> List[CancelOrder]:
+    """
+    주문 조회 결과 DataFrame(get_kr_orders, get_os_orders)을 CancelOrder의 list로 변환한다.
+    amount_column: 취소할 수량 column (정정취소가능수량, 미체결수량)
+    market_column: 거래소 코드 column. 지정하지 않은 경우 국내 주식 주문
+    """
+    if data.empty:
+        return []
+
+    market_codes = [None] * len(data) if market_column is None else data[market_column]
+    return [
+        CancelOrder(str(order_number), str(ticker), "buy" if side == "매수" else "sell",
+                    int(amount), _optional(market_code), str(branch))
+        for order_number, ticker, side, amount, market_code, branch in zip(
+            data.index, data["종목코드"], data["매수매도구분"], data[amount_column],
+            market_codes, data["주문점"])
+    ]
+
+
+def is_retryable(res: APIResponse) -> bool:
+    """
+    주문이 접수되지 않은 일시적인 오류로, 다시 보내도 되는 응답인 경우 True를 반환한다.
+    """
+    return not res.is_ok() and res.message_code in RETRY_MESSAGE_CODES
+
+
+def _make_basket_result(order: OrderItem,  # pylint: disable=too-many-arguments
+                        res: Optional[APIResponse],
+                        error: Optional[BaseException], *,
+                        attempts: int, latency: float, started: float) -> BasketResult:
+    """
+    주문의 응답(또는 예외)으로 BasketResult를 만든다.
+    """
+    elapsed = time.perf_counter() - started
+    if res is None:
+        return BasketResult(order, False, None, None, "", str(error), attempts, latency, elapsed)
+
+    output = res.outputs[0] if res.is_ok() and res.outputs else {}
+    return BasketResult(order, res.is_ok(), output.get("ODNO"), output.get("ORD_TMD"),
+                        res.message_code, res.message, attempts, latency, elapsed)
+
+
+def send_basket_order(order: OrderItem,  # pylint: disable=too-many-arguments
+                      build_request: Callable[[OrderItem], APIRequestParameter],
+                      send: Callable[[APIRequestParameter], APIResponse], *,
+                      started: float, max_retries: int, retry_delay: float) -> BasketResult:
+    """
+    basket 주문(또는 취소) 하나를 전송한다. 주문이 접수되지 않은 일시적인 오류인 경우
+    retry_delay부터 2배씩 늘어나는 간격으로 최대 max_retries번 다시 보낸다.
+    build_request: 주문의 request 파라미터를 만드는 함수
+    send: request를 보내고 응답을 반환하는 함수 (오류 응답에 예외를 던지지 않아야 한다)
+    started: basket 전송 시작 시각 (time.perf_counter)
+    """
+    res, error, attempts, latency = None, None, 0, 0.0
+    try:
+        req = build_request(order)
+        while True:
+            attempts += 1
+            sent = time.perf_counter()
+            res = send(req)
+            latency = time.perf_counter() - sent
+            if attempts > max_retries or not is_retryable(res):
+                break
+            time.sleep(retry_delay * 2 ** (attempts - 1))
+    except Exception as exception:  # pylint: disable=broad-except
+        res, error = None, exception
+
+    return _make_basket_result(order, res, error, attempts=attempts, latency=latency,
+                               started=started)
+
+
+async def send_basket_order_async(order: OrderItem,  # pylint: disable=too-many-arguments
+                                  build_request: Callable[[OrderItem], APIRequestParameter],
+                                  send: Callable[[APIRequestParameter], Awaitable[APIResponse]],
+                                  *, started: float, max_retries: int,
+                                  retry_delay: float) -> BasketResult:
+    """
+    send_basket_order의 asyncio 버전.
+    """
+    res, error, attempts, latency = None, None, 0, 0.0
+    try:
+        req = build_request(order)
+        while True:
+            attempts += 1
+            sent = time.perf_counter()
+            res = await send(req)
+            latency = time.perf_counter() - sent
+            if attempts > max_retries or not is_retryable(res):
+                break
+            await asyncio.sleep(retry_delay * 2 ** (attempts - 1))
+    except Exception as exception:  # pylint: disable=broad-except
+        res, error = None, exception
+
+    return _make_basket_result(order, res, error, attempts=attempts, latency=latency,
+                               started=started)
+
+
+def _objects(values: List[Any]) -> Any:
+    """
+    값 목록을 object 타입의 array로 변환한다. (빈 목록인 경우에도 float 타입이 되지 않도록 한다)
+    """
+    return pd.array(values, dtype="object")
+
+
+def _result_columns(results: List[BasketResult]) -> Json:
+    """
+    basket 주문/취소 결과의 공통 column들을 반환한다.
+    """
+    return {
+        "성공": pd.array([result.success for result in results], dtype="bool"),
+        "주문번호": _objects([result.order_number for result in results]),
+        "주문시각": _objects([result.order_time for result in results]),
+        "응답코드": _objects([result.code for result in results]),
+        "메시지": _objects([result.message for result in results]),
+        "전송횟수": pd.array([result.attempts for result in results], dtype="int64"),
+        "응답시간": pd.array([result.latency for result in results], dtype="float64"),
+        "경과시간": pd.array([result.elapsed for result in results], dtype="float64"),
+    }
+
+
+def _side_column(results: List[BasketResult]) -> pd.Categorical:
+    """
+    매수매도구분 column을 반환한다.
+    """
+    return pd.Categorical(["매수" if result.order.is_buy() else "매도" for result in results],
+                          categories=["매도", "매수"])
+
+
+def basket_results_to_dataframe(results: List[BasketResult]) -> pd.DataFrame:
+    """
+    basket 주문 결과를 basket 순서대로 DataFrame으로 변환한다.
+    """
+    return pd.DataFrame({
+        "종목코드": _objects([result.order.ticker for result in results]),
+        "매수매도구분": _side_column(results),
+        "주문수량": pd.array([result.order.amount for result in results], dtype="int64"),
+        "주문가격": pd.array([result.order.price for result in results], dtype="float64"),
+        "거래소코드": _objects([result.order.market_code or "KRX" for result in results]),
+        **_result_columns(results),
+    })
+
+
+def cancel_results_to_dataframe(results: List[BasketResult]) -> pd.DataFrame:
+    """
+    주문 취소 결과를 원주문번호를 index로 하는 DataFrame으로 변환한다.
+    주문번호, 주문시각은 취소 주문의 주문번호, 주문시각이다.
+    """
+    return pd.DataFrame({
+        "종목코드": _objects([result.order.ticker for result in results]),
+        "매수매도구분": _side_column(results),
+        "취소수량": pd.array([result.order.amount for result in results], dtype="Int64"),
+        "거래소코드": _objects([result.order.market_code or "KRX" for result in results]),
+        **_result_columns(results),
+    }, index=pd.Index([result.order.order_number for result in results], name="원주문번호",
+                      dtype="object"))
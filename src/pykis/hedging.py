@@ -0,0 +1,287 @@
+"""
+응답이 늦은 조회 request를 한번 더 보내(hedged request) tail latency를 줄이기 위한 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+import asyncio
+import threading
+import time
+
+from .request_utility import APIRequestParameter, APIResponse
+from .rate_limiter import RateLimiter, TokenBucket
+
+
+class HedgePolicy:  # pylint: disable=too-many-instance-attributes
+    """
+    멱등(idempotent)한 GET request의 응답이 최근 응답 시간의 percentile보다 늦어지면
+    같은 request를 한번 더 보내고, 먼저 도착한 응답을 사용하는 정책.
+    AsyncApi에서는 늦게 도착하는 쪽을 취소한다. thread 기반 Api에서는 이미 보낸 request를 중단할 수 없으므로,
+    늦게 도착하는 쪽은 응답을 받을 때까지 thread와 연결을 계속 사용하고 응답은 버린다.
+    추가로 보내는 request는 rate_limiter의 제한 안에서, 제한 값의 budget 비율 이하로만 보낸다.
+    """
+
+    def __init__(self, percentile: float = 95.0,  # pylint: disable=too-many-arguments
+                 budget: float = 0.05, *,
+                 min_delay: float = 0.005,
+                 window: int = 256,
+                 min_samples: int = 32,
+                 categories: Iterable[str] = ("quote",),
+                 max_workers: int = 32) -> None:
+        """
+        percentile: request를 한번 더 보내기 전에 기다릴 시간으로 사용할 최근 응답 시간의 percentile (0~100)
+        budget: 추가 request에 사용할 수 있는 API 호출 속도 제한의 비율 (ex> 0.05-제한 값의 5%)
+        min_delay: 추가 request를 보내기 전에 기다릴 최소 시간 (초)
+        window: tr_id별로 보관할 최근 응답 시간의 개수
+        min_samples: 추가 request를 보내기 시작할 때까지 필요한 응답 시간의 개수
+        categories: 적용할 request의 종류 (RateLimiter.category 참고). 기본값은 시세 조회만 적용
+        max_workers: Api(thread 기반)에서 request를 보낼 때 사용할 thread의 최대 개수
+        """
+        if not 0 < percentile < 100:
+            raise RuntimeError("percentile은 0보다 크고 100보다 작아야 합니다.")
+        if not 0 < budget <= 1:
+            raise RuntimeError("budget은 0보다 크고 1 이하여야 합니다.")
+
+        self.percentile: float = percentile
+        self.budget: float = budget
+        self.min_delay: float = min_delay
+        self.window: int = window
+        self.min_samples: int = min_samples
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.max_workers: int = max_workers
+
+        self.requests: int = 0      # 적용 대상 request 수
+        self.hedges: int = 0        # 추가로 보낸 request 수
+        self.hedge_wins: int = 0    # 추가로 보낸 request의 응답이 먼저 도착한 횟수
+
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budgets: Dict[str, TokenBucket] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: int = 0    # thread pool에 제출되어 끝나지 않은 request 수
+        self._lock = threading.Lock()
+
+    def applies_to(self, req: APIRequestParameter) -> bool:
+        """
+        request에 정책을 적용하는 경우 True를 반환한다.
+        """
+        return RateLimiter.category(req) in self.categories
+
+    def record(self, tr_id: str, latency: float) -> None:
+        """
+        응답 시간을 기록한다.
+        """
+        with self._lock:
+            latencies = self._latencies.get(tr_id)
+            if latencies is None:
+                latencies = self._latencies[tr_id] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def delay(self, tr_id: str) -> Optional[float]:
+        """
+        request를 한번 더 보내기 전에 기다릴 시간(초)을 반환한다.
+        기록된 응답 시간이 min_samples개 미만인 경우 None (한번 더 보내지 않는다.)
+        """
+        with self._lock:
+            latencies = self._latencies.get(tr_id)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def try_hedge(self, req: APIRequestParameter, rate_limiter: RateLimiter) -> bool:
+        """
+        budget과 rate_limiter가 허용하는 경우 추가 request를 예약하고 True를 반환한다.
+        """
+        category = RateLimiter.category(req)
+        rate = rate_limiter.rate_of(req)
+        with self._lock:
+            bucket = self._budgets.get(category)
+            if bucket is None and rate is not None:
+                bucket = self._budgets[category] = TokenBucket(rate * self.budget)
+
+            now = time.monotonic()
+            if bucket is not None and bucket.earliest(now) > now:
+                return False
+            if not rate_limiter.try_acquire(req):
+                return False
+
+            if bucket is not None:
+                bucket.consume(now)
+            self.hedges += 1
+        return True
+
+    def _count(self, hedge_won: bool) -> None:
+        """
+        적용 대상 request 수와 추가 request의 승리 횟수를 기록한다.
+        """
+        with self._lock:
+            self.requests += 1
+            self.hedge_wins += int(hedge_won)
+
+    def _timed(self, tr_id: str, send: Callable[[], APIResponse],
+               started: Optional[threading.Event] = None) -> APIResponse:
+        """
+        request를 보내고 응답 시간을 기록한다.
+        started: 지정한 경우 request를 보내기 시작할 때 set한다. (thread pool에서 대기한 시간은 제외)
+        """
+        if started is not None:
+            started.set()
+        start = time.perf_counter()
+        res = send()
+        self.record(tr_id, time.perf_counter() - start)
+        return res
+
+    async def _timed_async(self, tr_id: str,
+                           send: Callable[[], Awaitable[APIResponse]]) -> APIResponse:
+        """
+        _timed의 asyncio 버전.
+        """
+        start = time.perf_counter()
+        res = await send()
+        self.record(tr_id, time.perf_counter() - start)
+        return res
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        request를 보낼 때 사용할 thread pool을 반환한다. 처음 사용될 때 생성한다.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="pykis-hedge")
+            return self._executor
+
+    def _submit(self, tr_id: str, send: Callable[[], APIResponse],
+                started: Optional[threading.Event] = None) -> Future:
+        """
+        thread pool에서 request를 보낸다. 끝나지 않은 request 수를 함께 기록한다.
+        """
+        executor = self._get_executor()
+        with self._lock:
+            self._in_flight += 1
+        future = executor.submit(self._timed, tr_id, send, started)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _has_free_worker(self) -> bool:
+        """
+        thread pool에 바로 request를 보낼 수 있는 thread가 남아있는 경우 True를 반환한다.
+        """
+        with self._lock:
+            return self._in_flight < self.max_workers
+
+    def send(self, req: APIRequestParameter, send: Callable[[], APIResponse],
+             rate_limiter: RateLimiter) -> APIResponse:
+        """
+        request를 보내고, 응답이 늦어지면 한번 더 보내서 먼저 도착한 응답을 반환한다.
+        req: 보낼 request. rate_limiter 대기는 이미 끝난 상태여야 한다.
+        send: request를 보내고 응답을 반환하는 함수 (오류 응답에 예외를 던지지 않아야 한다)
+        늦게 도착하는 request는 취소하지 않는다. 응답을 받을 때까지 thread pool의 thread를 사용하므로,
+        남은 thread가 없는 동안에는 추가 request를 보내지 않는다.
+        """
+        tr_id = req.tr_id or req.url_path
+        delay = self.delay(tr_id)
+        if delay is None:
+            self._count(False)
+            return self._timed(tr_id, send)
+
+        # delay는 thread pool에서 대기한 시간을 제외하고, 원래 request가 실제로 보내진 시각부터 잰다.
+        # delay 동안 보내지지 못했거나 남은 thread가 없는 경우에는 추가 request도 대기만 하므로 보내지 않는다.
+        started = threading.Event()
+        primary = self._submit(tr_id, send, started)
+        done = set()
+        if started.wait(timeout=delay):
+            done, _ = wait([primary], timeout=delay)
+        if done or not started.is_set() or not self._has_free_worker() \
+                or not self.try_hedge(req, rate_limiter):
+            self._count(False)
+            return primary.result()
+
+        hedge = self._submit(tr_id, send)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in _in_order(done, [primary, hedge]):
+                error = future.exception()
+                if error is None:
+                    self._count(future is hedge)
+                    return future.result()
+
+        self._count(False)
+        raise error
+
+    async def send_async(self, req: APIRequestParameter,
+                         send: Callable[[], Awaitable[APIResponse]],
+                         rate_limiter: RateLimiter) -> APIResponse:
+        """
+        send의 asyncio 버전. 늦게 도착하는 request는 취소한다.
+        """
+        tr_id = req.tr_id or req.url_path
+        delay = self.delay(tr_id)
+        if delay is None:
+            self._count(False)
+            return await self._timed_async(tr_id, send)
+
+        primary = asyncio.ensure_future(self._timed_async(tr_id, send))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.try_hedge(req, rate_limiter):
+                self._count(False)
+                return await primary
+
+            tasks.append(asyncio.ensure_future(self._timed_async(tr_id, send)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in _in_order(done, tasks):
+                    error = task.exception()
+                    if error is None:
+                        self._count(task is not primary)
+                        return task.result()
+
+            self._count(False)
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self) -> None:
+        """
+        request를 보낼 때 사용한 thread pool을 정리한다.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _in_order(done: Iterable[Future], order: List[Future]) -> List[Future]:
+    """
+    완료된 future들을 order의 순서대로 반환한다. (동시에 완료된 경우 원래 request를 우선한다.)
+    """
+    done = set(done)
+    return [future for future in order if future in done]
@@ -0,0 +1,60 @@
+"""
+API 응답 body의 json 해석에 사용할 decoder를 관리하는 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Optional, Union
+import json
+
+JsonDecoder = Callable[[Union[bytes, str]], Any]
+
+
+def default_json_decoder() -> JsonDecoder:
+    """
+    orjson이 설치되어 있는 경우 orjson.loads, 없는 경우 json.loads를 반환한다.
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return json.loads
+    return orjson.loads  # pylint: disable=no-member
+
+
+_decoder: JsonDecoder = default_json_decoder()
+
+
+def get_json_decoder() -> JsonDecoder:
+    """
+    현재 사용 중인 json decoder를 반환한다.
+    """
+    return _decoder
+
+
+def set_json_decoder(decoder: Optional[JsonDecoder] = None) -> None:
+    """
+    API 응답 body의 json 해석에 사용할 decoder를 설정한다.
+    decoder: bytes를 받아서 json 객체를 반환하는 함수 (ex> json.loads, orjson.loads).
+             None인 경우 기본 decoder(orjson이 설치되어 있으면 orjson.loads)를 사용한다.
+    """
+    global _decoder  # pylint: disable=global-statement
+    _decoder = default_json_decoder() if decoder is None else decoder
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    현재 설정된 decoder로 json을 해석한다.
+    """
+    return _decoder(data)
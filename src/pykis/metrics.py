@@ -0,0 +1,325 @@
+"""
+API 호출의 응답 시간과 횟수를 집계하기 위한 metrics 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+from bisect import bisect_left
+from urllib.parse import urlsplit
+import functools
+import threading
+import time
+import pandas as pd
+
+Json = Dict[str, Any]
+Labels = Tuple[str, ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 응답 시간 단계. network-HTTP 왕복, decode-응답 body json 해석, convert-DataFrame 변환
+PHASES = ("network", "decode", "convert")
+
+# 응답 시간 histogram의 bucket 상한 (초). 25us부터 2배씩 약 105초까지
+BUCKETS: Tuple[float, ...] = tuple(0.000025 * 2 ** i for i in range(23))
+
+# counter 이름과 label 이름
+COUNTERS: Dict[str, Tuple[str, ...]] = {
+    "requests": ("tr_id", "url_path"),                      # 보낸 request 수
+    "failures": ("tr_id", "url_path", "rt_cd", "msg_cd"),   # 오류 응답 수 (http 오류, rt_cd != 0)
+    "transport_errors": ("tr_id", "url_path", "error"),     # 연결 실패 등 응답을 받지 못한 횟수
+    "token_refreshes": (),                                  # access token 발급 횟수
+    "hashkey_calls": (),                                    # hash key 발급 횟수
+    "pages": ("tr_id", "url_path"),                         # 연속 조회 page 수
+}
+
+_HISTOGRAM_LABELS = ("tr_id", "url_path", "phase")
+_TOKEN_PATH = "/oauth2/tokenP"
+_HASHKEY_PATH = "/uapi/hashkey"
+
+
+class Histogram:
+    """
+    고정된 bucket을 사용하는 응답 시간 histogram.
+    thread-safe하지 않으므로 Metrics의 lock 안에서 사용한다.
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = BUCKETS) -> None:
+        self.bounds: Tuple[float, ...] = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)    # 마지막은 +Inf bucket
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        값 하나를 기록한다.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """
+        bucket 안에서 선형 보간한 q(0~1) 분위수를 반환한다. 기록된 값이 없는 경우 NaN
+        """
+        if self.count == 0:
+            return float("nan")
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count > 0 and cumulative + count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        bucket별 누적 개수를 반환한다. (마지막은 +Inf bucket)
+        """
+        result, total = [], 0
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class Metrics:
+    """
+    tr_id, url_path별 응답 시간 histogram과 request/오류/token 발급/hash key 발급/연속 조회 page counter.
+    여러 thread에서 동시에 사용할 수 있다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS) -> None:
+        """
+        buckets: 응답 시간 histogram의 bucket 상한 (초)
+        """
+        self.buckets: Tuple[float, ...] = buckets
+        self._histograms: Dict[Labels, Histogram] = {}
+        self._counters: Dict[str, Dict[Labels, int]] = {name: {} for name in COUNTERS}
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, tr_id: str, url_path: str, seconds: float) -> None:
+        """
+        단계(network/decode/convert)별 응답 시간을 기록한다.
+        """
+        labels = (tr_id, url_path, phase)
+        with self._lock:
+            histogram = self._histograms.get(labels)
+            if histogram is None:
+                histogram = self._histograms[labels] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, *labels: str, value: int = 1) -> None:
+        """
+        counter를 value만큼 증가시킨다.
+        name: counter 이름 (COUNTERS 참고)
+        labels: counter의 label 값들 (COUNTERS의 label 순서)
+        """
+        with self._lock:
+            counter = self._counters[name]
+            counter[labels] = counter.get(labels, 0) + value
+
+    def record_response(self, res: Any, url: str, headers: Mapping[str, str],
+                        started: float) -> None:
+        """
+        응답 하나의 network/decode 시간과 request/오류 횟수를 기록한다.
+        res: APIResponse
+        started: request를 보내기 시작한 시각 (time.perf_counter)
+        """
+        received = time.perf_counter()
+        tr_id, url_path = headers.get("tr_id", ""), urlsplit(url).path
+        res.tr_id, res.url_path = tr_id, url_path
+
+        try:
+            res.body    # pylint: disable=pointless-statement
+            decoded = time.perf_counter()
+            ok, rt_cd, msg_cd = res.is_ok(), res.return_code or "", res.message_code
+        except ValueError:
+            decoded = time.perf_counter()
+            ok, rt_cd, msg_cd = False, "", "invalid-json"
+
+        self.observe("network", tr_id, url_path, received - started)
+        self.observe("decode", tr_id, url_path, decoded - received)
+        self.increment("requests", tr_id, url_path)
+        if not ok:
+            self.increment("failures", tr_id, url_path, rt_cd,
+                           msg_cd or f"HTTP{res.http_code}")
+        if url_path == _TOKEN_PATH:
+            self.increment("token_refreshes")
+        elif url_path == _HASHKEY_PATH:
+            self.increment("hashkey_calls")
+
+    def record_transport_error(self, url: str, headers: Mapping[str, str],
+                               error: BaseException) -> None:
+        """
+        응답을 받지 못한 request를 기록한다.
+        """
+        tr_id, url_path = headers.get("tr_id", ""), urlsplit(url).path
+        self.increment("requests", tr_id, url_path)
+        self.increment("transport_errors", tr_id, url_path, type(error).__name__)
+
+    def reset(self) -> None:
+        """
+        기록된 값을 모두 지운다.
+        """
+        with self._lock:
+            self._histograms = {}
+            self._counters = {name: {} for name in COUNTERS}
+
+    def snapshot(self) -> Json:
+        """
+        현재까지 기록된 값을 json 형태로 반환한다.
+        histograms: tr_id, url_path, phase, count, sum, p50, p90, p99, buckets([상한, 누적 개수] list)
+        counters: counter 이름별 [label 값들, 개수] list
+        """
+        with self._lock:
+            histograms = [
+                dict(zip(_HISTOGRAM_LABELS, labels), count=histogram.count, sum=histogram.sum,
+                     p50=histogram.quantile(0.5), p90=histogram.quantile(0.9),
+                     p99=histogram.quantile(0.99),
+                     buckets=[list(pair) for pair in zip(list(histogram.bounds) + [float("inf")],
+                                                         histogram.cumulative_counts())])
+                for labels, histogram in sorted(self._histograms.items())
+            ]
+            counters = {
+                name: [dict(zip(COUNTERS[name], labels), value=value)
+                       for labels, value in sorted(values.items())]
+                for name, values in self._counters.items()
+            }
+        return {"histograms": histograms, "counters": counters}
+
+    def summary(self) -> pd.DataFrame:
+        """
+        (tr_id, url_path, phase)별 응답 시간 요약을 DataFrame으로 반환한다.
+        column: 횟수, 평균(ms), p50(ms), p90(ms), p99(ms)
+        """
+        rows = self.snapshot()["histograms"]
+        index = pd.MultiIndex.from_tuples([tuple(row[name] for name in _HISTOGRAM_LABELS)
+                                           for row in rows], names=list(_HISTOGRAM_LABELS))
+        return pd.DataFrame({
+            "횟수": pd.array([row["count"] for row in rows], dtype="int64"),
+            "평균(ms)": [row["sum"] / row["count"] * 1000 for row in rows],
+            "p50(ms)": [row["p50"] * 1000 for row in rows],
+            "p90(ms)": [row["p90"] * 1000 for row in rows],
+            "p99(ms)": [row["p99"] * 1000 for row in rows],
+        }, index=index)
+
+    def to_prometheus(self, prefix: str = "pykis") -> str:
+        """
+        Prometheus text exposition format으로 변환한 문자열을 반환한다.
+        """
+        snapshot = self.snapshot()
+        name = f"{prefix}_request_duration_seconds"
+        lines = [f"# HELP {name} API request latency by phase (network, decode, convert).",
+                 f"# TYPE {name} histogram"]
+        for row in snapshot["histograms"]:
+            labels = _format_labels({key: row[key] for key in _HISTOGRAM_LABELS})
+            for bound, count in row["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{{{labels},le=\"{le}\"}} {count}")
+            lines.append(f"{name}_sum{{{labels}}} {row['sum']!r}")
+            lines.append(f"{name}_count{{{labels}}} {row['count']}")
+
+        for counter, rows in snapshot["counters"].items():
+            name = f"{prefix}_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            for row in rows:
+                labels = _format_labels({key: row[key] for key in COUNTERS[counter]})
+                lines.append(f"{name}{{{labels}}} {row['value']}" if labels
+                             else f"{name} {row['value']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    """
+    Prometheus label 문자열을 반환한다. (ex> tr_id="FHKST01010100",url_path="/uapi/...")
+    """
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    return ",".join(f"{key}=\"{escape(str(value))}\"" for key, value in labels.items())
+
+
+_metrics: Optional[Metrics] = None  # pylint: disable=invalid-name
+
+
+def enable_metrics(metrics: Optional[Metrics] = None) -> Metrics:
+    """
+    metrics 기록을 시작하고 기록에 사용하는 Metrics 객체를 반환한다.
+    metrics: 기록에 사용할 Metrics 객체. 지정하지 않은 경우 새로 생성한다.
+    """
+    global _metrics  # pylint: disable=global-statement
+    _metrics = metrics if metrics is not None else Metrics()
+    return _metrics
+
+
+def disable_metrics() -> None:
+    """
+    metrics 기록을 중지한다.
+    """
+    global _metrics  # pylint: disable=global-statement
+    _metrics = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    """
+    기록에 사용 중인 Metrics 객체를 반환한다. 기록 중이 아닌 경우 None
+    """
+    return _metrics
+
+
+def _response_labels(args: Tuple[Any, ...]) -> Tuple[str, str]:
+    """
+    변환 함수의 인자 중 첫번째 APIResponse(또는 APIResponse list)의 tr_id, url_path를 반환한다.
+    """
+    for arg in args:
+        if isinstance(arg, list):
+            arg = arg[0] if arg else None
+        tr_id = getattr(arg, "tr_id", None)
+        if tr_id is not None:
+            return tr_id, arg.url_path
+    return "", ""
+
+
+def timed_conversion(function: F) -> F:
+    """
+    DataFrame 변환 함수의 실행 시간을 convert 단계로 기록하는 decorator.
+    tr_id, url_path는 인자로 받은 응답에서 구하며, 응답이 없는 경우 url_path에 함수 이름을 사용한다.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        metrics = _metrics
+        if metrics is None:
+            return function(*args, **kwargs)
+
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        tr_id, url_path = _response_labels(args)
+        metrics.observe("convert", tr_id, url_path or function.__name__, elapsed)
+        return result
+
+    return wrapper  # type: ignore
+
+
+def count_page(res: Any) -> None:
+    """
+    연속 조회 page 하나를 기록한다.
+    """
+    metrics = _metrics
+    if metrics is not None:
+        metrics.increment("pages", getattr(res, "tr_id", ""), getattr(res, "url_path", ""))
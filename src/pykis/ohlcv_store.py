@@ -0,0 +1,332 @@
+"""
+국내 주식 OHLCV를 종목/기간 분류별 column 파일로 보관하는 local 저장소 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .quote import KST
+from .response_converter import KR_OHLCV_SCHEMA
+from .schema import empty_dataframe
+from .utility import DateLike, to_date, get_kr_period_code
+
+# 저장하는 column. 모든 column은 little endian int64로 저장하며, Date는 epoch nanosecond이다.
+COLUMNS = ("Date", "Open", "High", "Low", "Close", "Volume")
+_DTYPE = np.dtype("<i8")
+
+Tickers = Union[str, Iterable[str]]
+
+
+def _to_ns(value: DateLike) -> int:
+    """
+    날짜를 Date column 값(epoch nanosecond)으로 변환한다.
+    """
+    return int(np.datetime64(to_date(value), "ns").view(np.int64))
+
+
+def _to_list(tickers: Tickers) -> List[str]:
+    """
+    종목코드 하나 또는 목록을 중복 없는 list로 변환한다.
+    """
+    if isinstance(tickers, str):
+        return [tickers]
+    return list(dict.fromkeys(tickers))
+
+
+class OhlcvStore:
+    """
+    국내 주식 OHLCV를 종목/기간 분류별로 보관하는 append-only columnar 저장소.
+    {path}/{기간 분류 코드}/{종목코드}/ 아래에 column별 파일을 두고, 읽을 때는 memory map으로 필요한 구간만 읽는다.
+    update는 저장된 마지막 봉부터 오늘까지만 API로 조회하여 이어 붙인다.
+
+    ex>
+        store = OhlcvStore()
+        store.update(api, ["005930", "000660"], start="2015-01-01")
+        ohlcv = store.read("005930", start="2020-01-01")
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        path: 저장 경로. 기본값은 ~/.pykis/ohlcv
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".pykis", "ohlcv")
+        self.path: str = path
+        self._lock = threading.Lock()
+
+    def _directory(self, ticker: str, time_unit: str) -> str:
+        """
+        종목/기간 분류의 저장 경로를 반환한다.
+        """
+        return os.path.join(self.path, get_kr_period_code(time_unit), ticker)
+
+    @staticmethod
+    def _length(directory: str) -> int:
+        """
+        저장된 봉의 수를 반환한다. 쓰는 도중 중단된 경우를 위해 가장 짧은 column을 기준으로 한다.
+        """
+        sizes = []
+        for column in COLUMNS:
+            try:
+                sizes.append(os.path.getsize(os.path.join(directory, f"{column}.i8")))
+            except FileNotFoundError:
+                return 0
+        return min(sizes) // _DTYPE.itemsize
+
+    @staticmethod
+    def _column(directory: str, column: str, length: int) -> np.ndarray:
+        """
+        column 파일의 앞 length개 값을 memory map으로 반환한다.
+        """
+        if length == 0:
+            return np.empty(0, dtype=_DTYPE)
+        return np.memmap(os.path.join(directory, f"{column}.i8"), dtype=_DTYPE,
+                         mode="r", shape=(length,))
+
+    @staticmethod
+    def _read_meta(directory: str) -> Dict[str, Any]:
+        """
+        저장 정보를 반환한다. start: 이 날짜 이후의 봉이 빠짐없이 저장되어 있음 (YYYYMMDD)
+        """
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _write_meta(directory: str, meta: Dict[str, Any]) -> None:
+        """
+        저장 정보를 기록한다.
+        """
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+
+    def tickers(self, time_unit: str = "D") -> List[str]:
+        """
+        time_unit의 데이터가 저장된 종목코드 목록을 반환한다.
+        """
+        directory = os.path.join(self.path, get_kr_period_code(time_unit))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if self._length(os.path.join(directory, name)) > 0)
+
+    def date_range(self, ticker: str, time_unit: str = "D") -> Optional[Tuple[date, date]]:
+        """
+        저장된 첫 봉과 마지막 봉의 날짜를 반환한다. 저장된 봉이 없는 경우 None을 반환한다.
+        """
+        directory = self._directory(ticker, time_unit)
+        length = self._length(directory)
+        if length == 0:
+            return None
+        dates = self._column(directory, "Date", length)
+        first, last = np.array([dates[0], dates[-1]]).view("datetime64[ns]").astype("datetime64[D]")
+        return first.item(), last.item()
+
+    def read(self, ticker: str, start: Optional[DateLike] = None,
+             end: Optional[DateLike] = None, time_unit: str = "D") -> pd.DataFrame:
+        """
+        저장된 OHLCV 중 start ~ end(포함) 구간을 get_kr_ohlcv_range와 같은 형식의 DataFrame으로 반환한다.
+        해당 구간의 값만 파일에서 읽으며, 반환된 DataFrame은 파일과 독립된 복사본이다.
+        start, end: 조회 시작일, 종료일. None인 경우 저장된 처음/마지막 봉까지
+        """
+        directory = self._directory(ticker, time_unit)
+        length = self._length(directory)
+        if length == 0:
+            return empty_dataframe(KR_OHLCV_SCHEMA)
+
+        dates = self._column(directory, "Date", length)
+        lower = 0 if start is None else int(np.searchsorted(dates, _to_ns(start), side="left"))
+        upper = length if end is None else int(np.searchsorted(dates, _to_ns(end), side="right"))
+
+        data = {column: np.array(self._column(directory, column, length)[lower:upper])
+                for column in COLUMNS[1:]}
+        index = pd.DatetimeIndex(np.array(dates[lower:upper]).view("datetime64[ns]"), name="Date")
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def read_many(self, tickers: Iterable[str], start: Optional[DateLike] = None,
+                  end: Optional[DateLike] = None, time_unit: str = "D") -> pd.DataFrame:
+        """
+        여러 종목의 저장된 OHLCV를 (종목코드, Date)를 index로 하는 DataFrame으로 반환한다.
+        """
+        tickers = _to_list(tickers)
+        if not tickers:
+            return pd.DataFrame()
+        datas = [self.read(ticker, start, end, time_unit) for ticker in tickers]
+        return pd.concat(datas, keys=tickers, names=["종목코드"])
+
+    def write(self, ticker: str, data: pd.DataFrame, time_unit: str = "D") -> None:
+        """
+        OHLCV DataFrame(get_kr_ohlcv_range 형식)을 저장한다. data의 기간과 겹치는 기존 봉은 data로 대체된다.
+        data가 저장된 마지막 봉 이후까지 이어지는 경우(일반적인 update) 겹치는 끝 부분만 잘라내고 이어 붙이며,
+        그 외의 경우에는 column 파일 전체를 다시 쓴다.
+        """
+        if data.empty:
+            return
+
+        dates = data.index.values.astype("datetime64[ns]").view(np.int64)
+        values = {"Date": dates}
+        values.update({column: data[column].to_numpy(dtype=np.int64) for column in COLUMNS[1:]})
+
+        directory = self._directory(ticker, time_unit)
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            length = self._length(directory)
+            stored_dates = self._column(directory, "Date", length)
+            keep = int(np.searchsorted(stored_dates, dates[0], side="left"))
+            tail = int(np.searchsorted(stored_dates, dates[-1], side="right"))
+            del stored_dates
+
+            if tail == length:
+                self._append(directory, values, keep)
+            else:
+                self._rewrite(directory, values, keep, tail, length)
+
+    @staticmethod
+    def _append(directory: str, values: Dict[str, np.ndarray], keep: int) -> None:
+        """
+        각 column 파일을 앞 keep개만 남기고 잘라낸 뒤 values를 이어 쓴다.
+        """
+        for column in COLUMNS:
+            with open(os.path.join(directory, f"{column}.i8"), "ab") as file:
+                file.truncate(keep * _DTYPE.itemsize)
+                file.write(values[column].astype(_DTYPE, copy=False).tobytes())
+
+    def _rewrite(self, directory: str,  # pylint: disable=too-many-arguments
+                 values: Dict[str, np.ndarray], keep: int, tail: int, length: int) -> None:
+        """
+        기존 봉의 [0, keep), values, 기존 봉의 [tail, length)를 합쳐서 각 column 파일을 교체한다.
+        """
+        for column in COLUMNS:
+            stored = self._column(directory, column, length)
+            merged = np.concatenate([stored[:keep], values[column].astype(_DTYPE, copy=False),
+                                     stored[tail:]])
+            del stored
+
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{column}-")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(merged.tobytes())
+                os.replace(temp_path, os.path.join(directory, f"{column}.i8"))
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    def _plan_update(self, tickers: List[str], start: date, end: date,
+                     time_unit: str, full: bool) -> Dict[date, List[str]]:
+        """
+        종목별로 API 조회를 시작할 날짜를 정하여, 시작 날짜별 종목코드 목록을 반환한다.
+        저장된 구간이 start 이전부터 시작하는 경우 마지막 봉(장중에 저장되었을 수 있음)부터 다시 조회한다.
+        """
+        plan: Dict[date, List[str]] = {}
+        for ticker in tickers:
+            stored_start = self._read_meta(self._directory(ticker, time_unit)).get("start")
+            stored = self.date_range(ticker, time_unit)
+
+            fetch_from = start
+            if not full and stored is not None and stored_start is not None \
+                    and to_date(stored_start) <= start:
+                fetch_from = stored[1]
+
+            if fetch_from <= end:
+                plan.setdefault(fetch_from, []).append(ticker)
+        return plan
+
+    def _save_update(self, tickers: List[str], data: pd.DataFrame,
+                     start: date, time_unit: str) -> None:
+        """
+        update에서 조회한 (종목코드, Date) index의 DataFrame을 종목별로 저장한다.
+        """
+        frames = {}
+        if not data.empty:
+            frames = {ticker: frame.droplevel(0)
+                      for ticker, frame in data.groupby(level=0, sort=False)}
+
+        for ticker in tickers:
+            if ticker in frames:
+                self.write(ticker, frames[ticker], time_unit)
+
+            directory = self._directory(ticker, time_unit)
+            os.makedirs(directory, exist_ok=True)
+            meta = self._read_meta(directory)
+            stored_start = meta.get("start")
+            if stored_start is None or start < to_date(stored_start):
+                meta["start"] = start.strftime("%Y%m%d")
+                self._write_meta(directory, meta)
+
+    def update(self, api: Any, tickers: Tickers,  # pylint: disable=too-many-arguments
+               start: DateLike, end: Optional[DateLike] = None, time_unit: str = "D", *,
+               full: bool = False, adjusted: bool = True, max_workers: int = 8) -> None:
+        """
+        start ~ end 기간의 OHLCV 중 저장되지 않은 부분만 API로 조회하여 저장한다.
+        api: Api 객체
+        tickers: 종목코드 또는 종목코드 목록
+        start, end: 저장할 기간. end가 None인 경우 오늘
+        full: True인 경우 저장된 데이터와 관계없이 전체 기간을 다시 조회한다.
+              수정주가는 액면분할 등으로 과거 값이 바뀔 수 있으므로, 이 경우 full=True로 다시 저장한다.
+        adjusted, max_workers: get_kr_ohlcv_ranges 참고
+        """
+        tickers = _to_list(tickers)
+        start, end = self._update_range(start, end)
+        for fetch_from, group in self._plan_update(tickers, start, end, time_unit, full).items():
+            data = api.get_kr_ohlcv_ranges(group, fetch_from, end, time_unit,
+                                           adjusted=adjusted, max_workers=max_workers)
+            self._save_update(group, data, start, time_unit)
+
+    async def update_async(self, api: Any,  # pylint: disable=too-many-arguments
+                           tickers: Tickers, start: DateLike, end: Optional[DateLike] = None,
+                           time_unit: str = "D", *, full: bool = False, adjusted: bool = True,
+                           max_workers: int = 100) -> None:
+        """
+        update의 asyncio 버전. api: AsyncApi 객체
+        """
+        tickers = _to_list(tickers)
+        start, end = self._update_range(start, end)
+        for fetch_from, group in self._plan_update(tickers, start, end, time_unit, full).items():
+            data = await api.get_kr_ohlcv_ranges(group, fetch_from, end, time_unit,
+                                                 adjusted=adjusted, max_workers=max_workers)
+            self._save_update(group, data, start, time_unit)
+
+    @staticmethod
+    def _update_range(start: DateLike, end: Optional[DateLike]) -> Tuple[date, date]:
+        """
+        update 기간을 date로 변환한다. end가 None인 경우 오늘
+        """
+        start = to_date(start)
+        end = datetime.now(KST).date() if end is None else to_date(end)
+        if start > end:
+            raise RuntimeError(f"조회 시작일({start})이 종료일({end})보다 늦습니다.")
+        return start, end
+
+    def get(self, api: Any, ticker: str,  # pylint: disable=too-many-arguments
+            start: DateLike, end: Optional[DateLike] = None, time_unit: str = "D",
+            **kwargs: Any) -> pd.DataFrame:
+        """
+        저장되지 않은 부분을 API로 조회하여 저장한 뒤, start ~ end 기간의 OHLCV를 반환한다.
+        kwargs: update 참고
+        """
+        self.update(api, ticker, start, end, time_unit, **kwargs)
+        return self.read(ticker, start, end, time_unit)
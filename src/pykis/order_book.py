@@ -0,0 +1,211 @@
+"""
+가격/시간 우선 원칙으로 주문을 체결하는 호가창(order book) 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from collections import deque
+import bisect
+
+
+def kr_tick_size(price: int) -> int:
+    """
+    국내 주식(유가증권/코스닥 공통)의 가격대별 호가 단위를 반환한다.
+    """
+    for limit, tick in ((2000, 1), (5000, 5), (20000, 10), (50000, 50),
+                        (200000, 100), (500000, 500)):
+        if price < limit:
+            return tick
+    return 1000
+
+
+class BookOrder:  # pylint: disable=too-many-instance-attributes
+    """
+    호가창에 들어오는 주문 하나.
+    price가 0인 주문은 시장가 주문이며, 체결되지 않은 수량은 호가창에 남기지 않고 취소된다.
+    """
+    __slots__ = ["order_number", "account", "ticker", "is_buy", "price", "amount",
+                 "filled", "cancelled", "original_number", "time", "sequence"]
+
+    def __init__(self, order_number: str, account: str,  # pylint: disable=too-many-arguments
+                 ticker: str, is_buy: bool, *, price: int, amount: int,
+                 original_number: str = "", time: str = "") -> None:
+        """
+        order_number: 주문 번호
+        account: 주문한 계좌 (ex> 12345678-01)
+        price: 주문 가격. 0인 경우 시장가
+        amount: 주문 수량
+        original_number: 정정 주문인 경우 원주문 번호
+        time: 주문 시각 (HHMMSS)
+        """
+        self.order_number: str = order_number
+        self.account: str = account
+        self.ticker: str = ticker
+        self.is_buy: bool = is_buy
+        self.price: int = price
+        self.amount: int = amount
+        self.filled: int = 0
+        self.cancelled: int = 0
+        self.original_number: str = original_number
+        self.time: str = time
+        self.sequence: int = 0       # 호가창에 들어온 순서 (시간 우선 원칙에 사용)
+
+    @property
+    def remaining(self) -> int:
+        """
+        체결되거나 취소되지 않은 수량
+        """
+        return self.amount - self.filled - self.cancelled
+
+    def is_market(self) -> bool:
+        """
+        시장가 주문인 경우 True를 반환한다.
+        """
+        return self.price == 0
+
+
+class Fill(NamedTuple):
+    """
+    체결 하나
+    """
+    ticker: str
+    price: int              # 체결 가격 (먼저 호가창에 있던 주문의 가격)
+    amount: int             # 체결 수량
+    buy_order: BookOrder
+    sell_order: BookOrder
+
+
+class OrderBook:
+    """
+    한 종목의 호가창. 가격 우선, 같은 가격에서는 먼저 들어온 주문 우선으로 체결한다.
+    thread-safe하지 않으므로 SimulatedExchange의 lock 안에서 사용한다.
+    """
+
+    def __init__(self, ticker: str) -> None:
+        self.ticker: str = ticker
+        self._levels: Tuple[Dict[int, Deque[BookOrder]], Dict[int, Deque[BookOrder]]] = ({}, {})
+        self._prices: Tuple[List[int], List[int]] = ([], [])   # (매도, 매수) 호가. 오름차순
+        self._sequence: int = 0
+
+    def _side(self, is_buy: bool) -> Tuple[Dict[int, Deque[BookOrder]], List[int]]:
+        """
+        매수/매도 쪽의 (가격별 대기 주문, 호가 목록)을 반환한다.
+        """
+        index = int(is_buy)
+        return self._levels[index], self._prices[index]
+
+    def best_bid(self) -> Optional[int]:
+        """
+        최우선 매수 호가. 없는 경우 None
+        """
+        prices = self._prices[1]
+        return prices[-1] if prices else None
+
+    def best_ask(self) -> Optional[int]:
+        """
+        최우선 매도 호가. 없는 경우 None
+        """
+        prices = self._prices[0]
+        return prices[0] if prices else None
+
+    def depth(self, levels: int = 10) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        (매수 호가, 매도 호가)를 최우선 호가부터 levels개씩 반환한다. 각 호가는 (가격, 잔량)
+        """
+        bids, bid_prices = self._side(True)
+        asks, ask_prices = self._side(False)
+        return ([(price, sum(order.remaining for order in bids[price]))
+                 for price in reversed(bid_prices[-levels:])],
+                [(price, sum(order.remaining for order in asks[price]))
+                 for price in ask_prices[:levels]])
+
+    def _crosses(self, order: BookOrder, price: int) -> bool:
+        """
+        order가 price의 상대 호가와 체결될 수 있는 경우 True를 반환한다.
+        """
+        if order.is_market():
+            return True
+        return price <= order.price if order.is_buy else price >= order.price
+
+    def submit(self, order: BookOrder) -> List[Fill]:
+        """
+        주문을 상대 호가와 체결하고, 남은 수량은 호가창에 올린다. (시장가 주문의 남은 수량은 취소)
+        return: 체결 목록
+        """
+        fills = []
+        levels, prices = self._side(not order.is_buy)
+        while order.remaining > 0 and prices:
+            price = prices[-1] if not order.is_buy else prices[0]
+            if not self._crosses(order, price):
+                break
+
+            queue = levels[price]
+            while order.remaining > 0 and queue:
+                resting = queue[0]
+                amount = min(order.remaining, resting.remaining)
+                resting.filled += amount
+                order.filled += amount
+                if order.is_buy:
+                    fills.append(Fill(self.ticker, price, amount, order, resting))
+                else:
+                    fills.append(Fill(self.ticker, price, amount, resting, order))
+                if resting.remaining == 0:
+                    queue.popleft()
+
+            if not queue:
+                del levels[price]
+                prices.remove(price)
+
+        if order.remaining > 0:
+            if order.is_market():
+                order.cancelled += order.remaining
+            else:
+                self._rest(order)
+        return fills
+
+    def _rest(self, order: BookOrder) -> None:
+        """
+        주문을 호가창에 올린다.
+        """
+        self._sequence += 1
+        order.sequence = self._sequence
+
+        levels, prices = self._side(order.is_buy)
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = deque()
+            bisect.insort(prices, order.price)
+        queue.append(order)
+
+    def cancel(self, order: BookOrder, amount: Optional[int] = None) -> int:
+        """
+        호가창에 있는 주문의 남은 수량 중 amount만큼 취소한다. amount가 None인 경우 남은 수량 전부
+        return: 취소된 수량
+        """
+        amount = order.remaining if amount is None else min(amount, order.remaining)
+        if amount <= 0:
+            return 0
+
+        order.cancelled += amount
+        if order.remaining == 0:
+            levels, prices = self._side(order.is_buy)
+            queue = levels.get(order.price)
+            if queue is not None and order in queue:
+                queue.remove(order)
+                if not queue:
+                    del levels[order.price]
+                    prices.remove(order.price)
+        return amount
@@ -16,74 +16,183 @@ pykist 패키지의 public api 모음
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import NamedTuple, Optional, Tuple
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+import copy
+import threading
 import time
 import pandas as pd
 
 from .request_utility import *  # pylint: disable = wildcard-import, unused-wildcard-import
 from .domain_info import DomainInfo
-from .access_token import AccessToken
+from .access_token import AccessToken, TokenRenewer  # pylint: disable=unused-import
 from .utility import *  # pylint: disable = wildcard-import, unused-wildcard-import
-from .market_code_map import MarketCodeMap
-
-
-class Api:  # pylint: disable=too-many-public-methods
+from .market_code_map import MarketCodeMap  # pylint: disable=unused-import
+from .rate_limiter import RateLimiter
+from .token_store import TokenStore, FileTokenStore  # pylint: disable=unused-import
+from .transport import Transport, AsyncTransport
+from .replay import RecordingTransport, AsyncRecordingTransport  # pylint: disable=unused-import
+from .replay import ReplayTransport, AsyncReplayTransport  # pylint: disable=unused-import
+from .order_book import OrderBook, BookOrder, Fill, kr_tick_size  # pylint: disable=unused-import
+from .simulator import SimulatedExchange, SimulatorServer  # pylint: disable=unused-import
+from .simulator import SimulatorTransport, AsyncSimulatorTransport  # pylint: disable=unused-import
+from .json_decoder import get_json_decoder, set_json_decoder  # pylint: disable=unused-import
+from .metrics import Metrics, enable_metrics, disable_metrics, get_metrics  # pylint: disable=unused-import
+from .base_api import BaseApi, KR_MARKET_OPEN
+from .quote import KrQuote, QuoteCache
+from .hedging import HedgePolicy
+from .tick_buffer import TickBuffer, TickRingBuffer, TickWindow  # pylint: disable=unused-import
+from .ohlcv_store import OhlcvStore  # pylint: disable=unused-import
+from .basket import BasketOrder, CancelOrder  # pylint: disable=unused-import
+from .basket import BasketOrders, BasketResult, OrderItem, to_basket_orders, to_cancel_orders, \
+    select_orders, basket_results_to_dataframe, cancel_results_to_dataframe, send_basket_order
+from .async_api import AsyncApi  # pylint: disable=unused-import
+from .account_group import AccountGroup, AsyncAccountGroup  # pylint: disable=unused-import
+from .realtime import RealtimeClient, KrTrade, KrOrderBook, \
+    SubscriptionError  # pylint: disable=unused-import
+from .response_converter import kr_ohlcv_to_dataframe, kr_stock_balance_to_dataframe, \
+    os_stock_balance_to_dataframe, kr_orders_to_dataframe, \
+    kr_quotes_to_dataframe, os_quotes_to_dataframe, kr_ohlcv_range_to_dataframe
+
+
+class Api(BaseApi):  # pylint: disable=too-many-public-methods
     """
     pykis의 public api를 나타내는 클래스
     """
 
-    def __init__(self, key_info: Json, domain_info: DomainInfo = DomainInfo(kind="real"),
-                 account_info: Optional[Json] = None) -> None:
+    def __init__(self, key_info: Json,  # pylint: disable=too-many-arguments
+                 domain_info: DomainInfo = DomainInfo(kind="real"),
+                 account_info: Optional[Json] = None, *,
+                 transport: Optional[Transport] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 token_store: Optional[TokenStore] = None,
+                 quote_cache: Optional[QuoteCache] = None,
+                 hash_mode: str = "request",
+                 hedge_policy: Optional[HedgePolicy] = None) -> None:
         """
         key_info: API 사용을 위한 인증키 정보. appkey, appsecret
         domain_info: domain 정보 (실전/모의/etc)
         account_info: 사용할 계좌 정보.
                     { "account_code" : "[계좌번호 앞 8자리 숫자]", "product_code" : "[계좌번호 뒤 2자리 숫자]" }
+        transport: HTTP 전송 계층. 지정하지 않은 경우 기본 설정의 keep-alive 연결 pool을 생성한다.
+        rate_limiter: API 호출 속도 제한. 지정하지 않은 경우 domain의 기본 제한 값을 사용한다.
+        token_store: 발급받은 token을 process 간에 공유하기 위한 저장소. 지정하지 않은 경우 공유하지 않는다.
+        quote_cache: 현재가 시세 snapshot cache. 지정하지 않은 경우 상한가/하한가만 재사용하는 기본 설정의 cache를 생성한다.
+        hash_mode: 주문 request의 hash key 처리 방식. 기본값 "request"
+                   request-주문마다 /uapi/hashkey로 hash key를 발급받아 header에 추가한다.
+                   skip-hash key 없이 주문한다. (hash key는 선택 사항이며, 주문마다 1번의 왕복이 줄어든다.)
+        hedge_policy: 응답이 늦은 시세 조회 request를 한번 더 보내서 먼저 도착한 응답을 사용하는 정책.
+                      지정하지 않은 경우 사용하지 않는다. (HedgePolicy 참고)
+        """
+        super().__init__(key_info, domain_info, account_info, rate_limiter, token_store,
+                         quote_cache=quote_cache, hash_mode=hash_mode,
+                         hedge_policy=hedge_policy)
+        self.transport: Transport = transport if transport is not None else Transport()
+        self._token_lock = threading.Lock()
+        self._token_renewer: Optional[TokenRenewer] = None
+
+    def for_account(self, account_info: Json) -> "Api":
+        """
+        token, 연결 pool, rate limiter, 시세 cache를 이 객체와 공유하고 계좌만 다른 Api 객체를 반환한다.
+        반환된 객체는 close하지 않는다. (연결 pool은 이 객체를 close할 때 닫힌다.)
+        account_info: 사용할 계좌 정보. (set_account 참고)
+        """
+        view = copy.copy(self)
+        view.set_account(account_info)
+        return view
+
+    # 인증-----------------
+
+    def create_token(self) -> None:
         """
-        self.key: Json = key_info
-        self.domain: DomainInfo = domain_info
-        self.token: AccessToken = AccessToken()
-        self.account: Optional[NamedTuple] = None
+        access token을 발급한다.
+        token 저장소를 사용하는 경우, 저장소에 유효한 token이 있으면 새로 발급하지 않고 저장된 token을 사용한다.
+        """
+        if self.token_store is None:
+            self._issue_token()
+            return
 
-        self.set_account(account_info)
-        self.market_code_map = MarketCodeMap()
+        key = self._token_key()
+        with self.token_store.lock(key):
+            if self._load_stored_token():
+                return
+            self._issue_token()
+            self.token_store.save(key, self.token)
 
-    def set_account(self, account_info: Optional[Json]) -> None:
+    def start_token_renewal(self, renew_before: float = 300) -> None:
         """
-        사용할 계좌 정보를 설정한다.
-        account_info: 사용할 계좌 정보.
-                    { "account_code" : "[계좌번호 앞 8자리 숫자]", "product_code" : "[계좌번호 뒤 2자리 숫자]" }
+        token의 유효기한이 끝나기 전에 background thread에서 token을 미리 갱신한다.
+        request를 보내는 중에 token 발급을 기다리는 일이 없어진다.
+        renew_before: 유효기한 몇 초 전에 갱신할지
         """
-        if account_info is not None:
-            self.account = to_namedtuple("account", account_info)
+        self.stop_token_renewal()
 
-    # 인증-----------------
+        def renew():
+            self._renew_token(renew_before)
 
-    def create_token(self) -> None:
+        self._token_renewer = TokenRenewer(self.token, renew, renew_before)
+        self._token_renewer.start()
+
+    def stop_token_renewal(self) -> None:
         """
-        access token을 발급한다.
+        background token 갱신을 중지한다.
+        """
+        if self._token_renewer is not None:
+            self._token_renewer.stop()
+            self._token_renewer = None
+
+    def _ensure_token(self) -> None:
         """
-        url_path = "/oauth2/tokenP"
+        token이 유효하지 않은 경우 새로 발급한다.
+        여러 thread가 동시에 호출해도 token 발급은 한번만 실행되고, 나머지 thread는 발급이 끝나기를 기다린다.
+        """
+        if not self.need_authentication():
+            return
 
-        params = merge_json([
-            self.get_api_key_data(),
-            {
-                "grant_type": "client_credentials"
-            }
-        ])
+        with self._token_lock:
+            if self.need_authentication():
+                self.create_token()
 
-        req = APIRequestParameter(url_path, tr_id=None,
-                                  params=params, requires_authentication=False, requires_hash=False)
+    def _renew_token(self, renew_before: float) -> None:
+        """
+        유효기한이 renew_before초 이내로 남은 token을 새 token으로 교체한다.
+        token 저장소를 사용하는 경우, 다른 process가 이미 갱신한 token이 있으면 그 token을 사용한다.
+        """
+        with self._token_lock:
+            if self.token_store is None:
+                self._issue_token()
+                return
+
+            key = self._token_key()
+            with self.token_store.lock(key):
+                stored = self.token_store.load(key)
+                renew_at = datetime.now() + timedelta(seconds=renew_before)
+                if stored is not None and stored.valid_until is not None \
+                        and stored.valid_until > renew_at:
+                    self.token.value = stored.value
+                    self.token.valid_until = stored.valid_until
+                    return
+
+                self._issue_token()
+                self.token_store.save(key, self.token)
+
+    def _issue_token(self) -> None:
+        """
+        서버에 access token 발급을 요청한다.
+        """
+        req = self._create_token_request()
         response = self._send_post_request(req)
         body = to_namedtuple("body", response.body)
 
         self.token.create(body)
 
-    def need_authentication(self) -> bool:
+    def get_approval_key(self) -> str:
         """
-        authentication이 필요한지 여부를 반환한다.
+        실시간 시세(WebSocket) 접속키를 발급받아 반환한다.
         """
-        return not self.token.is_valid()
+        req = self._approval_key_request()
+        response = self._send_post_request(req)
+        return response.body["approval_key"]
 
     def set_hash_key(self, header: Json, param: Json) -> None:
         """
@@ -96,54 +205,60 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         hash key 값을 가져온다.
         """
-        url_path = "/uapi/hashkey"
-        req = APIRequestParameter(url_path, tr_id=None,
-                                  params=params, requires_authentication=False, requires_hash=False)
+        req = self._hash_key_request(params)
         response = self._send_post_request(req)
 
         return response.body["HASH"]
 
-    def get_api_key_data(self) -> Json:
-        """
-        사용자의 api key 데이터를 반환한다.
-        """
-        return self.key
-
     # 인증-----------------
 
     # 시세 조회------------
+    def get_kr_quote(self, ticker: str, max_age: Optional[float] = None) -> KrQuote:
+        """
+        국내 주식 현재가 시세 snapshot을 반환한다.
+        cache에 저장된 지 max_age초가 지나지 않은 snapshot이 있으면 API를 호출하지 않는다.
+        ticker: 종목코드
+        max_age: 허용할 최대 경과 시간(초). 지정하지 않은 경우 quote_cache의 ttl을 사용한다. 0인 경우 항상 새로 조회한다.
+        return: 해당 종목 현재가 시세 snapshot
+        """
+        quote = self.quote_cache.get(ticker, max_age)
+        if quote is None:
+            info = self._get_kr_stock_current_price_info(ticker)
+            quote = KrQuote.from_output(ticker, info)
+            self.quote_cache.put(quote)
+        return quote
+
     def get_kr_current_price(self, ticker: str) -> int:
         """
         국내 주식 현재가를 반환한다.
+        get_kr_quote를 사용하므로, quote_cache의 ttl을 지정한 경우 ttl초 이내에 조회한 현재가를 반환할 수 있다.
+        (기본 설정에서는 항상 새로 조회한다.)
         ticker: 종목코드
         return: 해당 종목 현재가 (단위: 원)
         """
-        info = self._get_kr_stock_current_price_info(ticker)
-        price = info["stck_prpr"]
-
-        return int(price)
+        return self.get_kr_quote(ticker).price
 
     def get_kr_max_price(self, ticker: str) -> int:
         """
-        국내 주식의 상한가를 반환한다.
+        국내 주식의 상한가를 반환한다. 상한가는 다음 장 시작 전까지 cache된 값을 사용한다.
         ticker: 종목코드
         return: 해당 종목의 상한가 (단위: 원)
         """
-        info = self._get_kr_stock_current_price_info(ticker)
-        price = info["stck_mxpr"]
-
-        return int(price)
+        limits = self.quote_cache.get_limits(ticker)
+        if limits is not None:
+            return limits[0]
+        return self.get_kr_quote(ticker, max_age=0).max_price
 
     def get_kr_min_price(self, ticker: str) -> int:
         """
-        국내 주식의 하한가를 반환한다.
+        국내 주식의 하한가를 반환한다. 하한가는 다음 장 시작 전까지 cache된 값을 사용한다.
         ticker: 종목코드
         return: 해당 종목의 하한가 (단위: 원)
         """
-        info = self._get_kr_stock_current_price_info(ticker)
-        price = info["stck_llam"]
-
-        return int(price)
+        limits = self.quote_cache.get_limits(ticker)
+        if limits is not None:
+            return limits[1]
+        return self.get_kr_quote(ticker, max_age=0).min_price
 
     def _get_kr_stock_current_price_info(self, ticker: str) -> Json:
         """
@@ -151,16 +266,7 @@ class Api:  # pylint: disable=too-many-public-methods
         ticker: 종목코드
         return: 해당 종목 현재 시세 정보
         """
-        url_path = "/uapi/domestic-stock/v1/quotations/inquire-price"
-
-        tr_id = "FHKST01010100"
-
-        params = {
-            "FID_COND_MRKT_DIV_CODE": "J",
-            "FID_INPUT_ISCD": ticker
-        }
-
-        req = APIRequestParameter(url_path, tr_id, params)
+        req = self._kr_current_price_request(ticker)
         res = self._send_get_request(req)
         return res.outputs[0]
 
@@ -170,26 +276,7 @@ class Api:  # pylint: disable=too-many-public-methods
         ticker: 종목 코드
         time_unit: 기간 분류 코드 (d/day-일, w/week-주, m/month-월)
         """
-        time_unit = time_unit.upper()
-
-        if time_unit in ["DAYS", "DAY"]:
-            time_unit = "D"
-        elif time_unit in ["WEEKS", "WEEK"]:
-            time_unit = "W"
-        elif time_unit in ["MONTHS", "MONTH"]:
-            time_unit = "M"
-
-        url_path = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-        tr_id = "FHKST01010400"
-
-        params = {
-            "FID_COND_MRKT_DIV_CODE": "J",
-            "FID_INPUT_ISCD": ticker,
-            "FID_PERIOD_DIV_CODE": time_unit,
-            "FID_ORG_ADJ_PRC": "0000000001"
-        }
-
-        req = APIRequestParameter(url_path, tr_id, params)
+        req = self._kr_history_request(ticker, time_unit)
 
         return self._send_get_request(req, raise_flag=False)
 
@@ -201,28 +288,91 @@ class Api:  # pylint: disable=too-many-public-methods
         데이터는 최근 30 일/주/월 데이터로 제한됨
         """
         res = self._get_kr_history(ticker, time_unit)
-        if not res.is_ok() or len(res.outputs) == 0 or len(res.outputs[0]) == 0:
-            return pd.DataFrame()
-
-        date_column = ["Date"]
-        other_colums = ["Open", "High", "Low", "Close", "Volume"]
-
-        keys = ["stck_bsop_date", "stck_oprc",
-                "stck_hgpr", "stck_lwpr", "stck_clpr", "acml_vol"]
-        values = date_column + other_colums
+        return kr_ohlcv_to_dataframe(res)
 
-        data = pd.DataFrame(res.outputs[0])
+    def get_kr_ohlcv_range(self, ticker: str,  # pylint: disable=too-many-arguments
+                           start: DateLike, end: Optional[DateLike] = None,
+                           time_unit: str = "D", *, adjusted: bool = True,
+                           max_workers: int = 8) -> pd.DataFrame:
+        """
+        해당 종목코드의 start ~ end 기간 가격 정보를 DataFrame으로 반환한다.
+        기간을 API가 한번에 반환할 수 있는 구간(최대 100개의 봉)들로 나누어 동시에 조회한다.
+        조회 속도는 rate_limiter의 제한을 따른다.
+        ticker: 종목 코드
+        start, end: 조회 시작일, 종료일 (포함). date, datetime 또는 문자열(ex> "20200102"). end가 None인 경우 오늘
+        time_unit: 기간 분류 코드 (D/day-일, W/week-주, M/month-월, Y/year-년)
+        adjusted: True인 경우 수정주가, False인 경우 원주가
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: Date를 index로 하는 DataFrame (Open, High, Low, Close, Volume). 날짜 순서로 정렬되어 있다.
+        """
+        jobs = self._kr_ohlcv_range_requests([ticker], start, end, time_unit, adjusted)
+        responses = map_concurrently(self._send_ticker_request, jobs,
+                                     max_workers=max_workers)
+        return kr_ohlcv_range_to_dataframe(responses)
+
+    def get_kr_ohlcv_ranges(self, tickers: Iterable[str],  # pylint: disable=too-many-arguments
+                            start: DateLike, end: Optional[DateLike] = None,
+                            time_unit: str = "D", *, adjusted: bool = True,
+                            max_workers: int = 8) -> pd.DataFrame:
+        """
+        여러 종목의 start ~ end 기간 가격 정보를 동시에 조회하여 하나의 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다. (파라미터는 get_kr_ohlcv_range 참고)
+        tickers: 종목코드 목록
+        return: (종목코드, Date)를 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        jobs = self._kr_ohlcv_range_requests(tickers, start, end, time_unit, adjusted)
+        responses = map_concurrently(self._send_ticker_request, jobs,
+                                     max_workers=max_workers)
+        return self._per_ticker_dataframe(tickers, jobs, responses,
+                                          kr_ohlcv_range_to_dataframe)
+
+    def get_kr_minute_ohlcv(self, ticker: str,  # pylint: disable=too-many-arguments
+                            start: TimeLike = KR_MARKET_OPEN, end: Optional[TimeLike] = None,
+                            interval: Union[int, str] = 1, *,
+                            max_workers: int = 8) -> pd.DataFrame:
+        """
+        해당 종목코드의 당일 분봉을 DataFrame으로 반환한다.
+        API가 한번에 반환하는 30개의 봉 단위로 나누어 동시에 조회한다. 조회 속도는 rate_limiter의 제한을 따른다.
+        ticker: 종목 코드
+        start, end: 조회 시작/종료 시각 (포함). time, datetime 또는 문자열(ex> "090000", "09:30").
+                    end가 None인 경우 현재 시각까지
+        interval: 봉 간격. 분 단위 정수 또는 pandas offset 문자열 (ex> 5, 15, 60, "5min")
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 봉 시작 시각(Date)을 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+        """
+        jobs = self._kr_minute_ohlcv_requests([ticker], start, end)
+        responses = map_concurrently(self._send_ticker_request, jobs,
+                                     max_workers=max_workers)
+        return self._kr_minute_ohlcv_to_dataframe(responses, start, end, interval)
 
-        data = data[keys]
-        rename_map = dict(zip(keys, values))
+    def get_kr_minute_ohlcvs(self, tickers: Iterable[str],  # pylint: disable=too-many-arguments
+                             start: TimeLike = KR_MARKET_OPEN, end: Optional[TimeLike] = None,
+                             interval: Union[int, str] = 1, *,
+                             max_workers: int = 8) -> pd.DataFrame:
+        """
+        여러 종목의 당일 분봉을 동시에 조회하여 하나의 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다. (파라미터는 get_kr_minute_ohlcv 참고)
+        tickers: 종목코드 목록
+        return: (종목코드, Date)를 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        jobs = self._kr_minute_ohlcv_requests(tickers, start, end)
+        responses = map_concurrently(self._send_ticker_request, jobs,
+                                     max_workers=max_workers)
 
-        data.rename(columns=rename_map, inplace=True)
+        def to_dataframe(ticker_responses: List[APIResponse]) -> pd.DataFrame:
+            return self._kr_minute_ohlcv_to_dataframe(ticker_responses, start, end, interval)
 
-        data[date_column] = data[date_column].apply(pd.to_datetime)
-        data[other_colums] = data[other_colums].apply(pd.to_numeric)
-        data.set_index("Date", inplace=True)
+        return self._per_ticker_dataframe(tickers, jobs, responses, to_dataframe)
 
-        return data
+    def _send_ticker_request(self, job: Tuple[str, APIRequestParameter]) \
+            -> APIResponse:
+        """
+        (종목코드, request 파라미터)의 request를 보낸다.
+        """
+        _, req = job
+        return self._send_get_request(req)
 
     def _get_os_stock_current_price_info(self, ticker: str, market_code: str) -> Json:
         """
@@ -231,19 +381,7 @@ class Api:  # pylint: disable=too-many-public-methods
         market_code: 거래소 코드 (NYS-뉴욕, NAS-나스닥, AMS-아멕스, etc)
         return: 해당 종목 현재 시세 정보
         """
-        url_path = "/uapi/overseas-price/v1/quotations/price"
-
-        tr_id = "HHDFS00000300"
-        ticker = ticker.upper()
-        market_code = market_code.upper()
-
-        params = {
-            "AUTH": "",
-            "EXCD": market_code,
-            "SYMB": ticker
-        }
-
-        req = APIRequestParameter(url_path, tr_id, params)
+        req = self._os_current_price_request(ticker, market_code)
         res = self._send_get_request(req)
         return res.outputs[0]
 
@@ -259,6 +397,40 @@ class Api:  # pylint: disable=too-many-public-methods
 
         return float(price)
 
+    def get_kr_quotes(self, tickers: Iterable[str], max_workers: int = 8) -> pd.DataFrame:
+        """
+        여러 국내 주식의 현재가 시세를 동시에 조회하여 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다.
+        tickers: 종목코드 목록
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 종목코드를 index로 하는 DataFrame (현재가, 상한가, 하한가, 거래량, 전일대비, 등락률, 오류)
+                조회에 실패한 종목은 오류 column에 오류 메시지가 기록된다.
+        """
+        tickers = list(tickers)
+        results = map_concurrently(self._get_kr_stock_current_price_info, tickers,
+                                   max_workers=max_workers, return_exceptions=True)
+        return kr_quotes_to_dataframe(tickers, results)
+
+    def get_os_quotes(self, items: Iterable[Tuple[str, str]],
+                      max_workers: int = 8) -> pd.DataFrame:
+        """
+        여러 해외 주식의 현재가 시세를 동시에 조회하여 DataFrame으로 반환한다.
+        조회 속도는 rate_limiter의 제한을 따른다.
+        items: (거래소 코드, 종목코드) 목록. ex> [("NAS", "TSLA"), ("NYS", "KO")]
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 종목코드를 index로 하는 DataFrame (거래소코드, 현재가, 전일종가, 거래량, 전일대비, 등락률, 오류)
+                조회에 실패한 종목은 오류 column에 오류 메시지가 기록된다.
+        """
+        items = [(market_code.upper(), ticker.upper()) for market_code, ticker in items]
+
+        def request_function(item: Tuple[str, str]) -> Json:
+            market_code, ticker = item
+            return self._get_os_stock_current_price_info(ticker, market_code)
+
+        results = map_concurrently(request_function, items,
+                                   max_workers=max_workers, return_exceptions=True)
+        return os_quotes_to_dataframe(items, results)
+
     # 시세 조회------------
 
     # 잔고 조회------------
@@ -267,27 +439,7 @@ class Api:  # pylint: disable=too-many-public-methods
         구매 가능 현금(원화) 조회
         return: 해당 계좌의 구매 가능한 현금(원화)
         """
-        url_path = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
-        tr_id = "TTTC8908R"
-
-        if self.account is None:
-            msg = "계좌가 설정되지 않았습니다. set_account를 통해 계좌 정보를 설정해주세요."
-            raise RuntimeError(msg)
-
-        stock_code = ""
-        qry_price = 0
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            "PDNO": stock_code,
-            "ORD_UNPR": str(qry_price),
-            "ORD_DVSN": "02",
-            "CMA_EVLU_AMT_ICLD_YN": "Y",
-            "OVRS_ICLD_YN": "N"
-        }
-
-        req = APIRequestParameter(url_path, tr_id, params)
+        req = self._kr_buyable_cash_request()
         res = self._send_get_request(req)
         output = res.outputs[0]
         return int(output["ord_psbl_cash"])
@@ -297,25 +449,17 @@ class Api:  # pylint: disable=too-many-public-methods
         국내 주식 잔고 조회
         return: 국내 주식 잔고 정보를 DataFrame으로 반환
         """
+        return send_continuous_query(self._get_kr_total_balance, kr_stock_balance_to_dataframe)
 
-        def to_dataframe(res: APIResponse) -> pd.DataFrame:
-            tdf = pd.DataFrame(res.outputs[0])
-            if tdf.empty:
-                return tdf
-
-            tdf.set_index("pdno", inplace=True)
-            cf1 = ["prdt_name", "hldg_qty", "ord_psbl_qty", "pchs_avg_pric",
-                   "evlu_pfls_rt", "prpr", "bfdy_cprs_icdc", "fltt_rt"]
-            cf2 = ["종목명", "보유수량", "매도가능수량", "매입단가", "수익율", "현재가", "전일대비", "등락"]
-            tdf = tdf[cf1]
-            tdf[cf1[1:]] = tdf[cf1[1:]].apply(pd.to_numeric)
-            ren_dict = dict(zip(cf1, cf2))
-            return tdf.rename(columns=ren_dict)
-
-        def request_function(*args, **kwargs):
-            return self._get_kr_total_balance(*args, **kwargs)
-
-        return send_continuous_query(request_function, to_dataframe)
+    def iter_kr_stock_balance(self, cursor: Optional[ContinuationCursor] = None,
+                              max_pages: Optional[int] = None) -> Iterator[QueryPage]:
+        """
+        국내 주식 잔고를 page 단위로 조회하면서 하나씩 반환한다.
+        cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+        max_pages: 조회할 최대 page 수. 지정하지 않은 경우 끝까지 조회한다.
+        """
+        return iter_continuous_query(self._get_kr_total_balance, kr_stock_balance_to_dataframe,
+                                     cursor=cursor, max_pages=max_pages)
 
     def get_kr_deposit(self) -> int:
         """
@@ -326,16 +470,32 @@ class Api:  # pylint: disable=too-many-public-methods
         output2 = res.outputs[1]
         return int(output2[0]["dnca_tot_amt"])
 
-    def get_os_stock_balance(self) -> pd.DataFrame:
+    def get_os_stock_balance(self, market_codes: Optional[Iterable[str]] = None,
+                             held_only: bool = False, max_workers: int = 8) -> pd.DataFrame:
         """
-        해외 주식 잔고를 DataFrame으로 반환한다
-        return: 미국 주식 잔고 정보를 DataFrame으로 반환
+        해외 주식 잔고를 DataFrame으로 반환한다.
+        거래소별 조회는 동시에 실행되며, 결과는 거래소 코드 목록 순서대로 합쳐진다.
+        market_codes: 조회할 거래소 코드 목록. 지정하지 않은 경우 모든 거래소를 조회한다.
+        held_only: True인 경우 보유 종목이 있는 거래소만 조회한다. (보유 거래소 확인을 위해 1번의 조회가 추가된다.)
+        max_workers: 동시에 보낼 request의 최대 개수
+        return: 해외 주식 잔고 정보를 DataFrame으로 반환
         """
-        market_codes = ["NASD", "SEHK", "SHAA", "SZAA", "TKSE", "HASE", "VNSE"]
-        datas = [self._get_os_stock_balance(market_code)
-                 for market_code in market_codes]
+        codes = self._os_market_codes(market_codes, self._os_balance_market_codes())
+        if held_only:
+            held = self.get_os_held_market_codes()
+            codes = [code for code in codes if code in held]
+
+        datas = map_concurrently(self._get_os_stock_balance, codes, max_workers=max_workers)
+        return concat_dataframes(datas)
 
-        return pd.concat(datas)
+    def get_os_held_market_codes(self) -> List[str]:
+        """
+        보유 종목이 있는 해외 거래소의 잔고 조회용 거래소 코드 목록을 반환한다.
+        """
+        req = self._os_present_balance_request()
+        res = self._send_get_request(req)
+        holdings = res.outputs[0] if res.outputs else []
+        return self._held_os_balance_market_codes(item.get("ovrs_excg_cd", "") for item in holdings)
 
     def _get_os_stock_balance(self, market_code: str) -> pd.DataFrame:
         """
@@ -343,25 +503,11 @@ class Api:  # pylint: disable=too-many-public-methods
         return: 해외 주식 잔고 정보를 DataFrame으로 반환
         """
 
-        def to_dataframe(res: APIResponse) -> pd.DataFrame:
-            tdf = pd.DataFrame(res.outputs[0])
-            if tdf.empty:
-                return tdf
-
-            tdf.set_index("ovrs_pdno", inplace=True)
-            cf1 = ["ovrs_item_name", "ovrs_cblc_qty", "ord_psbl_qty", "frcr_pchs_amt1",
-                   "evlu_pfls_rt", "now_pric2", "ovrs_excg_cd", "tr_crcy_cd"]
-            cf2 = ["종목명", "보유수량", "매도가능수량", "매입단가",
-                   "수익율", "현재가", "거래소코드", "거래화폐코드"]
-            tdf = tdf[cf1]
-            tdf[cf1[1:-2]] = tdf[cf1[1:-2]].apply(pd.to_numeric)
-            ren_dict = dict(zip(cf1, cf2))
-            return tdf.rename(columns=ren_dict)
-
         def request_function(*args, **kwargs):
             return self._get_os_total_balance(market_code, *args, **kwargs)
 
-        return send_continuous_query(request_function, to_dataframe)
+        return send_continuous_query(request_function, os_stock_balance_to_dataframe,
+                                     is_kr=False)
 
     def _get_total_balance(self, is_kr: bool,
                            extra_header: Json = None,
@@ -369,29 +515,7 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         주식 잔고의 조회 전체 결과를 반환한다.
         """
-        if is_kr:
-            url_path = "/uapi/domestic-stock/v1/trading/inquire-balance"
-            tr_id = "TTTC8434R"
-        else:
-            url_path = "/uapi/overseas-stock/v1/trading/inquire-balance"
-            tr_id = "JTTT3012R"
-
-        extra_header = none_to_empty_dict(extra_header)
-        extra_param = none_to_empty_dict(extra_param)
-
-        extra_header = merge_json([{"tr_cont": ""}, extra_header])
-        query_code = get_continuous_query_code(is_kr)
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            f"CTX_AREA_FK{query_code}": "",
-            f"CTX_AREA_NK{query_code}": ""
-        }
-
-        params = merge_json([params, extra_param])
-        req = APIRequestParameter(url_path, tr_id, params,
-                                  extra_header=extra_header)
+        req = self._total_balance_request(is_kr, extra_header, extra_param)
         return self._send_get_request(req)
 
     def _get_os_total_balance(self, market_code: str, extra_header: Json = None,
@@ -399,35 +523,16 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         해외 주식 잔고의 조회 전체 결과를 반환한다.
         """
-        currency_code = get_currency_code_from_market_code(market_code)
-
-        extra_param = merge_json([{
-            "OVRS_EXCG_CD": market_code,
-            "TR_CRCY_CD": currency_code,
-        }, none_to_empty_dict(extra_param)])
-
-        is_kr = False
-
-        return self._get_total_balance(is_kr, extra_header, extra_param)
+        req = self._os_total_balance_request(market_code, extra_header, extra_param)
+        return self._send_get_request(req)
 
     def _get_kr_total_balance(self, extra_header: Json = None,
                               extra_param: Json = None) -> APIResponse:
         """
         국내 주식 잔고의 조회 전체 결과를 반환한다.
         """
-        extra_param = merge_json([{
-            "AFHR_FLPR_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "FUND_STTL_ICLD_YN": "N",
-            "INQR_DVSN": "01",
-            "OFL_YN": "N",
-            "PRCS_DVSN": "01",
-            "UNPR_DVSN": "01",
-        }, none_to_empty_dict(extra_param)])
-
-        is_kr = True
-
-        return self._get_total_balance(is_kr, extra_header, extra_param)
+        req = self._kr_total_balance_request(extra_header, extra_param)
+        return self._send_get_request(req)
 
     # 잔고 조회------------
 
@@ -439,27 +544,7 @@ class Api:  # pylint: disable=too-many-public-methods
         취소/정정 가능한 국내 주식 주문 목록을 반환한다.
         한번만 실행.
         """
-        url_path = "/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl"
-        tr_id = "TTTC8036R"
-
-        extra_header = none_to_empty_dict(extra_header)
-        extra_param = none_to_empty_dict(extra_param)
-
-        extra_header = merge_json([{"tr_cont": ""}, extra_header])
-        query_code = get_continuous_query_code(True)
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            f"CTX_AREA_FK{query_code}": "",
-            f"CTX_AREA_NK{query_code}": "",
-            "INQR_DVSN_1": "0",
-            "INQR_DVSN_2": "0"
-        }
-
-        params = merge_json([params, extra_param])
-        req = APIRequestParameter(url_path, tr_id, params,
-                                  extra_header=extra_header)
+        req = self._kr_orders_request(extra_header, extra_param)
         res = self._send_get_request(req)
 
         return res
@@ -470,28 +555,7 @@ class Api:  # pylint: disable=too-many-public-methods
         취소/정정 가능한 해외 주식 주문 목록을 반환한다.
         한번만 실행.
         """
-        url_path = "/uapi/overseas-stock/v1/trading/inquire-nccs"
-        tr_id = "JTTT3018R"
-
-        extra_header = none_to_empty_dict(extra_header)
-        extra_param = none_to_empty_dict(extra_param)
-        markert_code = self.market_code_map.to_4(markert_code)
-
-        extra_header = merge_json([{"tr_cont": ""}, extra_header])
-        query_code = get_continuous_query_code(False)
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            f"CTX_AREA_FK{query_code}": "",
-            f"CTX_AREA_NK{query_code}": "",
-            "OVRS_EXCG_CD": markert_code,
-            "SORT_SQN": "DS",
-        }
-
-        params = merge_json([params, extra_param])
-        req = APIRequestParameter(url_path, tr_id, params,
-                                  extra_header=extra_header)
+        req = self._os_orders_request(markert_code, extra_header, extra_param)
         res = self._send_get_request(req)
 
         return res
@@ -500,91 +564,55 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         취소/정정 가능한 국내 주식 주문 목록을 DataFrame으로 반환한다.
         """
-        def sell_or_buy(value):  # 01: 매도, 02: 매수
-            return "매도" if value == "01" else "매수"
-
-        def to_dataframe(res: APIResponse) -> pd.DataFrame:
-            data = pd.DataFrame(res.outputs[0])
-            if data.empty:
-                return data
-
-            data.set_index("odno", inplace=True)
-            keys = ["pdno", "ord_qty", "psbl_qty", "ord_unpr", "sll_buy_dvsn_cd",
-                    "ord_tmd", "ord_gno_brno", "orgn_odno"]
-            values = ["종목코드", "주문수량", "정정취소가능수량",
-                      "주문가격", "매수매도구분", "시간", "주문점", "원번호"]
-            data = data[keys]
-            sell_or_buy_column = "sll_buy_dvsn_cd"
-
-            data[sell_or_buy_column] = data[sell_or_buy_column].apply(
-                sell_or_buy)
-
-            rename_map = dict(zip(keys, values))
-            data = data.rename(columns=rename_map)
+        return send_continuous_query(self._get_kr_orders_once, kr_orders_to_dataframe)
 
-            return data
-
-        return send_continuous_query(self._get_kr_orders_once, to_dataframe)
+    def iter_kr_orders(self, cursor: Optional[ContinuationCursor] = None,
+                       max_pages: Optional[int] = None) -> Iterator[QueryPage]:
+        """
+        취소/정정 가능한 국내 주식 주문 목록을 page 단위로 조회하면서 하나씩 반환한다.
+        cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+        max_pages: 조회할 최대 page 수. 지정하지 않은 경우 끝까지 조회한다.
+        """
+        return iter_continuous_query(self._get_kr_orders_once, kr_orders_to_dataframe,
+                                     cursor=cursor, max_pages=max_pages)
 
-    def get_os_orders(self) -> pd.DataFrame:
+    def get_os_orders(self, market_codes: Optional[Iterable[str]] = None,
+                      max_workers: int = 8) -> pd.DataFrame:
         """
         미체결 해외 주식 주문 목록을 DataFrame으로 반환한다.
+        거래소별 조회는 동시에 실행되며, 결과는 거래소 코드 목록 순서대로 합쳐진다.
+        market_codes: 조회할 거래소 코드 목록. 지정하지 않은 경우 모든 거래소를 조회한다.
+        max_workers: 동시에 보낼 request의 최대 개수
         """
-        def sell_or_buy(value):  # 01: 매도, 02: 매수
-            return "매도" if value == "01" else "매수"
-
-        def to_dataframe(res: APIResponse) -> pd.DataFrame:
-            data = pd.DataFrame(res.outputs[0])
-            if data.empty:
-                return data
-
-            sell_or_buy_column = "sll_buy_dvsn_cd"
-            market_code_column = "ovrs_excg_cd"
-
-            data.set_index("odno", inplace=True)
-
-            rename_map = {
-                "pdno": "종목코드",
-                "ft_ord_qty": "주문수량",
-                "ft_ccld_qty": "체결수량",
-                "nccs_qty": "미체결수량",
-                "ft_ord_unpr3": "주문가격",
-                sell_or_buy_column: "매수매도구분",
-                "ord_tmd": "시간",
-                "ord_gno_brno": "주문점",
-                "orgn_odno": "원번호",
-                market_code_column: "해외거래소코드",
-                "tr_crcy_cd": "거래통화코드",
-                "prcs_stat_name": "처리상태명",
-                "rjct_rson_name": "거부사유명",
-                "rjct_rson": "거부사유",
-            }
-
-            data = data[rename_map.keys()]
-
-            data[sell_or_buy_column] = data[sell_or_buy_column].apply(
-                sell_or_buy)
-
-            data[market_code_column] = data[market_code_column].apply(
-                self.market_code_map.to_3
-            )
+        def query(code: str) -> pd.DataFrame:
+            return send_continuous_query(self._os_orders_request_function(code),
+                                         self._os_orders_to_dataframe, is_kr=False)
 
-            data = data.rename(columns=rename_map)
+        codes = self._os_market_codes(market_codes, self._os_order_market_codes())
+        outputs = map_concurrently(query, codes, max_workers=max_workers)
+        return concat_dataframes(outputs)
 
-            return data
-
-        def request_function_factory(code: str):
-            def request_function(*args, **kwargs):
-                return self._get_os_orders_once(code, *args, **kwargs)
-
-            return request_function
+    def iter_os_orders(self, market_code: str, cursor: Optional[ContinuationCursor] = None,
+                       max_pages: Optional[int] = None) -> Iterator[QueryPage]:
+        """
+        한 거래소의 미체결 해외 주식 주문 목록을 page 단위로 조회하면서 하나씩 반환한다.
+        market_code: 거래소 코드
+        cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+        max_pages: 조회할 최대 page 수. 지정하지 않은 경우 끝까지 조회한다.
+        """
+        code = self.market_code_map.to_4(market_code)
+        return iter_continuous_query(self._os_orders_request_function(code),
+                                     self._os_orders_to_dataframe, is_kr=False,
+                                     cursor=cursor, max_pages=max_pages)
 
-        outputs = [
-            send_continuous_query(request_function_factory(code), to_dataframe)
-            for code in self.market_code_map.codes_4 if code not in ["AMEX", "NYSE"]
-        ]
+    def _os_orders_request_function(self, market_code: str) -> Callable[..., APIResponse]:
+        """
+        한 거래소의 미체결 해외 주식 주문 연속 조회에 사용할 request 함수를 반환한다.
+        """
+        def request_function(*args, **kwargs):
+            return self._get_os_orders_once(market_code, *args, **kwargs)
 
-        return pd.concat(outputs)
+        return request_function
 
     # 주문 조회------------
 
@@ -593,32 +621,7 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         국내 주식 매매(현금)
         """
-        order_type = "00"  # 00: 지정가, 01: 시장가, ...
-        if price <= 0:
-            price = 0
-            order_type = "01"   # 시장가
-
-        url_path = "/uapi/domestic-stock/v1/trading/order-cash"
-
-        if buy:
-            tr_id = "TTTC0802U"  # buy
-        else:
-            tr_id = "TTTC0801U"  # sell
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            "PDNO": ticker,
-            "ORD_DVSN": order_type,
-            "ORD_QTY": str(amount),
-            "ORD_UNPR": str(price),
-            "CTAC_TLNO": "",
-            # "SLL_TYPE": "01",
-            # "ALGO_NO": ""
-        }
-
-        req = APIRequestParameter(url_path, tr_id=tr_id,
-                                  params=params, requires_authentication=True, requires_hash=True)
+        req = self._kr_order_request(ticker, amount, price, buy)
 
         response = self._send_post_request(req)
         return response.outputs[0]
@@ -646,30 +649,7 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         해외 주식 매매
         """
-        order_type = "00"  # 00: 지정가, 01: 시장가, ...
-        price_as_str = f"{price:.2f}"
-        market_code = self.market_code_map.to_4(market_code)
-
-        if price <= 0:
-            raise RuntimeError("[Error] 해외 주식 매매에서는 시장가를 지원하지 않습니다")
-
-        url_path = "/uapi/overseas-stock/v1/trading/order"
-
-        tr_id = get_order_tr_id_from_market_code(market_code, buy)
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            "PDNO": ticker,
-            "OVRS_EXCG_CD": market_code,
-            "ORD_DVSN": order_type,
-            "ORD_QTY": str(order_amount),
-            "OVRS_ORD_UNPR": price_as_str,
-            "ORD_SVR_DVSN_CD": "0",
-        }
-
-        req = APIRequestParameter(url_path, tr_id=tr_id,
-                                  params=params, requires_authentication=True, requires_hash=True)
+        req = self._os_order_request(ticker, market_code, order_amount, price, buy)
 
         response = self._send_post_request(req)
         return response.outputs[0]
@@ -696,6 +676,43 @@ class Api:  # pylint: disable=too-many-public-methods
         """
         return self._send_os_order(ticker, market_code, amount, price, False)
 
+    def send_basket_orders(self, orders: BasketOrders, max_workers: int = 8, *,
+                           max_retries: int = 3, retry_delay: float = 0.1) -> pd.DataFrame:
+        """
+        여러 주문을 동시에 전송하고 결과를 DataFrame으로 반환한다.
+        전송 속도는 rate_limiter의 주문 제한을 따르며, 주문이 접수되지 않은 일시적인 오류(초당 거래건수 초과 등)는
+        retry_delay부터 2배씩 늘어나는 간격으로 최대 max_retries번 다시 보낸다.
+        하나의 주문이 실패해도 나머지 주문은 계속 전송한다.
+        orders: BasketOrder, dict, tuple의 목록
+                또는 ticker, side, amount, price, market_code column을 가진 DataFrame
+                ex> [("005930", "buy", 10, 71000), ("TSLA", "sell", 1, 250.5, "NAS")]
+        max_workers: 동시에 보낼 주문의 최대 개수
+        return: basket 순서의 DataFrame (종목코드, 매수매도구분, 주문수량, 주문가격, 거래소코드, 성공, 주문번호,
+                주문시각, 응답코드, 메시지, 전송횟수, 응답시간(초), 경과시간(초))
+        """
+        results = self._send_orders(to_basket_orders(orders), self._basket_order_request,
+                                    max_workers, max_retries, retry_delay)
+        return basket_results_to_dataframe(results)
+
+    def _send_orders(self, orders: List[OrderItem],  # pylint: disable=too-many-arguments
+                     build_request: Callable[[OrderItem], APIRequestParameter],
+                     max_workers: int, max_retries: int, retry_delay: float
+                     ) -> List[BasketResult]:
+        """
+        주문(또는 취소) 목록을 동시에 전송하고 주문 순서대로 결과를 반환한다.
+        build_request: 주문 하나의 request 파라미터를 만드는 함수
+        """
+        started = time.perf_counter()
+
+        def send_request(req: APIRequestParameter) -> APIResponse:
+            return self._send_post_request(req, raise_flag=False)
+
+        def send(order: OrderItem) -> BasketResult:
+            return send_basket_order(order, build_request, send_request, started=started,
+                                     max_retries=max_retries, retry_delay=retry_delay)
+
+        return map_concurrently(send, orders, max_workers=max_workers)
+
     # 매매-----------------
 
     # 정정/취소-------------
@@ -715,32 +732,8 @@ class Api:  # pylint: disable=too-many-public-methods
         is_cancel: 정정구분(취소-True, 정정-False)
         return: 서버 response
         """
-        url_path = "/uapi/domestic-stock/v1/trading/order-rvsecncl"
-        tr_id = "TTTC0803U"
-
-        order_dv: str = "00"  # order_dv: 주문유형(00-지정가)
-        cancel_dv: str = "02" if is_cancel else "01"
-
-        apply_all = "N"  # apply_all: 잔량전부주문여부(Y-잔량전부, N-잔량일부)
-
-        if amount is None or amount <= 0:
-            apply_all = "Y"
-            amount = 1
-
-        params = {
-            "CANO": self.account.account_code,
-            "ACNT_PRDT_CD": self.account.product_code,
-            "KRX_FWDG_ORD_ORGNO": order_branch,
-            "ORGN_ODNO": order_number,
-            "ORD_DVSN": order_dv,
-            "RVSE_CNCL_DVSN_CD": cancel_dv,
-            "ORD_QTY": str(amount),
-            "ORD_UNPR": str(price),
-            "QTY_ALL_ORD_YN": apply_all
-        }
-
-        req = APIRequestParameter(url_path, tr_id=tr_id,
-                                  params=params, requires_authentication=True, requires_hash=True)
+        req = self._revise_cancel_kr_order_request(order_number, is_cancel, price,
+                                                   amount, order_branch)
 
         res = self._send_post_request(req)
         return res.body
@@ -760,18 +753,54 @@ class Api:  # pylint: disable=too-many-public-methods
                                              price=1,
                                              order_branch=order_branch)
 
-    def cancel_all_kr_orders(self) -> None:
+    def cancel_all_kr_orders(self, tickers: Optional[Iterable[str]] = None,
+                             side: Optional[str] = None, max_workers: int = 8, *,
+                             max_retries: int = 3, retry_delay: float = 0.1) -> pd.DataFrame:
+        """
+        미체결된 모든 국내 주식 주문들을 동시에 취소하고 결과를 DataFrame으로 반환한다.
+        호출 속도는 rate_limiter의 주문 제한을 따르며, 하나의 취소가 실패해도 나머지 취소는 계속 전송한다.
+        tickers: 취소할 종목코드 목록. 지정하지 않은 경우 모든 종목
+        side: 취소할 주문의 매수/매도 구분 (buy/sell, 매수/매도). 지정하지 않은 경우 모두
+        max_workers: 동시에 보낼 취소 주문의 최대 개수
+        return: 원주문번호를 index로 하는 DataFrame (종목코드, 매수매도구분, 취소수량, 거래소코드, 성공,
+                주문번호, 주문시각, 응답코드, 메시지, 전송횟수, 응답시간(초), 경과시간(초))
+        """
+        data = select_orders(self.get_kr_orders(), tickers, side)
+        orders = to_cancel_orders(data, "정정취소가능수량")
+        results = self._send_orders(orders, self._cancel_order_request,
+                                    max_workers, max_retries, retry_delay)
+        return cancel_results_to_dataframe(results)
+
+    def cancel_os_order(self, market_code: str, ticker: str,
+                        order_number: str, amount: int) -> Json:
         """
-        미체결된 모든 국내 주식 주문들을 취소한다.
+        해외 주식 주문을 취소한다.
+        market_code: 거래소 코드
+        ticker: 종목코드
+        order_number: 주문 번호. api.get_os_orders 통해 확인 가능.
+        amount: 취소할 수량
+        return: 서버 response.
         """
-        data = self.get_kr_orders()
-        orders = data.index.to_list()
-        branchs = data["주문점"].to_list()
-        delay = 0.2  # sec
+        req = self._revise_cancel_os_order_request(ticker, market_code, order_number, amount)
+        res = self._send_post_request(req)
+        return res.body
 
-        for order, branch in zip(orders, branchs):
-            self.cancel_kr_order(order, order_branch=branch)
-            time.sleep(delay)
+    def cancel_all_os_orders(self,  # pylint: disable=too-many-arguments
+                             market_codes: Optional[Iterable[str]] = None,
+                             tickers: Optional[Iterable[str]] = None,
+                             side: Optional[str] = None, max_workers: int = 8, *,
+                             max_retries: int = 3, retry_delay: float = 0.1) -> pd.DataFrame:
+        """
+        미체결된 모든 해외 주식 주문들을 동시에 취소하고 결과를 DataFrame으로 반환한다.
+        market_codes: 취소할 거래소 코드 목록. 지정하지 않은 경우 get_os_orders가 조회하는 모든 거래소
+        나머지 파라미터와 반환 값은 cancel_all_kr_orders 참고
+        """
+        data = self.get_os_orders(market_codes, max_workers=max_workers)
+        data = select_orders(data, tickers, side)
+        orders = to_cancel_orders(data, "미체결수량", "해외거래소코드")
+        results = self._send_orders(orders, self._cancel_order_request,
+                                    max_workers, max_retries, retry_delay)
+        return cancel_results_to_dataframe(results)
 
     def revise_kr_order(self, order_number: str,
                         price: int,
@@ -794,13 +823,34 @@ class Api:  # pylint: disable=too-many-public-methods
 
     # HTTTP----------------
 
+    def close(self) -> None:
+        """
+        background token 갱신을 중지하고 HTTP 연결 pool을 닫는다.
+        """
+        self.stop_token_renewal()
+        if self.hedge_policy is not None:
+            self.hedge_policy.close()
+        self.transport.close()
+
     def _send_get_request(self, req: APIRequestParameter, raise_flag: bool = True) -> APIResponse:
         """
         HTTP GET method로 request를 보내고 response를 반환한다.
         """
         url = self.domain.get_url(req.url_path)
         headers = self._parse_headers(req)
-        return send_get_request(url, headers, req.params, raise_flag=raise_flag)
+        self.rate_limiter.acquire(req)
+        if self.hedge_policy is None or not self.hedge_policy.applies_to(req):
+            return send_get_request(url, headers, req.params, raise_flag=raise_flag,
+                                    transport=self.transport)
+
+        def send() -> APIResponse:
+            return send_get_request(url, headers, req.params, raise_flag=False,
+                                    transport=self.transport)
+
+        res = self.hedge_policy.send(req, send, self.rate_limiter)
+        if raise_flag:
+            res.raise_if_error()
+        return res
 
     def _send_post_request(self, req: APIRequestParameter, raise_flag: bool = True) -> APIResponse:
         """
@@ -809,38 +859,20 @@ class Api:  # pylint: disable=too-many-public-methods
         url = self.domain.get_url(req.url_path)
         headers = self._parse_headers(req)
 
-        if req.requires_hash:
+        if self._needs_hash_key(req):
             self.set_hash_key(headers, req.params)
-        return send_post_request(url, headers, req.params, raise_flag=raise_flag)
+        self.rate_limiter.acquire(req)
+        return send_post_request(url, headers, req.params, raise_flag=raise_flag,
+                                 transport=self.transport)
 
-    def _parse_headers(self, req: APIRequestParameter) -> Tuple[str, Json]:
+    def _parse_headers(self, req: APIRequestParameter) -> Json:
         """
-        API에 request에 필요한 header를 구해서 튜플로 반환한다.
+        API에 request에 필요한 header를 구해서 반환한다.
+        인증이 필요한 request인데 token이 유효하지 않은 경우 token을 새로 발급한다.
         """
-
-        headers = [
-            get_base_headers(),
-            self.get_api_key_data(),
-        ]
-
-        tr_id = self.domain.adjust_tr_id(req.tr_id)
-
-        if tr_id is not None:
-            headers.append({"tr_id": tr_id})
-
         if req.requires_authentication:
-            if self.need_authentication():
-                self.create_token()
-
-            headers.append({
-                "authorization": self.token.value,
-            })
-
-        extra_header = none_to_empty_dict(req.extra_header)
-        headers.append(extra_header)
-
-        headers = merge_json(headers)
+            self._ensure_token()
 
-        return headers
+        return self._build_headers(req)
 
     # HTTTP----------------
@@ -0,0 +1,186 @@
+"""
+국내 주식 현재가 시세 snapshot과 snapshot cache 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional, Tuple
+import threading
+import time
+
+from .request_utility import Json
+
+
+KST = timezone(timedelta(hours=9))
+
+# 상한가/하한가가 새로 정해지는 시각 (장 시작 전 동시호가 시작 시각)
+SESSION_START_HOUR = 8
+SESSION_START_MINUTE = 30
+
+
+def _to_int(value: Optional[str]) -> int:
+    """
+    API 응답의 숫자 문자열을 int로 변환한다. 값이 없는 경우 0을 반환한다.
+    """
+    return int(value) if value else 0
+
+
+def _to_float(value: Optional[str]) -> float:
+    """
+    API 응답의 숫자 문자열을 float로 변환한다. 값이 없는 경우 0.0을 반환한다.
+    """
+    return float(value) if value else 0.0
+
+
+class KrQuote(NamedTuple):
+    """
+    국내 주식 현재가 시세(inquire-price) snapshot
+    """
+    ticker: str                 # 종목코드
+    price: int                  # 현재가
+    change: int                 # 전일대비
+    change_rate: float          # 전일대비율 (%)
+    open: int                   # 시가
+    high: int                   # 고가
+    low: int                    # 저가
+    max_price: int              # 상한가
+    min_price: int              # 하한가
+    base_price: int             # 기준가
+    volume: int                 # 누적 거래량
+    trade_amount: int           # 누적 거래 대금
+    fetched_at: datetime        # 조회 시각 (KST)
+    raw: Json                   # API 응답 원본
+
+    @classmethod
+    def from_output(cls, ticker: str, output: Json,
+                    fetched_at: Optional[datetime] = None) -> "KrQuote":
+        """
+        inquire-price API의 output으로부터 snapshot을 생성한다.
+        """
+        if fetched_at is None:
+            fetched_at = datetime.now(KST)
+
+        return cls(
+            ticker=ticker,
+            price=_to_int(output.get("stck_prpr")),
+            change=_to_int(output.get("prdy_vrss")),
+            change_rate=_to_float(output.get("prdy_ctrt")),
+            open=_to_int(output.get("stck_oprc")),
+            high=_to_int(output.get("stck_hgpr")),
+            low=_to_int(output.get("stck_lwpr")),
+            max_price=_to_int(output.get("stck_mxpr")),
+            min_price=_to_int(output.get("stck_llam")),
+            base_price=_to_int(output.get("stck_sdpr")),
+            volume=_to_int(output.get("acml_vol")),
+            trade_amount=_to_int(output.get("acml_tr_pbmn")),
+            fetched_at=fetched_at,
+            raw=output,
+        )
+
+
+def next_session_start(now: datetime) -> datetime:
+    """
+    now 이후 처음으로 상한가/하한가가 새로 정해지는 시각을 반환한다.
+    주말/휴장일은 고려하지 않으므로 실제보다 이른 시각일 수 있다.
+    """
+    now = now.astimezone(KST)
+    start = now.replace(hour=SESSION_START_HOUR, minute=SESSION_START_MINUTE,
+                        second=0, microsecond=0)
+    if start <= now:
+        start += timedelta(days=1)
+    return start
+
+
+class _QuoteEntry(NamedTuple):
+    """
+    QuoteCache에 저장되는 항목
+    """
+    quote: KrQuote
+    stored_at: float            # 저장 시각 (time.monotonic)
+    limits_expire_at: datetime  # 상한가/하한가가 유효한 시각
+
+
+class QuoteCache:
+    """
+    종목별 현재가 시세 snapshot cache. thread-safe하다.
+    상한가/하한가는 다음 장 시작 전까지 재사용하고, 시세는 ttl초 동안 재사용한다.
+    ttl의 기본값은 0이므로, 시세는 ttl을 지정한 경우에만 재사용한다.
+    저장된 종목 수가 maxsize를 넘는 경우 가장 오래 사용하지 않은 종목부터 제거한다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 0.0) -> None:
+        """
+        maxsize: 저장할 최대 종목 수
+        ttl: 시세를 재사용할 시간(초). 0인 경우 시세는 재사용하지 않고 상한가/하한가만 재사용한다.
+        """
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._entries: "OrderedDict[str, _QuoteEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, ticker: str, max_age: Optional[float] = None) -> Optional[KrQuote]:
+        """
+        저장된 지 max_age초가 지나지 않은 snapshot을 반환한다. 없는 경우 None을 반환한다.
+        max_age: 허용할 최대 경과 시간(초). 지정하지 않은 경우 ttl을 사용한다. 0 이하인 경우 항상 None을 반환한다.
+        """
+        if max_age is None:
+            max_age = self.ttl
+        if max_age <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None or time.monotonic() - entry.stored_at > max_age:
+                return None
+            self._entries.move_to_end(ticker)
+            return entry.quote
+
+    def get_limits(self, ticker: str) -> Optional[Tuple[int, int]]:
+        """
+        저장된 (상한가, 하한가)를 반환한다. 없거나 새로운 장이 시작된 경우 None을 반환한다.
+        """
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None or datetime.now(KST) >= entry.limits_expire_at:
+                return None
+            self._entries.move_to_end(ticker)
+            return entry.quote.max_price, entry.quote.min_price
+
+    def put(self, quote: KrQuote) -> None:
+        """
+        snapshot을 저장한다.
+        """
+        entry = _QuoteEntry(quote, time.monotonic(), next_session_start(quote.fetched_at))
+        with self._lock:
+            self._entries[quote.ticker] = entry
+            self._entries.move_to_end(quote.ticker)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """
+        ticker의 snapshot을 제거한다. ticker를 지정하지 않은 경우 모든 snapshot을 제거한다.
+        """
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ticker, None)
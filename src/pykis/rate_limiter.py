@@ -0,0 +1,190 @@
+"""
+API 호출 횟수 제한(초당 request 수)을 지키기 위한 rate limiter 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+
+from .domain_info import DomainInfo
+from .request_utility import APIRequestParameter
+
+
+class TokenBucket:
+    """
+    초당 rate개의 request를 허용하는 token bucket.
+    GCRA(Generic Cell Rate Algorithm) 방식으로 다음 request가 허용되는 시각을 계산한다.
+    thread-safe하지 않으므로 RateLimiter의 lock 안에서 사용한다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        rate: 초당 허용 request 수
+        burst: 한번에 몰아서 보낼 수 있는 최대 request 수
+        """
+        self.interval: float = 1.0 / rate
+        self.tolerance: float = (burst - 1) * self.interval
+        self.theoretical_arrival: float = 0.0
+
+    def earliest(self, now: float) -> float:
+        """
+        now 이후 request를 보낼 수 있는 가장 빠른 시각을 반환한다.
+        """
+        return max(now, self.theoretical_arrival - self.tolerance)
+
+    def consume(self, at: float) -> None:
+        """
+        at 시각에 request 하나를 보낸 것으로 기록한다.
+        """
+        self.theoretical_arrival = max(self.theoretical_arrival, at) + self.interval
+
+
+class RateLimiter:
+    """
+    tr_id의 종류(시세/계좌 조회/주문/token)별로 API 호출 속도를 제한하는 scheduler.
+    request마다 보낼 시각을 선착순으로 예약하므로, 허용된 처리량을 최대한 사용하면서도 제한을 넘지 않는다.
+    """
+
+    # 초당 request 수. None인 경우 제한하지 않는다.
+    # total은 token 발급을 제외한 모든 request에 공통으로 적용된다.
+    DEFAULT_RATES: Dict[str, Dict[str, Optional[float]]] = {
+        "real": {
+            "total": 20,
+            "quote": 20,
+            "account": 20,
+            "order": 20,
+            "token": 1 / 60,
+        },
+        "virtual": {
+            "total": 2,
+            "quote": 2,
+            "account": 2,
+            "order": 2,
+            "token": 1 / 60,
+        },
+    }
+
+    def __init__(self, domain_info: DomainInfo = DomainInfo(kind="real"),
+                 rates: Optional[Dict[str, Optional[float]]] = None,
+                 burst: int = 1) -> None:
+        """
+        domain_info: domain 정보 (실전/모의/etc). 기본 제한 값을 정하는 데 사용한다.
+        rates: 기본 제한 값을 덮어쓸 초당 request 수. ex> {"total": 10, "order": 5}
+        burst: 한번에 몰아서 보낼 수 있는 최대 request 수
+        """
+        kind = "virtual" if domain_info.is_virtual() else "real"
+        self.rates: Dict[str, Optional[float]] = dict(self.DEFAULT_RATES[kind])
+        if rates is not None:
+            self.rates.update(rates)
+
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate, burst)
+            for name, rate in self.rates.items() if rate is not None and rate > 0
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def unlimited(cls) -> "RateLimiter":
+        """
+        호출 속도를 제한하지 않는 RateLimiter를 반환한다. (기록 재생, simulator 등 실제 서버가 아닌 경우에 사용)
+        """
+        return cls(rates={name: None for name in cls.DEFAULT_RATES["real"]})
+
+    @staticmethod
+    def category(req: APIRequestParameter) -> str:
+        """
+        request의 종류를 반환한다. (quote-시세, account-계좌 조회, order-주문, token-token 발급, hashkey-hash key 발급)
+        """
+        if req.url_path.startswith("/oauth2/token"):
+            return "token"
+
+        if req.url_path.startswith("/oauth2"):   # ex> 실시간 접속키 발급
+            return "account"
+
+        if req.url_path == "/uapi/hashkey":   # 주문 한도를 사용하지 않도록 total 제한만 적용한다.
+            return "hashkey"
+
+        tr_id = req.tr_id
+        if tr_id is None or tr_id.endswith("U"):   # hash key는 주문에만 사용된다.
+            return "order"
+
+        if tr_id[0] in ["F", "H"]:   # ex> FHKST01010100, HHDFS00000300
+            return "quote"
+
+        return "account"
+
+    def _buckets_of(self, req: APIRequestParameter) -> List[TokenBucket]:
+        """
+        request에 적용되는 bucket들을 반환한다.
+        """
+        category = self.category(req)
+        names = [category] if category == "token" else ["total", category]
+        return [self.buckets[name] for name in names if name in self.buckets]
+
+    def reserve(self, req: APIRequestParameter) -> float:
+        """
+        request를 보낼 시각을 예약하고, 그 시각까지 기다려야 하는 시간(초)을 반환한다.
+        """
+        buckets = self._buckets_of(req)
+        if not buckets:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            at = max(bucket.earliest(now) for bucket in buckets)
+            for bucket in buckets:
+                bucket.consume(at)
+
+        return at - now
+
+    def try_acquire(self, req: APIRequestParameter) -> bool:
+        """
+        기다리지 않고 바로 request를 보낼 수 있는 경우에만 예약하고 True를 반환한다.
+        바로 보낼 수 없는 경우 예약하지 않고 False를 반환한다.
+        """
+        buckets = self._buckets_of(req)
+        with self._lock:
+            now = time.monotonic()
+            if any(bucket.earliest(now) > now for bucket in buckets):
+                return False
+            for bucket in buckets:
+                bucket.consume(now)
+        return True
+
+    def rate_of(self, req: APIRequestParameter) -> Optional[float]:
+        """
+        request에 적용되는 초당 request 수 제한을 반환한다. 제한이 없는 경우 None
+        """
+        rates = [1.0 / bucket.interval for bucket in self._buckets_of(req)]
+        return min(rates) if rates else None
+
+    def acquire(self, req: APIRequestParameter) -> None:
+        """
+        request를 보내도 되는 시각까지 대기한다.
+        """
+        delay = self.reserve(req)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, req: APIRequestParameter) -> None:
+        """
+        acquire의 asyncio 버전
+        """
+        delay = self.reserve(req)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,496 @@
+"""
+KIS WebSocket 실시간 시세(체결가/호가) 수신 모듈 (websockets 필요)
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+import asyncio
+import inspect
+import json
+import logging
+
+from .domain_info import DomainInfo
+
+
+TRADE_TR_ID = "H0STCNT0"        # 국내 주식 실시간 체결가
+ORDER_BOOK_TR_ID = "H0STASP0"   # 국내 주식 실시간 호가
+
+# 한 session에서 등록할 수 있는 최대 실시간 항목 수
+MAX_SUBSCRIPTIONS = 41
+
+logger = logging.getLogger(__name__)
+
+
+class KrTrade(NamedTuple):
+    """
+    국내 주식 실시간 체결 정보 (H0STCNT0)
+    """
+    ticker: str                 # 종목코드
+    time: str                   # 체결 시간 (HHMMSS)
+    price: int                  # 현재가
+    open: int                   # 시가
+    high: int                   # 고가
+    low: int                    # 저가
+    change: int                 # 전일대비
+    change_rate: float          # 전일대비율 (%)
+    ask: int                    # 매도호가1
+    bid: int                    # 매수호가1
+    volume: int                 # 체결 거래량
+    accumulated_volume: int     # 누적 거래량
+    accumulated_amount: int     # 누적 거래 대금
+    side: str                   # 체결구분 (매수/매도/장전)
+    date: str                   # 영업 일자 (YYYYMMDD)
+    raw: Tuple[str, ...]        # 수신한 field 원본
+
+
+class KrOrderBook(NamedTuple):
+    """
+    국내 주식 실시간 호가 정보 (H0STASP0). 각 호가는 1호가부터 10호가 순서이다.
+    """
+    ticker: str                     # 종목코드
+    time: str                       # 영업 시간 (HHMMSS)
+    ask_prices: Tuple[int, ...]     # 매도호가
+    bid_prices: Tuple[int, ...]     # 매수호가
+    ask_volumes: Tuple[int, ...]    # 매도호가 잔량
+    bid_volumes: Tuple[int, ...]    # 매수호가 잔량
+    total_ask_volume: int           # 총 매도호가 잔량
+    total_bid_volume: int           # 총 매수호가 잔량
+    expected_price: int             # 예상 체결가
+    expected_volume: int            # 예상 체결량
+    accumulated_volume: int         # 누적 거래량
+    raw: Tuple[str, ...]            # 수신한 field 원본
+
+
+class SubscriptionError(NamedTuple):
+    """
+    실시간 항목 등록에 실패한 경우 전달되는 정보
+    """
+    tr_id: str
+    ticker: str
+    message: str
+
+
+Record = Union[KrTrade, KrOrderBook, SubscriptionError]
+
+
+def _to_ints(fields: Tuple[str, ...]) -> Tuple[int, ...]:
+    """
+    숫자 문자열들을 int tuple로 변환한다.
+    """
+    return tuple(int(field) for field in fields)
+
+
+def _side(value: str) -> str:
+    """
+    체결구분 코드를 문자열로 변환한다. (1: 매수, 3: 장전, 5: 매도)
+    """
+    return {"1": "매수", "3": "장전", "5": "매도"}.get(value, value)
+
+
+def _to_trade(fields: Tuple[str, ...]) -> KrTrade:
+    """
+    실시간 체결 정보 field들을 KrTrade로 변환한다.
+    """
+    return KrTrade(
+        ticker=fields[0],
+        time=fields[1],
+        price=int(fields[2]),
+        change=int(fields[4]),
+        change_rate=float(fields[5]),
+        open=int(fields[7]),
+        high=int(fields[8]),
+        low=int(fields[9]),
+        ask=int(fields[10]),
+        bid=int(fields[11]),
+        volume=int(fields[12]),
+        accumulated_volume=int(fields[13]),
+        accumulated_amount=int(fields[14]),
+        side=_side(fields[21]),
+        date=fields[33],
+        raw=fields,
+    )
+
+
+def _to_order_book(fields: Tuple[str, ...]) -> KrOrderBook:
+    """
+    실시간 호가 정보 field들을 KrOrderBook으로 변환한다.
+    """
+    return KrOrderBook(
+        ticker=fields[0],
+        time=fields[1],
+        ask_prices=_to_ints(fields[3:13]),
+        bid_prices=_to_ints(fields[13:23]),
+        ask_volumes=_to_ints(fields[23:33]),
+        bid_volumes=_to_ints(fields[33:43]),
+        total_ask_volume=int(fields[43]),
+        total_bid_volume=int(fields[44]),
+        expected_price=int(fields[47]),
+        expected_volume=int(fields[48]),
+        accumulated_volume=int(fields[53]),
+        raw=fields,
+    )
+
+
+# tr_id별 (record 하나의 field 수, 변환 함수)
+_PARSERS: Dict[str, Tuple[int, Callable[[Tuple[str, ...]], Any]]] = {
+    TRADE_TR_ID: (46, _to_trade),
+    ORDER_BOOK_TR_ID: (59, _to_order_book),
+}
+
+
+def parse_frame(frame: str) -> List[Union[KrTrade, KrOrderBook]]:
+    """
+    실시간 데이터 frame("0|tr_id|데이터 건수|field^field^...")을 record list로 변환한다.
+    지원하지 않는 tr_id나 암호화된 frame인 경우 빈 list를 반환한다.
+    """
+    parts = frame.split("|", 3)
+    if len(parts) != 4 or parts[0] != "0" or parts[1] not in _PARSERS:
+        return []
+
+    size, convert = _PARSERS[parts[1]]
+    fields = tuple(parts[3].split("^"))
+    count = int(parts[2])
+    if count > 1:
+        size = len(fields) // count
+
+    return [convert(fields[i * size:(i + 1) * size]) for i in range(count)]
+
+
+def get_realtime_url(domain_info: DomainInfo) -> str:
+    """
+    domain의 실시간 시세 WebSocket url을 반환한다.
+    """
+    if domain_info.is_real():
+        return "ws://ops.koreainvestment.com:21000"
+
+    if domain_info.is_virtual():
+        return "ws://ops.koreainvestment.com:31000"
+
+    raise RuntimeError("실시간 시세 url을 알 수 없는 domain입니다. url을 직접 지정해주세요.")
+
+
+class RealtimeClient:  # pylint: disable=too-many-instance-attributes
+    """
+    KIS WebSocket 실시간 시세 client. (websockets 필요)
+    등록한 종목의 체결가/호가를 수신하여 callback 또는 async iterator로 전달한다.
+    연결이 끊어지면 다시 연결하고 등록했던 항목을 다시 등록한다.
+
+    ex>
+        async with RealtimeClient(api) as client:
+            await client.subscribe_trades("005930")
+            async for record in client:
+                print(record)
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, api: Any = None, *,  # pylint: disable=too-many-arguments
+                 approval_key: Optional[str] = None,
+                 url: Optional[str] = None,
+                 on_message: Optional[Callable[[Record], Any]] = None,
+                 queue_size: int = 1000,
+                 reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0,
+                 max_reconnects: Optional[int] = None) -> None:
+        """
+        api: 접속키(approval key) 발급에 사용할 Api 또는 AsyncApi 객체
+        approval_key: 발급받은 접속키. 지정한 경우 api를 사용하지 않는다.
+        url: WebSocket url. 지정하지 않은 경우 api의 domain에 해당하는 url을 사용한다.
+        on_message: record를 전달받을 callback (일반 함수 또는 coroutine 함수).
+                    지정하지 않은 경우 async iterator로 record를 전달한다.
+        queue_size: async iterator로 전달하기 전 보관할 최대 record 수.
+                    가득 찬 경우 소비될 때까지 수신을 멈춘다.
+        reconnect_delay: 재연결 전 대기 시간(초). 실패할 때마다 max_reconnect_delay까지 2배씩 늘어난다.
+        max_reconnects: 실시간 데이터를 받지 못한 채로 연속해서 재연결할 최대 횟수.
+                        넘는 경우 수신을 종료하고 async iterator에 오류를 전달한다. None인 경우 제한하지 않는다.
+        """
+        try:
+            import websockets  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            msg = "RealtimeClient를 사용하려면 websockets 설치가 필요합니다. (pip install websockets)"
+            raise RuntimeError(msg) from error
+
+        if api is None and approval_key is None:
+            raise RuntimeError("api 또는 approval_key를 지정해주세요.")
+
+        self._websockets = websockets
+        self.api = api
+        self.approval_key: Optional[str] = approval_key
+        self._fixed_approval_key: bool = approval_key is not None
+        self.url: str = url if url is not None else get_realtime_url(api.domain)
+        self.on_message = on_message
+        self.reconnect_delay: float = reconnect_delay
+        self.max_reconnect_delay: float = max_reconnect_delay
+        self.max_reconnects: Optional[int] = max_reconnects
+        self.error: Optional[BaseException] = None   # 수신을 종료시킨 오류
+
+        # 등록한 (tr_id, 종목코드). 등록 순서를 유지하기 위해 dict를 사용한다.
+        self.subscriptions: Dict[Tuple[str, str], None] = {}
+        self._queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._connection: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing: bool = False
+        self._received: bool = False
+
+    async def __aenter__(self) -> "RealtimeClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __aiter__(self) -> "RealtimeClient":
+        return self
+
+    async def __anext__(self) -> Record:
+        record = await self._get_queue().get()
+        if record is self._CLOSED:
+            self._get_queue().put_nowait(self._CLOSED)
+            if self.error is not None:
+                raise self.error
+            raise StopAsyncIteration
+        return record
+
+    async def start(self) -> None:
+        """
+        background에서 실시간 시세 수신을 시작한다.
+        """
+        if self._task is None or self._task.done():
+            self._closing = False
+            self.error = None
+            self._task = asyncio.ensure_future(self.run())
+
+    async def close(self) -> None:
+        """
+        연결을 닫고 수신을 종료한다. async iterator도 종료된다.
+        """
+        self._closing = True
+        if self._connection is not None:
+            await self._connection.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:  # pylint: disable=broad-except
+                pass    # 수신을 종료시킨 오류는 self.error와 async iterator로 이미 전달되었다.
+            self._task = None
+
+        self._put_closed()
+
+    async def subscribe_trades(self, ticker: str) -> None:
+        """
+        국내 주식 실시간 체결가를 등록한다.
+        """
+        await self.subscribe(TRADE_TR_ID, ticker)
+
+    async def subscribe_order_book(self, ticker: str) -> None:
+        """
+        국내 주식 실시간 호가를 등록한다.
+        """
+        await self.subscribe(ORDER_BOOK_TR_ID, ticker)
+
+    async def unsubscribe_trades(self, ticker: str) -> None:
+        """
+        국내 주식 실시간 체결가 등록을 해제한다.
+        """
+        await self.unsubscribe(TRADE_TR_ID, ticker)
+
+    async def unsubscribe_order_book(self, ticker: str) -> None:
+        """
+        국내 주식 실시간 호가 등록을 해제한다.
+        """
+        await self.unsubscribe(ORDER_BOOK_TR_ID, ticker)
+
+    async def subscribe(self, tr_id: str, ticker: str) -> None:
+        """
+        실시간 항목을 등록한다. 연결되지 않은 경우 연결된 후 등록한다.
+        """
+        key = (tr_id, ticker)
+        if key in self.subscriptions:
+            return
+        if len(self.subscriptions) >= MAX_SUBSCRIPTIONS:
+            raise RuntimeError(f"실시간 항목은 최대 {MAX_SUBSCRIPTIONS}개까지 등록할 수 있습니다.")
+
+        self.subscriptions[key] = None
+        await self._send_subscription(tr_id, ticker, subscribe=True)
+
+    async def unsubscribe(self, tr_id: str, ticker: str) -> None:
+        """
+        실시간 항목 등록을 해제한다.
+        """
+        if self.subscriptions.pop((tr_id, ticker), "missing") is None:
+            await self._send_subscription(tr_id, ticker, subscribe=False)
+
+    async def run(self) -> None:
+        """
+        close가 호출될 때까지 연결을 유지하며 실시간 시세를 수신한다.
+        재연결로 해결되지 않는 오류(접속키 발급 실패 등)가 발생한 경우 수신을 종료하고,
+        오류를 self.error에 저장한 뒤 async iterator에서 다시 던진다.
+        """
+        try:
+            await self._run()
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise   # python 3.7에서는 CancelledError가 Exception의 subclass이다.
+        except Exception as error:
+            self.error = error
+            raise
+        finally:
+            if not self._closing:
+                self._put_closed()
+
+    async def _run(self) -> None:
+        """
+        연결이 끊어질 때마다 다시 연결하며 실시간 시세를 수신한다.
+        """
+        delay = self.reconnect_delay
+        attempts = 0
+        while not self._closing:
+            self._received = False
+            try:
+                approval_key = await self._get_approval_key()
+                async with self._websockets.connect(self.url, ping_interval=None) as connection:
+                    self._connection = connection
+                    for tr_id, ticker in list(self.subscriptions):
+                        await self._send_subscription(tr_id, ticker, True, approval_key)
+                    async for message in connection:
+                        await self._handle_message(message)
+            except (OSError, asyncio.TimeoutError, self._websockets.exceptions.WebSocketException):
+                pass
+            finally:
+                self._connection = None
+
+            if self._closing:
+                break
+
+            if self._received:     # 데이터를 받은 연결이 끊어진 경우 처음부터 다시 센다.
+                delay, attempts = self.reconnect_delay, 0
+            attempts += 1
+            if self.max_reconnects is not None and attempts > self.max_reconnects:
+                raise RuntimeError(f"실시간 시세 서버에 {self.max_reconnects}번 재연결했지만 "
+                                   "데이터를 받지 못했습니다.")
+            if not self._fixed_approval_key:
+                self.approval_key = None     # 만료되었거나 거부된 접속키일 수 있으므로 새로 발급받는다.
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _put_closed(self) -> None:
+        """
+        async iterator에 수신 종료를 알린다. queue가 가득 찬 경우 가장 오래된 record를 버린다.
+        """
+        queue = self._get_queue()
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(self._CLOSED)
+
+    def _get_queue(self) -> asyncio.Queue:
+        """
+        record를 보관할 queue를 반환한다. queue는 event loop 안에서 처음 사용될 때 생성한다.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._queue_size)
+        return self._queue
+
+    async def _get_approval_key(self) -> str:
+        """
+        실시간 접속키를 반환한다. 발급받지 않은 경우 api를 통해 발급받는다.
+        """
+        if self.approval_key is None:
+            if inspect.iscoroutinefunction(self.api.get_approval_key):
+                self.approval_key = await self.api.get_approval_key()
+            else:
+                loop = asyncio.get_running_loop()
+                self.approval_key = await loop.run_in_executor(None, self.api.get_approval_key)
+        return self.approval_key
+
+    async def _send_subscription(self, tr_id: str, ticker: str, subscribe: bool,
+                                 approval_key: Optional[str] = None) -> None:
+        """
+        실시간 항목 등록/해제 message를 보낸다. 연결되지 않은 경우 아무것도 하지 않는다.
+        """
+        connection = self._connection
+        if connection is None:
+            return
+
+        message = {
+            "header": {
+                "approval_key": approval_key or self.approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8",
+            },
+            "body": {
+                "input": {
+                    "tr_id": tr_id,
+                    "tr_key": ticker,
+                }
+            }
+        }
+        await connection.send(json.dumps(message))
+
+    async def _handle_message(self, message: Union[str, bytes]) -> None:
+        """
+        수신한 message를 처리한다.
+        """
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
+
+        if message[:1] in ("0", "1"):
+            try:
+                records = parse_frame(message)
+            except (ValueError, IndexError):
+                logger.warning("잘못된 실시간 데이터 frame을 무시합니다: %.100s", message)
+                return
+            self._received = True
+            for record in records:
+                await self._deliver(record)
+            return
+
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning("잘못된 실시간 message를 무시합니다: %.100s", message)
+            return
+        header = data.get("header", {})
+        tr_id = header.get("tr_id", "")
+        if tr_id == "PINGPONG":
+            await self._connection.send(message)
+            return
+
+        body = data.get("body", {})
+        if body.get("rt_cd", "0") != "0":
+            ticker = header.get("tr_key", "")
+            self.subscriptions.pop((tr_id, ticker), None)
+            await self._deliver(SubscriptionError(tr_id, ticker, body.get("msg1", "")))
+
+    async def _deliver(self, record: Record) -> None:
+        """
+        record를 callback 또는 queue로 전달한다.
+        """
+        if self.on_message is None:
+            await self._get_queue().put(record)
+            return
+
+        # callback의 오류로 수신이 멈추지 않도록 기록만 하고 다음 record를 처리한다.
+        try:
+            result = self.on_message(record)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("실시간 시세 callback에서 오류가 발생했습니다.")
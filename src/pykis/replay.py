@@ -0,0 +1,405 @@
+"""
+API 호출을 파일에 기록(record)하고, 네트워크 없이 기록된 응답을 재생(replay)하는 전송 계층 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Deque, Dict, IO, Optional, Tuple, Union
+from collections import deque
+from urllib.parse import urlsplit
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+import requests
+
+from .transport import Transport, AsyncTransport, RawResponse
+
+Json = Dict[str, Any]
+
+# replay의 응답 시간 재현 방식.
+# fast-기다리지 않고 바로 응답, original-기록된 응답 시간만큼 기다린 후 응답
+REPLAY_TIMINGS = ("fast", "original")
+
+# 기록 파일에 남기지 않는 인증 정보. 값은 REDACTED로 바꿔서 기록한다.
+SECRET_KEYS = frozenset(["appkey", "appsecret", "secretkey", "authorization"])
+REDACTED = "***"
+
+# 인증 정보가 응답에 포함되거나 응답이 request body에 따라 달라지는 API.
+# 기록하지 않고, replay할 때는 stub 응답을 반환한다.
+STUB_PATHS = ("/oauth2/tokenP", "/oauth2/Approval", "/uapi/hashkey")
+
+ReplayKey = Tuple[str, str, str, str]
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """
+    기록 파일을 text mode로 연다. 확장자가 .gz인 경우 gzip으로 압축한다.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+def _redact(data: Json) -> Json:
+    """
+    인증 정보를 가린 사본을 반환한다.
+    """
+    return {key: REDACTED if key.lower() in SECRET_KEYS else value for key, value in data.items()}
+
+
+def _replay_key(method: str, url_path: str, tr_id: Optional[str], params: Json) -> ReplayKey:
+    """
+    기록된 응답을 찾을 때 사용하는 key를 반환한다.
+    GET 파라미터는 query string으로 전송되므로 값을 문자열로 맞춘다.
+    """
+    if method == "GET":
+        params = {key: str(value) for key, value in params.items()}
+    return (method, url_path, tr_id or "",
+            json.dumps(params, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _is_stubbed(url_path: str) -> bool:
+    return url_path in STUB_PATHS
+
+
+def stub_response(url_path: str, params: Json) -> RawResponse:
+    """
+    replay할 때 token, 실시간 접속키, hash key 발급 API 대신 반환하는 응답.
+    """
+    if url_path == "/oauth2/tokenP":
+        body = {"access_token": "replay-access-token", "token_type": "Bearer",
+                "expires_in": 86400}
+    elif url_path == "/oauth2/Approval":
+        body = {"approval_key": "replay-approval-key"}
+    else:
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+        body = {"JsonBody": params, "HASH": digest}
+    content = json.dumps(body).encode("utf-8")
+    return RawResponse(200, {"Content-Type": "application/json; charset=UTF-8"}, content)
+
+
+class Recorder:
+    """
+    request와 response를 한 줄에 하나씩 json으로 기록 파일 끝에 추가한다. (thread-safe)
+    각 줄의 항목: t(기록 시작 후 경과 시간), elapsed(응답 시간), method, url_path, tr_id,
+    params, headers(request), status, response_headers, body 또는 error
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        path: 기록 파일 경로. 이미 있는 경우 끝에 이어서 기록한다. 확장자가 .gz인 경우 gzip으로 압축한다.
+        """
+        self.path: str = path
+        self._file: IO[str] = _open(path, "a")
+        self._flush_each: bool = not path.endswith(".gz")
+        self._started: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, headers: Json, params: Json, *,  # pylint: disable=too-many-arguments
+               started: float, resp: Union[requests.Response, RawResponse, BaseException]) -> None:
+        """
+        request와 response(또는 전송 중 발생한 예외)를 기록한다.
+        started: request를 보낸 시각 (time.monotonic)
+        """
+        url_path = urlsplit(url).path
+        if _is_stubbed(url_path):
+            return
+
+        entry: Json = {
+            "t": round(started - self._started, 6),
+            "elapsed": round(time.monotonic() - started, 6),
+            "method": method,
+            "url_path": url_path,
+            "tr_id": headers.get("tr_id"),
+            "params": _redact(params),
+            "headers": _redact(headers),
+        }
+        if isinstance(resp, BaseException):
+            entry["error"] = f"{type(resp).__name__}: {resp}"
+        else:
+            entry["status"] = resp.status_code
+            entry["response_headers"] = dict(resp.headers)
+            entry["body"] = resp.content.decode("utf-8", errors="replace")
+
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            if self._flush_each:
+                self._file.flush()
+
+    def close(self) -> None:
+        """
+        기록 파일을 닫는다.
+        """
+        with self._lock:
+            self._file.close()
+
+
+class Recording:
+    """
+    기록 파일의 응답들을 request별로 찾아서 반환한다. (thread-safe)
+    같은 request가 여러번 기록된 경우 기록된 순서대로 반환하며,
+    기록된 횟수보다 많이 요청한 경우 마지막 응답을 반복해서 반환한다.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        path: Recorder로 기록한 파일 경로
+        """
+        self.path: str = path
+        self._entries: Dict[ReplayKey, Deque[Json]] = {}
+        self._last: Dict[ReplayKey, Json] = {}
+        self._lock = threading.Lock()
+
+        with _open(path, "r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = _replay_key(entry["method"], entry["url_path"], entry["tr_id"],
+                                  entry["params"])
+                self._entries.setdefault(key, deque()).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def find(self, method: str, url: str, headers: Json, params: Json) -> Tuple[RawResponse, float]:
+        """
+        request에 해당하는 (응답, 기록된 응답 시간)을 반환한다.
+        기록된 request가 아닌 경우 RuntimeError, 기록 당시 전송에 실패한 request는 ConnectionError를 던진다.
+        """
+        url_path = urlsplit(url).path
+        if _is_stubbed(url_path):
+            return stub_response(url_path, params), 0.0
+
+        key = _replay_key(method, url_path, headers.get("tr_id"), _redact(params))
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries:
+                entry = self._last[key] = entries.popleft()
+            elif key in self._last:
+                entry = self._last[key]
+            else:
+                raise RuntimeError(f"기록되지 않은 request입니다. "
+                                   f"({method} {url_path}, tr_id: {key[2]}, params: {key[3]})")
+
+        if "error" in entry:
+            raise ConnectionError(f"기록된 전송 오류: {entry['error']}")
+        response = RawResponse(entry["status"], entry["response_headers"],
+                               entry["body"].encode("utf-8"))
+        return response, entry["elapsed"]
+
+
+class RecordingTransport:
+    """
+    transport로 request를 보내면서 모든 request와 response를 파일에 기록하는 전송 계층.
+    Api의 transport로 사용한다. 인증 정보는 가려서 기록하고, token/hash key 발급은 기록하지 않는다.
+    """
+
+    def __init__(self, path: str, transport: Optional[Transport] = None) -> None:
+        """
+        path: 기록 파일 경로 (Recorder 참고)
+        transport: 실제로 request를 보낼 전송 계층. 지정하지 않은 경우 기본 설정의 Transport를 생성한다.
+        """
+        self.transport: Transport = transport if transport is not None else Transport()
+        self.recorder: Recorder = Recorder(path)
+
+    def _send(self, method: str, url: str, headers: Json, params: Json) -> requests.Response:
+        started = time.monotonic()
+        try:
+            if method == "GET":
+                resp = self.transport.get(url, headers, params)
+            else:
+                resp = self.transport.post(url, headers, params)
+        except Exception as error:
+            self.recorder.record(method, url, headers, params, started=started, resp=error)
+            raise
+        self.recorder.record(method, url, headers, params, started=started, resp=resp)
+        return resp
+
+    def get(self, url: str, headers: Json, params: Json) -> requests.Response:
+        """
+        HTTP GET method로 request를 보내고 기록한 뒤 response를 반환한다.
+        """
+        return self._send("GET", url, headers, params)
+
+    def post(self, url: str, headers: Json, params: Json) -> requests.Response:
+        """
+        HTTP POST method로 request를 보내고 기록한 뒤 response를 반환한다.
+        """
+        return self._send("POST", url, headers, params)
+
+    def close(self) -> None:
+        """
+        transport의 연결과 기록 파일을 닫는다.
+        """
+        self.transport.close()
+        self.recorder.close()
+
+    def __enter__(self) -> "RecordingTransport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncRecordingTransport:
+    """
+    RecordingTransport의 asyncio 버전. AsyncApi의 transport로 사용한다.
+    """
+
+    def __init__(self, path: str, transport: Optional[AsyncTransport] = None) -> None:
+        """
+        path: 기록 파일 경로 (Recorder 참고)
+        transport: 실제로 request를 보낼 전송 계층. 지정하지 않은 경우 기본 설정의 AsyncTransport를 생성한다.
+        """
+        self.transport: AsyncTransport = transport if transport is not None else AsyncTransport()
+        self.recorder: Recorder = Recorder(path)
+
+    async def _send(self, method: str, url: str, headers: Json, params: Json) -> RawResponse:
+        started = time.monotonic()
+        try:
+            if method == "GET":
+                resp = await self.transport.get(url, headers, params)
+            else:
+                resp = await self.transport.post(url, headers, params)
+        except Exception as error:
+            self.recorder.record(method, url, headers, params, started=started, resp=error)
+            raise
+        self.recorder.record(method, url, headers, params, started=started, resp=resp)
+        return resp
+
+    async def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        HTTP GET method로 request를 보내고 기록한 뒤 response를 반환한다.
+        """
+        return await self._send("GET", url, headers, params)
+
+    async def post(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        HTTP POST method로 request를 보내고 기록한 뒤 response를 반환한다.
+        """
+        return await self._send("POST", url, headers, params)
+
+    async def close(self) -> None:
+        """
+        transport의 연결과 기록 파일을 닫는다.
+        """
+        await self.transport.close()
+        self.recorder.close()
+
+    async def __aenter__(self) -> "AsyncRecordingTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+def _check_timing(timing: str) -> str:
+    if timing not in REPLAY_TIMINGS:
+        raise RuntimeError(f"timing은 {', '.join(REPLAY_TIMINGS)} 중 하나여야 합니다.")
+    return timing
+
+
+class ReplayTransport:
+    """
+    네트워크 없이 기록 파일의 응답을 반환하는 전송 계층. Api의 transport로 사용한다.
+    token, 실시간 접속키, hash key 발급은 stub 응답을 반환하므로 실제 인증 정보가 필요 없다.
+    """
+
+    def __init__(self, path: str, timing: str = "fast") -> None:
+        """
+        path: RecordingTransport로 기록한 파일 경로
+        timing: 응답 시간 재현 방식. 기본값 "fast"
+                fast-기다리지 않고 바로 응답한다.
+                original-기록된 응답 시간만큼 기다린 후 응답한다.
+        """
+        self.timing: str = _check_timing(timing)
+        self.recording: Recording = Recording(path)
+
+    def _reply(self, method: str, url: str, headers: Json, params: Json) -> RawResponse:
+        resp, elapsed = self.recording.find(method, url, headers, params)
+        if self.timing == "original" and elapsed > 0:
+            time.sleep(elapsed)
+        return resp
+
+    def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        GET request에 해당하는 기록된 response를 반환한다.
+        """
+        return self._reply("GET", url, headers, params)
+
+    def post(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        POST request에 해당하는 기록된 response를 반환한다.
+        """
+        return self._reply("POST", url, headers, params)
+
+    def close(self) -> None:
+        """
+        Transport와 같은 interface를 위한 method. 정리할 자원이 없다.
+        """
+
+    def __enter__(self) -> "ReplayTransport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncReplayTransport:
+    """
+    ReplayTransport의 asyncio 버전. AsyncApi의 transport로 사용한다.
+    """
+
+    def __init__(self, path: str, timing: str = "fast") -> None:
+        """
+        path: AsyncRecordingTransport(또는 RecordingTransport)로 기록한 파일 경로
+        timing: 응답 시간 재현 방식 (ReplayTransport 참고)
+        """
+        self.timing: str = _check_timing(timing)
+        self.recording: Recording = Recording(path)
+
+    async def _reply(self, method: str, url: str, headers: Json, params: Json) -> RawResponse:
+        resp, elapsed = self.recording.find(method, url, headers, params)
+        if self.timing == "original" and elapsed > 0:
+            await asyncio.sleep(elapsed)
+        return resp
+
+    async def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        GET request에 해당하는 기록된 response를 반환한다.
+        """
+        return await self._reply("GET", url, headers, params)
+
+    async def post(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        POST request에 해당하는 기록된 response를 반환한다.
+        """
+        return await self._reply("POST", url, headers, params)
+
+    async def close(self) -> None:
+        """
+        AsyncTransport와 같은 interface를 위한 method. 정리할 자원이 없다.
+        """
+
+    async def __aenter__(self) -> "AsyncReplayTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -15,9 +15,13 @@ request 관련 유틸리티 모듈
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import NamedTuple, Optional, Dict, Any, List
+from typing import Awaitable, Callable, NamedTuple, Optional, Dict, Any, List, Mapping, Union
 import json
+import time
 import requests
+from . import json_decoder
+from .metrics import get_metrics
+from .transport import Transport, AsyncTransport, RawResponse
 
 Json = Dict[str, Any]
 
@@ -34,18 +38,84 @@ class APIRequestParameter(NamedTuple):
     extra_header: Optional[Json] = None
 
 
-class APIResponse:
+_UNSET: Any = object()
+
+
+class APIResponse:  # pylint: disable=too-many-instance-attributes
     """
     API에서 반환된 응답을 나타내는 클래스
+    body는 응답의 원본 bytes를 json decoder(json_decoder 모듈 참고)로 직접 해석하며,
+    header, body, message, return_code, outputs는 처음 사용될 때 계산된다.
     """
+    __slots__ = ["http_code", "tr_id", "url_path", "_content", "_headers",
+                 "_header", "_body", "_message", "_return_code", "_outputs"]
 
-    def __init__(self, resp: requests.Response) -> None:
+    def __init__(self, resp: Union[requests.Response, RawResponse]) -> None:
         self.http_code: int = resp.status_code
-        self.header: Json = self._header(resp)
-        self.body: Json = resp.json()
-        self.message: str = self._message()
-        self.return_code: Optional[str] = self._return_code()
-        self.outputs: List[Json] = self._outputs()
+        self.tr_id: str = ""        # metrics 기록 중인 경우에만 설정된다.
+        self.url_path: str = ""
+        self._content: bytes = resp.content
+        self._headers: Mapping[str, str] = resp.headers
+        self._header: Json = _UNSET
+        self._body: Json = _UNSET
+        self._message: str = _UNSET
+        self._return_code: Optional[str] = _UNSET
+        self._outputs: List[Json] = _UNSET
+
+    @property
+    def header(self) -> Json:
+        """
+        응답 header 중 이름이 소문자인 항목 (ex> tr_id, tr_cont)
+        """
+        if self._header is _UNSET:
+            self._header = {key: value for key, value in self._headers.items() if key.islower()}
+        return self._header
+
+    @property
+    def body(self) -> Json:
+        """
+        json으로 해석한 응답 body
+        """
+        if self._body is _UNSET:
+            self._body = json_decoder.loads(self._content)
+        return self._body
+
+    @property
+    def message(self) -> str:
+        """
+        API의 응답 메시지. 없는 경우 빈 문자열
+        """
+        if self._message is _UNSET:
+            self._message = self._find_message()
+        return self._message
+
+    @property
+    def message_code(self) -> str:
+        """
+        API의 응답 메시지 코드 (ex> MCA00000, EGW00201). 없는 경우 빈 문자열
+        """
+        return self.body.get("msg_cd", "")
+
+    @property
+    def return_code(self) -> Optional[str]:
+        """
+        API에서 성공/실패를 나타내는 return code. 없는 경우 None
+        """
+        if self._return_code is _UNSET:
+            self._return_code = self.body.get("rt_cd", None)
+        return self._return_code
+
+    @property
+    def outputs(self) -> List[Json]:
+        """
+        API의 output 값(ex> output, output1, output2)들의 list.
+        뒤에 붙은 번호 순서대로(output이 있는 경우 제일 앞) 배치한다.
+        """
+        if self._outputs is _UNSET:
+            body = self.body
+            self._outputs = [body[target] for target in ("output", "output1", "output2")
+                             if target in body]
+        return self._outputs
 
     def is_ok(self) -> bool:
         """
@@ -57,16 +127,20 @@ class APIResponse:
         """
         오류가 난 경우 예외를 던진다.
         """
-        error_message = f"http response: {self.http_code}, " + \
-                        f"return code: {self.return_code}. msg: {self.message}"
-
         if check_http_error and self.http_code != 200:
-            raise RuntimeError(error_message)
+            raise RuntimeError(self._error_message())
 
         if check_return_code and self.return_code != "0" and self.return_code is not None:
-            raise RuntimeError(error_message)
+            raise RuntimeError(self._error_message())
+
+    def _error_message(self) -> str:
+        """
+        예외에 사용할 오류 메시지를 반환한다.
+        """
+        return f"http response: {self.http_code}, " + \
+               f"return code: {self.return_code}. msg: {self.message}"
 
-    def _message(self) -> str:
+    def _find_message(self) -> str:
         """
         API의 response에서 응답 메시지를 찾아서 반환한다. 없는 경우 빈 문자열을 반환.
         """
@@ -78,33 +152,6 @@ class APIResponse:
 
         return ""
 
-    def _return_code(self) -> Optional[str]:
-        """
-        API에서 성공/실패를 나타내는 return code를 찾아서 반환한다. 없는 경우 None을 반환
-        """
-        return self.body.get("rt_cd", None)
-
-    def _outputs(self) -> List[Json]:
-        """
-        API의 output 값(ex> output, output1, output2)들을 list로 가져온다.
-        뒤에 붙은 번호 순서대로(output이 있는 경우 제일 앞) 배치한다.
-        """
-        target_keys = ["output", "output1", "output2"]
-        ret = [self.body[target]
-               for target in target_keys if target in self.body]
-
-        return ret
-
-    def _header(self, resp: requests.Response) -> Json:
-        """
-        API의 response에서 header 정보를 찾아서 반환한다.
-        """
-        header = {}
-        for key in resp.headers.keys():
-            if key.islower():
-                header[key] = resp.headers.get(key)
-        return header
-
 
 def get_base_headers() -> Json:
     """
@@ -119,29 +166,99 @@ def get_base_headers() -> Json:
     return base
 
 
-def send_get_request(url: str, headers: Json, params: Json, raise_flag: bool = True) -> APIResponse:
+def _to_api_response(resp: Union[requests.Response, RawResponse], url: str, headers: Json,
+                     started: float, raise_flag: bool) -> APIResponse:
     """
-    HTTP GET method로 request를 보내고 APIResponse 객체를 반환한다.
+    HTTP 응답을 APIResponse로 변환한다. metrics 기록 중인 경우 응답 시간과 횟수를 기록한다.
     """
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
     api_resp = APIResponse(resp)
 
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.record_response(api_resp, url, headers, started)
+
     if raise_flag:
         api_resp.raise_if_error()
 
     return api_resp
 
 
+def _send(send: Callable[[], Union[requests.Response, RawResponse]], url: str, headers: Json,
+          raise_flag: bool) -> APIResponse:
+    """
+    send로 request를 보내고 APIResponse 객체를 반환한다.
+    """
+    started = time.perf_counter()
+    try:
+        resp = send()
+    except Exception as error:
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.record_transport_error(url, headers, error)
+        raise
+    return _to_api_response(resp, url, headers, started, raise_flag)
+
+
+async def _send_async(send: Callable[[], Awaitable[RawResponse]], url: str, headers: Json,
+                      raise_flag: bool) -> APIResponse:
+    """
+    _send의 asyncio 버전.
+    """
+    started = time.perf_counter()
+    try:
+        resp = await send()
+    except Exception as error:
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.record_transport_error(url, headers, error)
+        raise
+    return _to_api_response(resp, url, headers, started, raise_flag)
+
+
+def send_get_request(url: str, headers: Json, params: Json, raise_flag: bool = True,
+                     transport: Optional[Transport] = None) -> APIResponse:
+    """
+    HTTP GET method로 request를 보내고 APIResponse 객체를 반환한다.
+    transport가 주어진 경우 해당 transport의 keep-alive 연결을 사용한다.
+    """
+    def send():
+        if transport is not None:
+            return transport.get(url, headers, params)
+        return requests.get(url, headers=headers, params=params, timeout=30)
+
+    return _send(send, url, headers, raise_flag)
+
+
 def send_post_request(url: str, headers: Json, params: Json,
-                      raise_flag: bool = True) -> APIResponse:
+                      raise_flag: bool = True,
+                      transport: Optional[Transport] = None) -> APIResponse:
     """
     HTTP POST method로 request를 보내고 APIResponse 객체를 반환한다.
+    transport가 주어진 경우 해당 transport의 keep-alive 연결을 사용한다.
     """
-    resp = requests.post(url, headers=headers,
-                         data=json.dumps(params), timeout=30)
-    api_resp = APIResponse(resp)
+    def send():
+        if transport is not None:
+            return transport.post(url, headers, params)
+        return requests.post(url, headers=headers, data=json.dumps(params), timeout=30)
 
-    if raise_flag:
-        api_resp.raise_if_error()
+    return _send(send, url, headers, raise_flag)
 
-    return api_resp
+
+async def send_get_request_async(url: str, headers: Json, params: Json,
+                                 transport: AsyncTransport,
+                                 raise_flag: bool = True) -> APIResponse:
+    """
+    send_get_request의 asyncio 버전.
+    """
+    return await _send_async(lambda: transport.get(url, headers, params), url, headers,
+                             raise_flag)
+
+
+async def send_post_request_async(url: str, headers: Json, params: Json,
+                                  transport: AsyncTransport,
+                                  raise_flag: bool = True) -> APIResponse:
+    """
+    send_post_request의 asyncio 버전.
+    """
+    return await _send_async(lambda: transport.post(url, headers, params), url, headers,
+                             raise_flag)
@@ -0,0 +1,253 @@
+"""
+API 응답(APIResponse)을 DataFrame으로 변환하는 함수들을 모아둔 모듈.
+Api, AsyncApi가 공유한다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Iterable, List, Tuple
+import pandas as pd
+from .request_utility import APIResponse
+from .market_code_map import MarketCodeMap
+from .schema import Field, Schema, to_dataframe, empty_dataframe, convert_column
+from .metrics import timed_conversion
+
+
+# 매도매수구분코드
+SELL_OR_BUY = {"01": "매도", "02": "매수"}
+
+KR_OHLCV_SCHEMA = Schema(
+    fields=(
+        Field("stck_oprc", "Open", "int"),
+        Field("stck_hgpr", "High", "int"),
+        Field("stck_lwpr", "Low", "int"),
+        Field("stck_clpr", "Close", "int"),
+        Field("acml_vol", "Volume", "int"),
+    ),
+    index="stck_bsop_date", index_name="Date", index_dtype="date",
+)
+
+KR_MINUTE_OHLCV_SCHEMA = Schema(
+    fields=(
+        Field("stck_oprc", "Open", "int"),
+        Field("stck_hgpr", "High", "int"),
+        Field("stck_lwpr", "Low", "int"),
+        Field("stck_prpr", "Close", "int"),
+        Field("cntg_vol", "Volume", "int"),
+    ),
+    index="stck_bsop_date", index_name="Date", index_dtype="date",
+)
+
+KR_STOCK_BALANCE_SCHEMA = Schema(
+    fields=(
+        Field("prdt_name", "종목명", "category"),
+        Field("hldg_qty", "보유수량", "int"),
+        Field("ord_psbl_qty", "매도가능수량", "int"),
+        Field("pchs_avg_pric", "매입단가", "float"),
+        Field("evlu_pfls_rt", "수익율", "float"),
+        Field("prpr", "현재가", "int"),
+        Field("bfdy_cprs_icdc", "전일대비", "int"),
+        Field("fltt_rt", "등락", "float"),
+    ),
+    index="pdno",
+)
+
+OS_STOCK_BALANCE_SCHEMA = Schema(
+    fields=(
+        Field("ovrs_item_name", "종목명", "category"),
+        Field("ovrs_cblc_qty", "보유수량", "number"),
+        Field("ord_psbl_qty", "매도가능수량", "number"),
+        Field("frcr_pchs_amt1", "매입단가", "float"),
+        Field("evlu_pfls_rt", "수익율", "float"),
+        Field("now_pric2", "현재가", "float"),
+        Field("ovrs_excg_cd", "거래소코드", "category"),
+        Field("tr_crcy_cd", "거래화폐코드", "category"),
+    ),
+    index="ovrs_pdno",
+)
+
+KR_ORDERS_SCHEMA = Schema(
+    fields=(
+        Field("pdno", "종목코드", "category"),
+        Field("ord_qty", "주문수량", "int"),
+        Field("psbl_qty", "정정취소가능수량", "int"),
+        Field("ord_unpr", "주문가격", "int"),
+        Field("sll_buy_dvsn_cd", "매수매도구분", mapping=SELL_OR_BUY),
+        Field("ord_tmd", "시간"),
+        Field("ord_gno_brno", "주문점"),
+        Field("orgn_odno", "원번호"),
+    ),
+    index="odno",
+)
+
+OS_ORDERS_SCHEMA = Schema(
+    fields=(
+        Field("pdno", "종목코드", "category"),
+        Field("ft_ord_qty", "주문수량", "number"),
+        Field("ft_ccld_qty", "체결수량", "number"),
+        Field("nccs_qty", "미체결수량", "number"),
+        Field("ft_ord_unpr3", "주문가격", "float"),
+        Field("sll_buy_dvsn_cd", "매수매도구분", mapping=SELL_OR_BUY),
+        Field("ord_tmd", "시간"),
+        Field("ord_gno_brno", "주문점"),
+        Field("orgn_odno", "원번호"),
+        Field("ovrs_excg_cd", "해외거래소코드", mapping={}),
+        Field("tr_crcy_cd", "거래통화코드", "category"),
+        Field("prcs_stat_name", "처리상태명", "category"),
+        Field("rjct_rson_name", "거부사유명", "category"),
+        Field("rjct_rson", "거부사유", "category"),
+    ),
+    index="odno",
+)
+
+
+@timed_conversion
+def kr_ohlcv_to_dataframe(res: APIResponse) -> pd.DataFrame:
+    """
+    국내 주식 과거 가격 조회 결과를 DataFrame으로 변환한다.
+    """
+    if not res.is_ok() or len(res.outputs) == 0:
+        return pd.DataFrame()
+
+    return to_dataframe(res.outputs[0], KR_OHLCV_SCHEMA)
+
+
+@timed_conversion
+def kr_ohlcv_range_to_dataframe(responses: Iterable[APIResponse]) -> pd.DataFrame:
+    """
+    국내 주식 기간별 시세 조회 결과들을 하나의 DataFrame으로 변환한다.
+    겹치는 날짜는 하나만 남기고, 날짜 순서로 정렬한다.
+    """
+    rows = [row for res in responses for row in res.body.get("output2") or []
+            if row.get("stck_bsop_date")]
+    if not rows:
+        return empty_dataframe(KR_OHLCV_SCHEMA)
+
+    data = to_dataframe(rows, KR_OHLCV_SCHEMA)
+    data = data[~data.index.duplicated(keep="first")]
+    return data.sort_index()
+
+
+@timed_conversion
+def kr_minute_ohlcv_to_dataframe(responses: Iterable[APIResponse]) -> pd.DataFrame:
+    """
+    국내 주식 당일 분봉 조회 결과들을 하나의 DataFrame으로 변환한다.
+    index는 영업일자와 체결 시각을 합친 시각이며, 겹치는 봉은 하나만 남기고 시간 순서로 정렬한다.
+    """
+    rows = [row for res in responses for row in res.body.get("output2") or []
+            if row.get("stck_cntg_hour")]
+    if not rows:
+        return empty_dataframe(KR_MINUTE_OHLCV_SCHEMA)
+
+    data = to_dataframe(rows, KR_MINUTE_OHLCV_SCHEMA)
+    hours = convert_column([row["stck_cntg_hour"] for row in rows], "int")
+    seconds = hours // 10000 * 3600 + hours // 100 % 100 * 60 + hours % 100
+    data.index = pd.DatetimeIndex(data.index + pd.to_timedelta(seconds, unit="s"), name="Date")
+
+    data = data[~data.index.duplicated(keep="first")]
+    return data.sort_index()
+
+
+@timed_conversion
+def kr_stock_balance_to_dataframe(res: APIResponse) -> pd.DataFrame:
+    """
+    국내 주식 잔고 조회 결과를 DataFrame으로 변환한다.
+    """
+    return to_dataframe(res.outputs[0], KR_STOCK_BALANCE_SCHEMA)
+
+
+@timed_conversion
+def os_stock_balance_to_dataframe(res: APIResponse) -> pd.DataFrame:
+    """
+    해외 주식 잔고 조회 결과를 DataFrame으로 변환한다.
+    """
+    return to_dataframe(res.outputs[0], OS_STOCK_BALANCE_SCHEMA)
+
+
+@timed_conversion
+def kr_orders_to_dataframe(res: APIResponse) -> pd.DataFrame:
+    """
+    취소/정정 가능한 국내 주식 주문 조회 결과를 DataFrame으로 변환한다.
+    """
+    return to_dataframe(res.outputs[0], KR_ORDERS_SCHEMA)
+
+
+@timed_conversion
+def os_orders_to_dataframe(res: APIResponse, market_code_map: MarketCodeMap) -> pd.DataFrame:
+    """
+    미체결 해외 주식 주문 조회 결과를 DataFrame으로 변환한다.
+    해외거래소코드는 3글자 코드로 변환한다.
+    """
+    schema = OS_ORDERS_SCHEMA.with_mapping("ovrs_excg_cd", market_code_map.map_4_to_3)
+    return to_dataframe(res.outputs[0], schema)
+
+
+def _quotes_to_dataframe(keys: List[Any], results: List[Any], fields: List[Tuple[str, str, str]],
+                         index_name: str) -> pd.DataFrame:
+    """
+    여러 종목의 현재가 시세 조회 결과를 하나의 DataFrame으로 변환한다.
+    조회에 실패한 종목은 시세 값을 비워두고 오류 column에 오류 메시지를 기록한다.
+    fields: (source key, column 이름, dtype)의 list
+    """
+    columns = {name: [] for _, name, _ in fields}
+    errors = []
+    for result in results:
+        failed = isinstance(result, Exception)
+        for source, name, _ in fields:
+            columns[name].append(None if failed else result.get(source))
+        errors.append(str(result) if failed else None)
+
+    data = pd.DataFrame(index=pd.Index(keys, name=index_name))
+    for _, name, dtype in fields:
+        values = pd.Series(columns[name], index=data.index, dtype="object")
+        data[name] = pd.to_numeric(values, errors="coerce").astype(dtype)
+    data["오류"] = pd.Series(errors, index=data.index, dtype="object")
+
+    return data
+
+
+@timed_conversion
+def kr_quotes_to_dataframe(tickers: List[str], results: List[Any]) -> pd.DataFrame:
+    """
+    국내 주식 현재가 시세 조회 결과(또는 예외)의 list를 종목코드를 index로 하는 DataFrame으로 변환한다.
+    """
+    fields = [
+        ("stck_prpr", "현재가", "Int64"),
+        ("stck_mxpr", "상한가", "Int64"),
+        ("stck_llam", "하한가", "Int64"),
+        ("acml_vol", "거래량", "Int64"),
+        ("prdy_vrss", "전일대비", "Int64"),
+        ("prdy_ctrt", "등락률", "float64"),
+    ]
+    return _quotes_to_dataframe(tickers, results, fields, "종목코드")
+
+
+@timed_conversion
+def os_quotes_to_dataframe(items: List[Tuple[str, str]], results: List[Any]) -> pd.DataFrame:
+    """
+    해외 주식 현재가 시세 조회 결과(또는 예외)의 list를 종목코드를 index로 하는 DataFrame으로 변환한다.
+    items: 조회한 (거래소 코드, 종목코드) list
+    """
+    fields = [
+        ("last", "현재가", "float64"),
+        ("base", "전일종가", "float64"),
+        ("tvol", "거래량", "Int64"),
+        ("diff", "전일대비", "float64"),
+        ("rate", "등락률", "float64"),
+    ]
+    tickers = [ticker for _, ticker in items]
+    data = _quotes_to_dataframe(tickers, results, fields, "종목코드")
+    data.insert(0, "거래소코드", [market_code for market_code, _ in items])
+    return data
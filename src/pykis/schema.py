@@ -0,0 +1,178 @@
+"""
+API 응답의 output(list of dict)을 선언적인 schema에 따라 DataFrame으로 변환하는 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from .request_utility import Json
+
+
+class Field(NamedTuple):
+    """
+    DataFrame column 하나의 정의
+    source: API output의 field 이름
+    name: DataFrame의 column 이름
+    dtype: column 타입
+           int-정수, float-실수, number-정수 또는 실수(pd.to_numeric), str-문자열,
+           category-범주형(종목명, 코드 등 반복되는 값), date-날짜(YYYYMMDD)
+    mapping: 값 변환 표. 지정한 경우 category 타입으로 변환되며, 표에 없는 값은 그대로 둔다.
+    """
+    source: str
+    name: str
+    dtype: str = "str"
+    mapping: Optional[Dict[str, str]] = None
+
+
+class Schema(NamedTuple):
+    """
+    API output을 DataFrame으로 변환하는 방법의 정의
+    fields: column 정의 목록 (column 순서)
+    index: index로 사용할 API output의 field 이름
+    index_name: index 이름. 지정하지 않은 경우 index field 이름을 사용한다.
+    index_dtype: index 타입 (Field.dtype 참고)
+    """
+    fields: Tuple[Field, ...]
+    index: Optional[str] = None
+    index_name: Optional[str] = None
+    index_dtype: str = "str"
+
+    def with_mapping(self, source: str, mapping: Dict[str, str]) -> "Schema":
+        """
+        source field의 값 변환 표를 바꾼 schema를 반환한다.
+        """
+        fields = tuple(field._replace(mapping=mapping) if field.source == source else field
+                       for field in self.fields)
+        return Schema(fields, self.index, self.index_name, self.index_dtype)
+
+
+def _to_int(values: np.ndarray) -> Any:
+    """
+    문자열 배열을 int64 배열로 변환한다. 정수가 아닌 값이 있는 경우 pd.to_numeric으로 변환한다.
+    """
+    try:
+        return values.astype(np.int64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(values, errors="coerce")
+
+
+def _to_float(values: np.ndarray) -> Any:
+    """
+    문자열 배열을 float64 배열로 변환한다. 변환할 수 없는 값은 NaN이 된다.
+    """
+    try:
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(values, errors="coerce").astype(np.float64)
+
+
+def _to_number(values: np.ndarray) -> Any:
+    """
+    문자열 배열을 int64 또는 float64 배열로 변환한다. 변환할 수 없는 값은 NaN이 된다.
+    """
+    try:
+        return values.astype(np.int64)
+    except (ValueError, TypeError):
+        return _to_float(values)
+
+
+def _to_category(values: np.ndarray, mapping: Optional[Dict[str, str]]) -> pd.Categorical:
+    """
+    문자열 배열을 category 타입으로 변환한다. mapping이 있는 경우 category 이름만 바꾸므로,
+    값 변환 비용은 행 수가 아니라 서로 다른 값의 수에 비례한다.
+    """
+    codes, categories = pd.factorize(values)
+    if mapping:
+        renamed = [mapping.get(category, category) for category in categories]
+        if len(set(renamed)) < len(renamed):
+            # 서로 다른 값이 같은 이름으로 변환되는 경우
+            codes, categories = pd.factorize(np.asarray(renamed, dtype=object)[codes])
+        else:
+            categories = renamed
+    return pd.Categorical.from_codes(codes, categories)
+
+
+_EMPTY_DTYPES = {
+    "int": np.int64,
+    "float": np.float64,
+    "number": np.float64,
+    "str": object,
+    "category": "category",
+    "date": "datetime64[ns]",
+}
+
+
+_CONVERTERS = {
+    "int": _to_int,
+    "float": _to_float,
+    "number": _to_number,
+    "str": lambda values: values,
+    "date": lambda values: pd.to_datetime(values, format="%Y%m%d"),
+}
+
+
+def convert_column(values: Sequence[Any], dtype: str,
+                   mapping: Optional[Dict[str, str]] = None) -> Any:
+    """
+    API output 값들을 dtype 타입의 column 값으로 변환한다.
+    """
+    array = np.asarray(values, dtype=object)
+    if mapping is not None or dtype == "category":
+        return _to_category(array, mapping)
+    if dtype not in _CONVERTERS:
+        raise RuntimeError(f"지원하지 않는 dtype입니다: {dtype}")
+    return _CONVERTERS[dtype](array)
+
+
+def to_dataframe(rows: List[Json], schema: Schema) -> pd.DataFrame:
+    """
+    API output(list of dict)을 schema에 따라 DataFrame으로 변환한다.
+    각 column은 한번에 배열로 변환되며, 중간 DataFrame이나 행 단위 변환 없이 바로 생성된다.
+    rows가 비어있는 경우 빈 DataFrame을 반환한다.
+    """
+    if not rows:
+        return pd.DataFrame()
+
+    columns = {
+        field.name: convert_column([row.get(field.source) for row in rows],
+                                   field.dtype, field.mapping)
+        for field in schema.fields
+    }
+
+    index = None
+    if schema.index is not None:
+        index_values = convert_column([row.get(schema.index) for row in rows], schema.index_dtype)
+        index = pd.Index(index_values, name=schema.index_name or schema.index)
+
+    return pd.DataFrame(columns, index=index)
+
+
+def empty_dataframe(schema: Schema) -> pd.DataFrame:
+    """
+    schema의 column과 타입을 가지는 빈 DataFrame을 반환한다.
+    """
+    def dtype_of(dtype: str, mapping: Optional[Dict[str, str]] = None) -> Any:
+        return "category" if mapping is not None else _EMPTY_DTYPES[dtype]
+
+    columns = {field.name: pd.Series(dtype=dtype_of(field.dtype, field.mapping))
+               for field in schema.fields}
+    index = None
+    if schema.index is not None:
+        index = pd.Index([], dtype=dtype_of(schema.index_dtype),
+                         name=schema.index_name or schema.index)
+    return pd.DataFrame(columns, index=index)
@@ -0,0 +1,861 @@
+"""
+네트워크 없이 pykis를 실행하기 위한 가상 거래소(simulator) 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from datetime import date, datetime
+from urllib.parse import parse_qs, urlsplit
+import json
+import secrets
+import threading
+import pandas as pd
+
+from . import json_decoder
+from .order_book import BookOrder, Fill, OrderBook, kr_tick_size
+from .quote import KST
+from .replay import stub_response
+from .transport import RawResponse
+
+Json = Dict[str, Any]
+
+# 상한가/하한가의 기준가 대비 비율
+KR_PRICE_LIMIT_RATE = 0.3
+
+# 주문점 (KRX_FWDG_ORD_ORGNO)
+ORDER_BRANCH = "06010"
+
+# simulator에서만 사용하는 오류 메시지 코드. (실제 서버의 메시지 코드와는 다르다.)
+SIMULATOR_ERRORS = {
+    "SIM00001": "유효하지 않은 token 입니다.",
+    "SIM00002": "지원하지 않는 API 입니다.",
+    "SIM00003": "존재하지 않는 종목코드 입니다.",
+    "SIM00004": "주문수량이 올바르지 않습니다.",
+    "SIM00005": "주문단가가 호가단위에 맞지 않습니다.",
+    "SIM00006": "주문단가가 상한가/하한가 범위를 벗어났습니다.",
+    "SIM00007": "주문가능금액을 초과했습니다.",
+    "SIM00008": "주문가능수량을 초과했습니다.",
+    "SIM00009": "정정/취소할 수 있는 주문이 없습니다.",
+    "SIM00010": "필수 입력값이 없거나 형식이 올바르지 않습니다.",
+}
+
+
+class _Rejected(RuntimeError):
+    """
+    주문, 조회를 처리할 수 없는 경우 던지는 예외. API request 처리 중에는 오류 응답으로 변환되고,
+    설정 method(submit_order 등)에서는 RuntimeError로 바꿔서 던진다.
+    """
+
+    def __init__(self, code: str) -> None:
+        super().__init__(SIMULATOR_ERRORS[code])
+        self.code: str = code
+
+
+class Position:  # pylint: disable=too-few-public-methods
+    """
+    계좌의 한 종목 보유 현황
+    """
+    __slots__ = ["amount", "cost"]
+
+    def __init__(self, amount: int = 0, cost: int = 0) -> None:
+        self.amount: int = amount   # 보유 수량
+        self.cost: int = cost       # 매입 금액
+
+    @property
+    def average_price(self) -> float:
+        """
+        매입 단가
+        """
+        return self.cost / self.amount if self.amount > 0 else 0.0
+
+
+class SimulatedAccount:
+    """
+    가상 거래소의 계좌. 현금, 보유 종목, 미체결 주문을 관리한다.
+    """
+
+    def __init__(self, account: str, cash: int) -> None:
+        """
+        account: 계좌 (종합계좌번호-상품코드. ex> 12345678-01)
+        cash: 예수금
+        """
+        self.account: str = account
+        self.cash: int = cash
+        self.positions: Dict[str, Position] = {}
+        self.open_orders: Dict[str, BookOrder] = {}
+        self.reserved_cash: int = 0                 # 미체결 매수 주문에 묶인 금액
+        self.reserved_amounts: Dict[str, int] = {}  # 종목별 미체결 매도 주문에 묶인 수량
+
+    def position(self, ticker: str) -> Position:
+        """
+        종목의 보유 현황을 반환한다. 없는 경우 새로 만든다.
+        """
+        position = self.positions.get(ticker)
+        if position is None:
+            position = self.positions[ticker] = Position()
+        return position
+
+    def orderable_cash(self) -> int:
+        """
+        매수 주문에 사용할 수 있는 금액
+        """
+        return self.cash - self.reserved_cash
+
+    def orderable_amount(self, ticker: str) -> int:
+        """
+        매도 주문할 수 있는 수량
+        """
+        position = self.positions.get(ticker)
+        held = position.amount if position is not None else 0
+        return held - self.reserved_amounts.get(ticker, 0)
+
+
+class _Instrument:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """
+    가상 거래소에서 거래되는 종목 하나의 호가창과 당일 시세
+    """
+
+    def __init__(self, ticker: str, name: str, base_price: int,
+                 history: List["DailyBar"]) -> None:
+        self.ticker: str = ticker
+        self.name: str = name
+        self.base_price: int = base_price   # 기준가 (전일 종가)
+        self.book: OrderBook = OrderBook(ticker)
+        self.history: List[DailyBar] = history     # 과거 일봉. 날짜 순서
+        self.open: Optional[int] = None
+        self.high: int = 0
+        self.low: int = 0
+        self.last: int = base_price
+        self.volume: int = 0
+        self.trade_amount: int = 0
+
+        tick = kr_tick_size(int(base_price * (1 + KR_PRICE_LIMIT_RATE)))
+        self.max_price: int = int(base_price * (1 + KR_PRICE_LIMIT_RATE)) // tick * tick
+        tick = kr_tick_size(int(base_price * (1 - KR_PRICE_LIMIT_RATE)))
+        self.min_price: int = -(-int(base_price * (1 - KR_PRICE_LIMIT_RATE)) // tick) * tick
+
+    def trade(self, price: int, amount: int) -> None:
+        """
+        체결을 당일 시세에 반영한다.
+        """
+        if self.open is None:
+            self.open = self.high = self.low = price
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.last = price
+        self.volume += amount
+        self.trade_amount += price * amount
+
+
+class DailyBar(NamedTuple):
+    """
+    일봉 하나
+    """
+    date: date
+    open: int
+    high: int
+    low: int
+    close: int
+    volume: int
+
+
+def _sign(change: int) -> str:
+    """
+    전일 대비 부호 (2-상승, 3-보합, 5-하락)
+    """
+    if change > 0:
+        return "2"
+    return "5" if change < 0 else "3"
+
+
+def _rate(change: float, base: float) -> str:
+    return f"{change / base * 100:.2f}" if base else "0.00"
+
+
+class SimulatedExchange:  # pylint: disable=too-many-instance-attributes
+    """
+    pykis가 사용하는 국내 주식 API를 흉내내는 가상 거래소.
+    종목마다 가격/시간 우선 원칙의 호가창(OrderBook)이 있으며, 주문은 호가창에서 바로 체결된다.
+    SimulatorTransport로 socket 없이 사용하거나, SimulatorServer로 HTTP 서버를 열어 DomainInfo(url=...)로 사용한다.
+    지원하는 API: token 발급, hash key, 현재가 시세, 일/주/월 시세, 잔고 조회, 현금 주문,
+    주문 정정/취소, 정정/취소 가능 주문 조회. (thread-safe)
+    """
+
+    def __init__(self, initial_cash: int = 100_000_000, page_size: int = 100,
+                 clock: Optional[Callable[[], datetime]] = None) -> None:
+        """
+        initial_cash: 처음 사용되는 계좌에 지급할 예수금
+        page_size: 잔고, 주문 조회에서 한 page에 반환할 최대 row 수
+        clock: 현재 시각을 반환하는 함수. 주문 시각, 당일 시세의 날짜에 사용한다. 기본값은 한국 시각
+        """
+        self.initial_cash: int = initial_cash
+        self.page_size: int = page_size
+        self.clock: Callable[[], datetime] = clock if clock is not None else \
+            lambda: datetime.now(KST)
+
+        self.accounts: Dict[str, SimulatedAccount] = {}
+        self.order_count: int = 0   # 접수한 주문 수 (정정/취소 포함)
+        self.fill_count: int = 0    # 체결 수
+
+        self._instruments: Dict[str, _Instrument] = {}
+        self._tokens = set()
+        self._lock = threading.Lock()
+        # (method, url path): handler
+        self._handlers: Dict[Tuple[str, str], Callable[[Json, Json], Tuple[Json, str]]] = {
+            ("POST", "/oauth2/tokenP"): self._issue_token,
+            ("GET", "/uapi/domestic-stock/v1/quotations/inquire-price"): self._inquire_price,
+            ("GET", "/uapi/domestic-stock/v1/quotations/inquire-daily-price"):
+                self._inquire_daily_price,
+            ("GET", "/uapi/domestic-stock/v1/trading/inquire-balance"): self._inquire_balance,
+            ("POST", "/uapi/domestic-stock/v1/trading/order-cash"): self._order_cash,
+            ("POST", "/uapi/domestic-stock/v1/trading/order-rvsecncl"): self._revise_cancel,
+            ("GET", "/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl"):
+                self._inquire_open_orders,
+        }
+
+    # 설정-----------------
+
+    def add_ticker(self, ticker: str, base_price: Optional[int] = None, *,
+                   name: Optional[str] = None,
+                   history: Optional[pd.DataFrame] = None) -> None:
+        """
+        거래할 종목을 추가한다.
+        base_price: 기준가 (전일 종가). 상한가/하한가 계산에 사용한다. 지정하지 않은 경우 history의 마지막 종가
+        name: 종목명
+        history: 과거 일봉. get_kr_ohlcv_range의 반환 값과 같은 형식 (Date index, Open, High, Low, Close, Volume)
+        """
+        bars = []
+        if history is not None:
+            for index, row in history.sort_index().iterrows():
+                bars.append(DailyBar(pd.Timestamp(index).date(), int(row["Open"]),
+                                     int(row["High"]), int(row["Low"]), int(row["Close"]),
+                                     int(row["Volume"])))
+        if base_price is None:
+            if not bars:
+                raise RuntimeError("base_price 또는 history를 지정해야 합니다.")
+            base_price = bars[-1].close
+
+        with self._lock:
+            self._instruments[ticker] = _Instrument(ticker, name or ticker, int(base_price), bars)
+
+    def add_account(self, account_code: str, product_code: str = "01", *,
+                    cash: Optional[int] = None,
+                    holdings: Optional[Dict[str, int]] = None) -> SimulatedAccount:
+        """
+        계좌를 추가하고 반환한다. 추가하지 않은 계좌는 처음 사용될 때 initial_cash로 만들어진다.
+        cash: 예수금. 지정하지 않은 경우 initial_cash
+        holdings: 보유 종목 {종목코드: 수량}. 매입 단가는 종목의 기준가
+        """
+        holdings = holdings or {}
+        with self._lock:
+            instruments = {ticker: self._known_instrument(ticker) for ticker in holdings}
+            account = self._account(f"{account_code}-{product_code}", cash)
+            for ticker, amount in holdings.items():
+                position = account.position(ticker)
+                position.amount += amount
+                position.cost += amount * instruments[ticker].base_price
+            return account
+
+    def add_liquidity(self, ticker: str, levels: int = 5, amount: int = 1000,
+                      account: str = "99999999-01") -> None:
+        """
+        기준가 위아래로 levels개의 호가에 amount주씩 매도/매수 주문을 낸다. (시장 조성용 계좌 사용)
+        """
+        with self._lock:
+            instrument = self._known_instrument(ticker)
+            maker = self._account(account)
+            maker.cash += instrument.max_price * amount * levels
+            maker.position(ticker).amount += amount * levels
+
+            ask = bid = instrument.base_price
+            for _ in range(levels):
+                ask = min(ask + kr_tick_size(ask), instrument.max_price)
+                bid = max(bid - kr_tick_size(bid - 1), instrument.min_price)
+                self._submit(maker, ticker, False, price=ask, amount=amount)
+                self._submit(maker, ticker, True, price=bid, amount=amount)
+
+    def submit_order(self, account: str, ticker: str, is_buy: bool,
+                     amount: int, price: int = 0) -> str:
+        """
+        API를 거치지 않고 주문을 낸다. (다른 시장 참여자 흉내 등에 사용)
+        account: 계좌 (종합계좌번호-상품코드. ex> 12345678-01)
+        price: 주문 가격. 0인 경우 시장가
+        return: 주문 번호
+        """
+        with self._lock:
+            self._known_instrument(ticker)
+            try:
+                return self._submit(self._account(account), ticker, is_buy, price=price,
+                                    amount=amount).order_number
+            except _Rejected as error:
+                raise RuntimeError(str(error)) from None
+
+    def order_book(self, ticker: str) -> OrderBook:
+        """
+        종목의 호가창을 반환한다. 다른 thread가 주문을 내는 중에는 사용하지 않는다.
+        """
+        return self._known_instrument(ticker).book
+
+    # 설정-----------------
+
+    # request 처리---------
+
+    def handle(self, method: str, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        request를 처리하고 응답을 반환한다.
+        method: "GET" 또는 "POST"
+        url: 전체 url 또는 url path
+        headers: request header. 이름은 소문자여야 한다. (ex> tr_id, authorization)
+        """
+        url_path = urlsplit(url).path
+        if url_path == "/uapi/hashkey":
+            return stub_response(url_path, params)
+
+        handler = self._handlers.get((method.upper(), url_path))
+        tr_cont = ""
+        status = 200
+        try:
+            if handler is None:
+                status = 404
+                raise _Rejected("SIM00002")
+            with self._lock:
+                if url_path != "/oauth2/tokenP" and \
+                        headers.get("authorization") not in self._tokens:
+                    raise _Rejected("SIM00001")
+                try:
+                    body, tr_cont = handler(params, headers)
+                except (KeyError, ValueError, TypeError) as error:   # 파라미터 누락, 숫자가 아닌 값 등
+                    raise _Rejected("SIM00010") from error
+            body["rt_cd"] = "0"
+        except _Rejected as error:
+            body = {"rt_cd": "1", "msg_cd": error.code, "msg1": str(error)}
+
+        response_headers = {"content-type": "application/json; charset=utf-8",
+                            "tr_id": headers.get("tr_id") or "", "tr_cont": tr_cont}
+        return RawResponse(status, response_headers,
+                           json.dumps(body, ensure_ascii=False).encode("utf-8"))
+
+    def _issue_token(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        # pylint: disable=unused-argument
+        token = secrets.token_hex(16)
+        self._tokens.add(f"Bearer {token}")
+        return {"access_token": token, "token_type": "Bearer", "expires_in": 86400}, ""
+
+    def _known_instrument(self, ticker: str) -> _Instrument:
+        """
+        설정 method에서 사용한다. 추가하지 않은 종목인 경우 RuntimeError를 던진다.
+        """
+        instrument = self._instruments.get(ticker)
+        if instrument is None:
+            raise RuntimeError(f"추가하지 않은 종목입니다. ({ticker})")
+        return instrument
+
+    def _instrument(self, ticker: str) -> _Instrument:
+        instrument = self._instruments.get(ticker)
+        if instrument is None:
+            raise _Rejected("SIM00003")
+        return instrument
+
+    def _account(self, account: str, cash: Optional[int] = None) -> SimulatedAccount:
+        found = self.accounts.get(account)
+        if found is None:
+            found = self.accounts[account] = SimulatedAccount(
+                account, self.initial_cash if cash is None else cash)
+        elif cash is not None:
+            found.cash = cash
+        return found
+
+    def _request_account(self, params: Json) -> SimulatedAccount:
+        return self._account(f"{params['CANO']}-{params['ACNT_PRDT_CD']}")
+
+    @staticmethod
+    def _ok(message: str = "정상처리 되었습니다.", **outputs) -> Json:
+        return {"msg_cd": "MCA00000", "msg1": message, **outputs}
+
+    def _page(self, rows: List[Json], params: Json) -> Tuple[List[Json], str, str]:
+        """
+        연속 조회 파라미터(CTX_AREA_NK100)에 해당하는 (page의 row들, 다음 page 위치, tr_cont)를 반환한다.
+        """
+        start = int(params.get("CTX_AREA_NK100") or 0)
+        end = start + self.page_size
+        if end < len(rows):
+            return rows[start:end], str(end), "M"
+        return rows[start:end], "", "D"
+
+    # request 처리---------
+
+    # 시세 조회------------
+
+    def _inquire_price(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        # pylint: disable=unused-argument
+        instrument = self._instrument(params["FID_INPUT_ISCD"])
+        base = instrument.base_price
+        change = instrument.last - base
+        opened = instrument.open is not None
+        output = {
+            "stck_shrn_iscd": instrument.ticker,
+            "stck_prpr": str(instrument.last),
+            "prdy_vrss": str(change),
+            "prdy_vrss_sign": _sign(change),
+            "prdy_ctrt": _rate(change, base),
+            "stck_oprc": str(instrument.open if opened else base),
+            "stck_hgpr": str(instrument.high if opened else base),
+            "stck_lwpr": str(instrument.low if opened else base),
+            "stck_mxpr": str(instrument.max_price),
+            "stck_llam": str(instrument.min_price),
+            "stck_sdpr": str(base),
+            "acml_vol": str(instrument.volume),
+            "acml_tr_pbmn": str(instrument.trade_amount),
+            "aspr_unit": str(kr_tick_size(instrument.last)),
+        }
+        return self._ok(output=output), ""
+
+    def _daily_bars(self, instrument: _Instrument) -> List[DailyBar]:
+        """
+        과거 일봉과 당일 봉(체결이 있는 경우)을 날짜 순서로 반환한다.
+        """
+        bars = list(instrument.history)
+        today = self.clock().date()
+        if instrument.open is not None and (not bars or bars[-1].date < today):
+            bars.append(DailyBar(today, instrument.open, instrument.high, instrument.low,
+                                 instrument.last, instrument.volume))
+        return bars
+
+    def _inquire_daily_price(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        # pylint: disable=unused-argument
+        instrument = self._instrument(params["FID_INPUT_ISCD"])
+        period = params.get("FID_PERIOD_DIV_CODE", "D")
+
+        groups: Dict[Any, List[DailyBar]] = {}
+        for daily in self._daily_bars(instrument):
+            if period == "W":
+                key = daily.date.isocalendar()[:2]
+            elif period == "M":
+                key = (daily.date.year, daily.date.month)
+            else:
+                key = daily.date
+            groups.setdefault(key, []).append(daily)
+
+        output = []
+        previous_close = None
+        for bars in groups.values():
+            close = bars[-1].close
+            change = close - previous_close if previous_close is not None else 0
+            output.append({
+                "stck_bsop_date": bars[0].date.strftime("%Y%m%d"),
+                "stck_oprc": str(bars[0].open),
+                "stck_hgpr": str(max(daily.high for daily in bars)),
+                "stck_lwpr": str(min(daily.low for daily in bars)),
+                "stck_clpr": str(close),
+                "acml_vol": str(sum(daily.volume for daily in bars)),
+                "prdy_vrss": str(change),
+                "prdy_vrss_sign": _sign(change),
+                "prdy_ctrt": _rate(change, previous_close or 0),
+            })
+            previous_close = close
+
+        return self._ok(output=output[::-1][:30]), ""
+
+    # 시세 조회------------
+
+    # 계좌 조회------------
+
+    def _inquire_balance(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        # pylint: disable=unused-argument
+        account = self._request_account(params)
+        rows = []
+        purchase_total = evaluation_total = 0
+        for ticker, position in account.positions.items():
+            if position.amount <= 0:
+                continue
+            instrument = self._instruments[ticker]
+            purchase_total += position.cost
+            evaluation_total += instrument.last * position.amount
+            rows.append(self._balance_row(account, instrument, position))
+
+        page, cursor, tr_cont = self._page(rows, params)
+        summary = [{
+            "dnca_tot_amt": str(account.cash),
+            "nxdy_excc_amt": str(account.cash),
+            "prvs_rcdl_excc_amt": str(account.cash),
+            "scts_evlu_amt": str(evaluation_total),
+            "tot_evlu_amt": str(account.cash + evaluation_total),
+            "pchs_amt_smtl_amt": str(purchase_total),
+            "evlu_amt_smtl_amt": str(evaluation_total),
+            "evlu_pfls_smtl_amt": str(evaluation_total - purchase_total),
+            "nass_amt": str(account.cash + evaluation_total),
+        }]
+        return self._ok(output1=page, output2=summary, ctx_area_fk100=account.account,
+                        ctx_area_nk100=cursor), tr_cont
+
+    @staticmethod
+    def _balance_row(account: SimulatedAccount, instrument: _Instrument,
+                     position: Position) -> Json:
+        price, base = instrument.last, instrument.base_price
+        evaluation = price * position.amount
+        return {
+            "pdno": instrument.ticker,
+            "prdt_name": instrument.name,
+            "hldg_qty": str(position.amount),
+            "ord_psbl_qty": str(account.orderable_amount(instrument.ticker)),
+            "pchs_avg_pric": f"{position.average_price:.4f}",
+            "pchs_amt": str(position.cost),
+            "prpr": str(price),
+            "evlu_amt": str(evaluation),
+            "evlu_pfls_amt": str(evaluation - position.cost),
+            "evlu_pfls_rt": _rate(evaluation - position.cost, position.cost),
+            "bfdy_cprs_icdc": str(price - base),
+            "fltt_rt": _rate(price - base, base),
+        }
+
+    def _inquire_open_orders(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        # pylint: disable=unused-argument
+        account = self._request_account(params)
+        rows = []
+        for order in account.open_orders.values():
+            rows.append({
+                "ord_gno_brno": ORDER_BRANCH,
+                "odno": order.order_number,
+                "orgn_odno": order.original_number,
+                "ord_dvsn_name": "시장가" if order.is_market() else "지정가",
+                "pdno": order.ticker,
+                "prdt_name": self._instruments[order.ticker].name,
+                "rvse_cncl_dvsn_name": "정정" if order.original_number else "",
+                "ord_qty": str(order.amount),
+                "ord_unpr": str(order.price),
+                "ord_tmd": order.time,
+                "tot_ccld_qty": str(order.filled),
+                "psbl_qty": str(order.remaining),
+                "sll_buy_dvsn_cd": "02" if order.is_buy else "01",
+                "ord_dvsn_cd": "01" if order.is_market() else "00",
+            })
+
+        page, cursor, tr_cont = self._page(rows, params)
+        return self._ok(output=page, ctx_area_fk100=account.account,
+                        ctx_area_nk100=cursor), tr_cont
+
+    # 계좌 조회------------
+
+    # 매매-----------------
+
+    def _order_output(self, order_number: str) -> Json:
+        return self._ok("주문 전송 완료 되었습니다.", output={
+            "KRX_FWDG_ORD_ORGNO": ORDER_BRANCH,
+            "ODNO": order_number,
+            "ORD_TMD": self.clock().strftime("%H%M%S"),
+        })
+
+    def _order_cash(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        is_buy = (headers.get("tr_id") or "")[-5:] in ("0802U", "0012U")
+        price = 0 if params.get("ORD_DVSN") == "01" else int(params["ORD_UNPR"])
+        order = self._submit(self._request_account(params), params["PDNO"], is_buy,
+                             price=price, amount=int(params["ORD_QTY"]))
+        return self._order_output(order.order_number), ""
+
+    def _revise_cancel(self, params: Json, headers: Json) -> Tuple[Json, str]:
+        # pylint: disable=unused-argument
+        account = self._request_account(params)
+        original = account.open_orders.get(params["ORGN_ODNO"])
+        if original is None:
+            raise _Rejected("SIM00009")
+
+        amount = original.remaining if params.get("QTY_ALL_ORD_YN") == "Y" \
+            else min(int(params["ORD_QTY"]), original.remaining)
+        if amount <= 0:
+            raise _Rejected("SIM00004")
+
+        if params.get("RVSE_CNCL_DVSN_CD") == "02":   # 취소
+            self._cancel(account, original, amount)
+            return self._order_output(self._next_order_number()), ""
+
+        # 정정: 원주문의 수량을 취소하고 새 가격으로 다시 주문한다. (시간 우선 순위를 잃는다.)
+        instrument = self._instruments[original.ticker]
+        price = 0 if params.get("ORD_DVSN") == "01" else int(params["ORD_UNPR"])
+        self._check_price(instrument, price)
+        released = amount * self._reserve_price(original) if original.is_buy else amount
+        self._check_orderable(account, instrument, original.is_buy, price, amount,
+                              released=released)
+
+        self._cancel(account, original, amount)
+        order = self._submit(account, original.ticker, original.is_buy, price=price,
+                             amount=amount, original_number=original.order_number)
+        return self._order_output(order.order_number), ""
+
+    def _next_order_number(self) -> str:
+        self.order_count += 1
+        return f"{self.order_count:010d}"
+
+    def _reserve_price(self, order: BookOrder) -> int:
+        """
+        매수 주문에 묶어둘 주당 금액. 시장가 주문은 상한가로 계산한다.
+        """
+        return order.price or self._instruments[order.ticker].max_price
+
+    @staticmethod
+    def _check_price(instrument: _Instrument, price: int) -> None:
+        if price == 0:
+            return
+        if price % kr_tick_size(price) != 0:
+            raise _Rejected("SIM00005")
+        if not instrument.min_price <= price <= instrument.max_price:
+            raise _Rejected("SIM00006")
+
+    @staticmethod
+    def _check_orderable(account: SimulatedAccount,  # pylint: disable=too-many-arguments
+                         instrument: _Instrument, is_buy: bool, price: int, amount: int, *,
+                         released: int = 0) -> None:
+        """
+        주문가능금액(매수), 주문가능수량(매도)을 확인한다.
+        released: 주문 전에 풀리는 금액(매수) 또는 수량(매도). 정정 주문에 사용한다.
+        """
+        if is_buy:
+            if (price or instrument.max_price) * amount > account.orderable_cash() + released:
+                raise _Rejected("SIM00007")
+        elif amount > account.orderable_amount(instrument.ticker) + released:
+            raise _Rejected("SIM00008")
+
+    def _submit(self, account: SimulatedAccount,  # pylint: disable=too-many-arguments
+                ticker: str, is_buy: bool, *, price: int, amount: int,
+                original_number: str = "") -> BookOrder:
+        """
+        주문을 확인하고 호가창에 낸 뒤 체결 결과를 계좌에 반영한다.
+        """
+        instrument = self._instrument(ticker)
+        if amount <= 0:
+            raise _Rejected("SIM00004")
+        self._check_price(instrument, price)
+        self._check_orderable(account, instrument, is_buy, price, amount)
+
+        order = BookOrder(self._next_order_number(), account.account, ticker, is_buy,
+                          price=price, amount=amount, original_number=original_number,
+                          time=self.clock().strftime("%H%M%S"))
+        if is_buy:
+            account.reserved_cash += self._reserve_price(order) * amount
+        else:
+            account.reserved_amounts[ticker] = account.reserved_amounts.get(ticker, 0) + amount
+        account.open_orders[order.order_number] = order
+
+        for fill in instrument.book.submit(order):
+            self._settle(instrument, fill)
+
+        if order.cancelled > 0:   # 체결되지 않은 시장가 주문의 잔량
+            self._release(account, order, order.cancelled)
+        if order.remaining == 0:   # 전량 체결된 주문은 _settle에서 이미 제거된다.
+            account.open_orders.pop(order.order_number, None)
+        return order
+
+    def _cancel(self, account: SimulatedAccount, order: BookOrder, amount: int) -> None:
+        cancelled = self._instruments[order.ticker].book.cancel(order, amount)
+        self._release(account, order, cancelled)
+        if order.remaining == 0:
+            del account.open_orders[order.order_number]
+
+    def _release(self, account: SimulatedAccount, order: BookOrder, amount: int) -> None:
+        """
+        체결되거나 취소된 수량만큼 주문에 묶여있던 금액(매수) 또는 수량(매도)을 푼다.
+        """
+        if order.is_buy:
+            account.reserved_cash -= self._reserve_price(order) * amount
+        else:
+            account.reserved_amounts[order.ticker] -= amount
+
+    def _settle(self, instrument: _Instrument, fill: Fill) -> None:
+        """
+        체결을 매수/매도 계좌와 당일 시세에 반영한다.
+        """
+        value = fill.price * fill.amount
+        buyer = self.accounts[fill.buy_order.account]
+        seller = self.accounts[fill.sell_order.account]
+
+        self._release(buyer, fill.buy_order, fill.amount)
+        buyer.cash -= value
+        position = buyer.position(fill.ticker)
+        position.amount += fill.amount
+        position.cost += value
+
+        self._release(seller, fill.sell_order, fill.amount)
+        seller.cash += value
+        position = seller.position(fill.ticker)
+        position.cost -= round(position.cost * fill.amount / position.amount)
+        position.amount -= fill.amount
+
+        for order, account in ((fill.buy_order, buyer), (fill.sell_order, seller)):
+            if order.remaining == 0:
+                account.open_orders.pop(order.order_number, None)
+
+        instrument.trade(fill.price, fill.amount)
+        self.fill_count += 1
+
+    # 매매-----------------
+
+
+class SimulatorTransport:
+    """
+    socket 없이 SimulatedExchange로 request를 바로 전달하는 전송 계층. Api의 transport로 사용한다.
+    """
+
+    def __init__(self, exchange: SimulatedExchange) -> None:
+        self.exchange: SimulatedExchange = exchange
+
+    def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        GET request를 가상 거래소에서 처리하고 response를 반환한다.
+        """
+        return self.exchange.handle("GET", url, headers, params)
+
+    def post(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        POST request를 가상 거래소에서 처리하고 response를 반환한다.
+        """
+        return self.exchange.handle("POST", url, headers, params)
+
+    def close(self) -> None:
+        """
+        Transport와 같은 interface를 위한 method. 정리할 자원이 없다.
+        """
+
+    def __enter__(self) -> "SimulatorTransport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncSimulatorTransport:
+    """
+    SimulatorTransport의 asyncio 버전. AsyncApi의 transport로 사용한다.
+    """
+
+    def __init__(self, exchange: SimulatedExchange) -> None:
+        self.exchange: SimulatedExchange = exchange
+
+    async def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        GET request를 가상 거래소에서 처리하고 response를 반환한다.
+        """
+        return self.exchange.handle("GET", url, headers, params)
+
+    async def post(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        POST request를 가상 거래소에서 처리하고 response를 반환한다.
+        """
+        return self.exchange.handle("POST", url, headers, params)
+
+    async def close(self) -> None:
+        """
+        AsyncTransport와 같은 interface를 위한 method. 정리할 자원이 없다.
+        """
+
+    async def __aenter__(self) -> "AsyncSimulatorTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    """
+    HTTP request를 SimulatedExchange로 전달하는 request handler. (HTTP/1.1 keep-alive 지원)
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    exchange: SimulatedExchange
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _reply(self, method: str, params: Json) -> None:
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        resp = self.exchange.handle(method, self.path, headers, params)
+        self.send_response(resp.status_code)
+        for key, value in resp.headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(resp.content)))
+        self.end_headers()
+        self.wfile.write(resp.content)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        GET request를 처리한다.
+        """
+        query = parse_qs(urlsplit(self.path).query, keep_blank_values=True)
+        self._reply("GET", {key: values[0] for key, values in query.items()})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        POST request를 처리한다.
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length > 0 else b""
+        try:
+            params = json_decoder.loads(body) if body else {}
+        except ValueError:
+            params = None
+        # 형식이 올바르지 않은 body는 빈 파라미터로 처리한다. (필수 입력값 오류로 응답)
+        self._reply("POST", params if isinstance(params, dict) else {})
+
+
+class SimulatorServer:
+    """
+    SimulatedExchange를 HTTP로 제공하는 서버. background thread에서 실행된다.
+    DomainInfo(url=server.url)로 Api, AsyncApi를 연결한다.
+    """
+
+    def __init__(self, exchange: SimulatedExchange, host: str = "127.0.0.1",
+                 port: int = 0) -> None:
+        """
+        host, port: 서버 주소. port가 0인 경우 사용 가능한 port를 자동으로 선택한다.
+        """
+        handler = type("SimulatorHandler", (_SimulatorHandler,), {"exchange": exchange})
+        self.exchange: SimulatedExchange = exchange
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        서버의 base url (ex> http://127.0.0.1:12345)
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SimulatorServer":
+        """
+        background thread에서 서버를 시작한다.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.server.serve_forever,
+                                            name="pykis-simulator", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        서버를 종료한다.
+        """
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self) -> "SimulatorServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
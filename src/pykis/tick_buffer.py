@@ -0,0 +1,253 @@
+"""
+종목별 체결(tick) 정보를 고정 크기의 NumPy 배열에 보관하는 ring buffer 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional, Union
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .quote import KST
+
+Timestamp = Union[datetime, float, None]
+
+_EPOCH = datetime(1970, 1, 1)
+_KST_OFFSET_NS = 9 * 3600 * 10**9
+
+# 종목별 ring buffer를 처음 만들 때 할당하는 tick 수. capacity까지 2배씩 늘어난다.
+INITIAL_TICK_ALLOCATION = 1024
+
+
+def to_kst_ns(timestamp: Timestamp = None) -> int:
+    """
+    시각을 KST 기준 wall clock의 epoch nanosecond로 변환한다.
+    timestamp: datetime(timezone이 없는 경우 KST로 간주) 또는 unix time(초). None인 경우 현재 시각
+    """
+    if timestamp is None:
+        return time.time_ns() + _KST_OFFSET_NS
+
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(KST).replace(tzinfo=None)
+        delta = timestamp - _EPOCH
+        return (delta.days * 86400 + delta.seconds) * 10**9 + delta.microseconds * 1000
+
+    return int(timestamp * 10**9) + _KST_OFFSET_NS
+
+
+class TickWindow(NamedTuple):
+    """
+    ring buffer의 연속된 구간. 각 배열은 ring buffer의 메모리를 그대로 참조하는 읽기 전용 view이다.
+    """
+    timestamp: np.ndarray   # KST 기준 시각 (datetime64[ns])
+    price: np.ndarray       # 체결가 (float64)
+    volume: np.ndarray      # 체결량 (float64)
+    bid: np.ndarray         # 매수호가 (float64)
+    ask: np.ndarray         # 매도호가 (float64)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        tick DataFrame으로 변환한다. (index: Date)
+        """
+        data = pd.DataFrame({
+            "Price": self.price,
+            "Volume": self.volume,
+            "Bid": self.bid,
+            "Ask": self.ask,
+        }, index=pd.DatetimeIndex(self.timestamp, name="Date"))
+        return data
+
+    def to_ohlcv(self, interval: str = "1min") -> pd.DataFrame:
+        """
+        tick을 interval 단위의 봉으로 집계하여 get_kr_ohlcv와 같은 형식의 DataFrame으로 반환한다.
+        interval: 봉 간격 (pandas offset 문자열. ex> "10s", "1min", "5min", "1h", "1D")
+        return: Date를 index로 하는 DataFrame (Open, High, Low, Close, Volume). tick이 없는 봉은 생략된다.
+        """
+        columns = ["Open", "High", "Low", "Close", "Volume"]
+        if len(self) == 0:
+            return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name="Date"))
+
+        step = pd.Timedelta(interval).value
+        buckets = self.timestamp.view(np.int64) // step
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)] - 1
+
+        data = pd.DataFrame({
+            "Open": self.price[starts],
+            "High": np.maximum.reduceat(self.price, starts),
+            "Low": np.minimum.reduceat(self.price, starts),
+            "Close": self.price[ends],
+            "Volume": np.add.reduceat(self.volume, starts),
+        }, index=pd.DatetimeIndex((buckets[starts] * step).astype("datetime64[ns]"), name="Date"))
+        return data
+
+
+class TickRingBuffer:  # pylint: disable=too-many-instance-attributes
+    """
+    한 종목의 tick을 최근 capacity개까지 보관하는 columnar ring buffer.
+    각 값을 배열의 i, i + capacity 두 위치에 기록하므로,
+    최근 n개의 tick은 항상 배열의 연속된 구간이 되어 복사 없이 view로 반환할 수 있다.
+    tick 하나에 80 byte(8 byte column 5개 × 2)를 사용하므로, 종목당 최대 capacity × 80 byte를 사용한다.
+    (기본값 10000 → 약 0.8 MB) 배열은 INITIAL_TICK_ALLOCATION개부터 tick이 쌓이는 만큼 2배씩 늘려서 할당한다.
+    append는 한 thread에서만 호출해야 한다.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        """
+        capacity: 보관할 최대 tick 수. 초과하는 경우 오래된 tick부터 덮어쓴다.
+        """
+        if capacity <= 0:
+            raise RuntimeError("capacity는 1 이상이어야 합니다.")
+
+        self.capacity: int = capacity
+        self._size: int = 0     # 현재 할당된 ring의 크기 (capacity까지 늘어난다.)
+        self._next: int = 0     # 다음 tick을 기록할 위치 (0 ~ _size - 1)
+        self._count: int = 0    # 보관 중인 tick 수
+        self.total: int = 0     # 지금까지 추가된 전체 tick 수
+        self._allocate(min(capacity, INITIAL_TICK_ALLOCATION))
+
+    def _allocate(self, size: int) -> None:
+        """
+        ring의 크기를 size로 바꿔서 배열을 새로 할당하고, 보관 중인 tick을 옮긴다.
+        """
+        old = self.window() if self._count > 0 else None
+
+        self._timestamp = np.zeros(size * 2, dtype="datetime64[ns]")
+        self._timestamp_ns = self._timestamp.view(np.int64)
+        self._price = np.zeros(size * 2, dtype=np.float64)
+        self._volume = np.zeros(size * 2, dtype=np.float64)
+        self._bid = np.full(size * 2, np.nan, dtype=np.float64)
+        self._ask = np.full(size * 2, np.nan, dtype=np.float64)
+
+        if old is not None:
+            arrays = (self._timestamp, self._price, self._volume, self._bid, self._ask)
+            for array, values in zip(arrays, old):
+                array[:self._count] = values
+                array[size:size + self._count] = values
+        self._size = size
+        self._next = self._count % size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, price: float, volume: float = 0.0, *,
+               bid: float = np.nan, ask: float = np.nan,
+               timestamp: Timestamp = None) -> None:
+        """
+        tick을 추가한다.
+        timestamp: 체결 시각. datetime(timezone이 없는 경우 KST로 간주) 또는 unix time(초).
+                   지정하지 않은 경우 현재 시각을 사용한다. tick은 시간 순서대로 추가해야 한다.
+        """
+        ns = to_kst_ns(timestamp)
+        if self._count == self._size < self.capacity:
+            self._allocate(min(self._size * 2, self.capacity))
+
+        for i in (self._next, self._next + self._size):
+            self._timestamp_ns[i] = ns
+            self._price[i] = price
+            self._volume[i] = volume
+            self._bid[i] = bid
+            self._ask[i] = ask
+
+        self._next = (self._next + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        self.total += 1
+
+    def window(self, size: Optional[int] = None) -> TickWindow:
+        """
+        최근 size개 tick의 view를 반환한다. 오래된 tick부터 시간 순서로 정렬되어 있다.
+        size: tick 수. 지정하지 않은 경우 보관 중인 모든 tick
+        반환된 view는 이후 append에 의해 덮어써질 수 있으므로, 보관하려면 복사해야 한다.
+        """
+        size = self._count if size is None else min(max(size, 0), self._count)
+        end = self._next + self._size
+        part = slice(end - size, end)
+
+        arrays = [self._timestamp[part], self._price[part], self._volume[part],
+                  self._bid[part], self._ask[part]]
+        for array in arrays:
+            array.flags.writeable = False
+        return TickWindow(*arrays)
+
+    def since(self, timestamp: Timestamp) -> TickWindow:
+        """
+        timestamp 이후(포함) tick의 view를 반환한다.
+        """
+        window = self.window()
+        start = np.searchsorted(window.timestamp.view(np.int64), to_kst_ns(timestamp), side="left")
+        return TickWindow(*(array[start:] for array in window))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        보관 중인 모든 tick을 DataFrame으로 반환한다. (index: Date)
+        """
+        return self.window().to_dataframe()
+
+    def to_ohlcv(self, interval: str = "1min") -> pd.DataFrame:
+        """
+        보관 중인 tick을 interval 단위의 봉으로 집계하여 get_kr_ohlcv와 같은 형식의 DataFrame으로 반환한다.
+        """
+        return self.window().to_ohlcv(interval)
+
+
+class TickBuffer:
+    """
+    종목별 TickRingBuffer의 모음. 처음 추가되는 종목의 ring buffer는 자동으로 생성된다.
+
+    ex>
+        ticks = TickBuffer(capacity=10000)
+        ticks.append("005930", api.get_kr_current_price("005930"))
+        bars = ticks["005930"].to_ohlcv("1min")
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        """
+        capacity: 종목별로 보관할 최대 tick 수. 종목당 최대 capacity × 80 byte를 사용한다. (TickRingBuffer 참고)
+        """
+        self.capacity: int = capacity
+        self._buffers: Dict[str, TickRingBuffer] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, ticker: str) -> TickRingBuffer:
+        buffer = self._buffers.get(ticker)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.setdefault(ticker, TickRingBuffer(self.capacity))
+        return buffer
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._buffers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._buffers))
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def append(self, ticker: str, price: float,  # pylint: disable=too-many-arguments
+               volume: float = 0.0, *, bid: float = np.nan, ask: float = np.nan,
+               timestamp: Timestamp = None) -> None:
+        """
+        ticker의 ring buffer에 tick을 추가한다.
+        """
+        self[ticker].append(price, volume, bid=bid, ask=ask, timestamp=timestamp)
@@ -0,0 +1,195 @@
+"""
+발급받은 access token을 process 간에 공유하기 위한 저장소 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from .access_token import AccessToken
+from .domain_info import DomainInfo
+
+
+def get_token_key(appkey: str, domain: DomainInfo) -> str:
+    """
+    token 저장에 사용할 key를 반환한다.
+    appkey가 파일에 그대로 남지 않도록 appkey와 domain url의 hash 값을 사용한다.
+    """
+    return hashlib.sha256(f"{appkey}@{domain.base_url}".encode("utf-8")).hexdigest()
+
+
+class TokenStore:
+    """
+    access token 저장소의 기본 클래스.
+    다른 저장 방식(redis, etc)을 사용하려면 이 클래스를 상속하여 load, save, lock을 구현한다.
+    """
+
+    def load(self, key: str) -> Optional[AccessToken]:
+        """
+        key에 해당하는 token을 반환한다. 없는 경우 None을 반환한다.
+        """
+        raise NotImplementedError
+
+    def save(self, key: str, token: AccessToken) -> None:
+        """
+        key에 token을 저장한다.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:  # pylint: disable=unused-argument
+        """
+        token 발급 중에 다른 process가 동시에 발급하지 않도록 lock을 건다.
+        기본 구현은 아무것도 하지 않는다.
+        """
+        yield
+
+    @asynccontextmanager
+    async def lock_async(self, key: str) -> AsyncIterator[None]:
+        """
+        lock의 asyncio 버전.
+        lock은 다른 process를 기다리는 동안 thread를 block하므로, event loop를 멈추지 않도록 executor thread에서 걸고 해제한다.
+        """
+        loop = asyncio.get_running_loop()
+        manager = self.lock(key)
+        entered = loop.run_in_executor(None, manager.__enter__)
+        try:
+            await asyncio.shield(entered)
+        except asyncio.CancelledError:
+            # 기다리는 중에 취소되어도 executor thread는 lock을 걸게 되므로, 걸린 뒤에 해제한다.
+            def release(future: asyncio.Future) -> None:
+                if not future.cancelled() and future.exception() is None:
+                    manager.__exit__(None, None, None)
+
+            entered.add_done_callback(release)
+            raise
+
+        try:
+            yield
+        finally:
+            await loop.run_in_executor(None, manager.__exit__, None, None, None)
+
+
+class FileTokenStore(TokenStore):
+    """
+    파일에 access token을 저장하는 저장소.
+    파일 lock을 사용하므로 여러 process가 동시에 사용해도 token은 한번만 발급된다.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        path: token을 저장할 파일 경로. 기본값은 ~/.pykis/tokens.json
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".pykis", "tokens.json")
+        self.path: str = path
+        self.lock_path: str = f"{path}.lock"
+
+    def load(self, key: str) -> Optional[AccessToken]:
+        data = self._read()
+        if key not in data:
+            return None
+        return AccessToken.from_json(data[key])
+
+    def save(self, key: str, token: AccessToken) -> None:
+        data = self._read()
+        data[key] = token.to_json()
+        self._write(data)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        self._make_directory()
+        with open(self.lock_path, "a+b") as file:
+            _lock_file(file.fileno())
+            try:
+                yield
+            finally:
+                _unlock_file(file.fileno())
+
+    def _read(self) -> dict:
+        """
+        저장된 token 전체를 반환한다.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, data: dict) -> None:
+        """
+        token 전체를 파일에 저장한다. 저장 도중 다른 process가 깨진 파일을 읽지 않도록 임시 파일을 교체한다.
+        """
+        directory = self._make_directory()
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _make_directory(self) -> str:
+        """
+        token 파일이 위치할 폴더를 생성하고 경로를 반환한다.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        return directory
+
+
+if os.name == "nt":
+    import msvcrt  # pylint: disable=import-error
+
+    def _lock_file(fd: int) -> None:
+        """
+        파일에 배타적 lock을 건다. 다른 process가 lock을 가지고 있는 경우 대기한다.
+        """
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)  # pylint: disable=no-member
+                return
+            except OSError:
+                time.sleep(0.05)
+
+    def _unlock_file(fd: int) -> None:
+        """
+        파일의 lock을 해제한다.
+        """
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)  # pylint: disable=no-member
+else:
+    import fcntl
+
+    def _lock_file(fd: int) -> None:
+        """
+        파일에 배타적 lock을 건다. 다른 process가 lock을 가지고 있는 경우 대기한다.
+        """
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd: int) -> None:
+        """
+        파일의 lock을 해제한다.
+        """
+        fcntl.flock(fd, fcntl.LOCK_UN)
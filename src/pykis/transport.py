@@ -0,0 +1,167 @@
+"""
+pykis의 HTTP 전송 계층(Transport)을 담기 위한 모듈
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, Any, NamedTuple, Optional
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from . import json_decoder
+
+Json = Dict[str, Any]
+
+
+class RawResponse(NamedTuple):
+    """
+    HTTP 응답의 원본 데이터를 나타내는 클래스.
+    requests.Response가 아닌 응답(asyncio, etc)을 APIResponse로 변환할 때 사용한다.
+    """
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+    def json(self) -> Json:
+        """
+        응답 body를 json으로 해석하여 반환한다.
+        """
+        return json_decoder.loads(self.content)
+
+
+class Transport:
+    """
+    keep-alive 연결을 재사용하는 HTTP 전송 계층.
+    하나의 requests.Session을 소유하며, 동일 host에 대한 TCP/TLS 연결을 pool에 보관하여 재사용한다.
+    """
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.1, timeout: float = 30) -> None:
+        """
+        pool_size: host당 보관할 keep-alive 연결의 최대 개수
+        max_retries: 연결 실패 등 일시적인 오류에 대한 최대 재시도 횟수 (GET에만 적용)
+        backoff_factor: 재시도 간격 계수 (초)
+        timeout: request timeout (초)
+        """
+        self.timeout: float = timeout
+        self.session: requests.Session = requests.Session()
+
+        # 주문과 같은 POST 요청은 중복 실행될 수 있으므로 재시도하지 않는다.
+        retry = Retry(total=max_retries,
+                      backoff_factor=backoff_factor,
+                      status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset(["GET"]),
+                      raise_on_status=False)
+
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def mount(self, prefix: str, adapter: requests.adapters.BaseAdapter) -> None:
+        """
+        url prefix에 사용할 transport adapter를 등록한다.
+        """
+        self.session.mount(prefix, adapter)
+
+    def get(self, url: str, headers: Json, params: Json) -> requests.Response:
+        """
+        HTTP GET method로 request를 보내고 response를 반환한다.
+        """
+        return self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+
+    def post(self, url: str, headers: Json, params: Json) -> requests.Response:
+        """
+        HTTP POST method로 request를 보내고 response를 반환한다.
+        """
+        return self.session.post(url, headers=headers, data=json.dumps(params),
+                                 timeout=self.timeout)
+
+    def close(self) -> None:
+        """
+        pool에 보관 중인 연결들을 모두 닫는다.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncTransport:
+    """
+    asyncio 기반의 keep-alive HTTP 전송 계층. (aiohttp 필요)
+    하나의 event loop에서 다수의 request를 동시에 처리할 수 있다.
+    """
+
+    def __init__(self, pool_size: int = 100, timeout: float = 30) -> None:
+        """
+        pool_size: 동시에 유지할 연결의 최대 개수. 초과하는 request는 연결이 반환될 때까지 대기한다.
+        timeout: request timeout (초)
+        """
+        try:
+            import aiohttp  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            msg = "AsyncTransport를 사용하려면 aiohttp 설치가 필요합니다. (pip install aiohttp)"
+            raise RuntimeError(msg) from error
+
+        self._aiohttp = aiohttp
+        self.pool_size: int = pool_size
+        self.timeout: float = timeout
+        self.session: Optional[Any] = None
+
+    def _get_session(self) -> Any:
+        """
+        aiohttp session을 반환한다. session은 event loop 안에서 처음 사용될 때 생성한다.
+        """
+        if self.session is None or self.session.closed:
+            connector = self._aiohttp.TCPConnector(limit=self.pool_size)
+            timeout = self._aiohttp.ClientTimeout(total=self.timeout)
+            self.session = self._aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
+
+    async def get(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        HTTP GET method로 request를 보내고 response를 반환한다.
+        """
+        params = {key: str(value) for key, value in params.items()}
+        async with self._get_session().get(url, headers=headers, params=params) as resp:
+            return RawResponse(resp.status, dict(resp.headers), await resp.read())
+
+    async def post(self, url: str, headers: Json, params: Json) -> RawResponse:
+        """
+        HTTP POST method로 request를 보내고 response를 반환한다.
+        """
+        async with self._get_session().post(url, headers=headers,
+                                            data=json.dumps(params)) as resp:
+            return RawResponse(resp.status, dict(resp.headers), await resp.read())
+
+    async def close(self) -> None:
+        """
+        pool에 보관 중인 연결들을 모두 닫는다.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
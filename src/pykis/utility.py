@@ -16,10 +16,20 @@ pykis의 각종 유틸리티들을 모아둔 모듈
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Callable, Iterable, Optional, NamedTuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional, \
+    NamedTuple, Tuple, TypeVar, Union
 from collections import namedtuple
+from datetime import date, datetime, timedelta, time as time_of_day
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import warnings
 import pandas as pd
 from .request_utility import Json, APIResponse
+from . import metrics
+
+T = TypeVar("T")
+DateLike = Union[date, datetime, str]
+TimeLike = Union[time_of_day, datetime, str]
 
 
 def get_order_tr_id_from_market_code(market_code: str, is_buy: bool) -> str:
@@ -42,6 +52,26 @@ def get_order_tr_id_from_market_code(market_code: str, is_buy: bool) -> str:
     raise RuntimeError(f"invalid market code: {market_code}")
 
 
+def get_revise_cancel_tr_id_from_market_code(market_code: str) -> str:
+    """
+    거래소 코드를 입력 받아서 해외 주식 정정/취소 주문 tr_id를 반환한다
+    """
+    market_code = market_code.upper()
+    if market_code in ["NASD", "NAS", "NYSE", "AMEX", "AMS"]:
+        return "JTTT1004U"
+    if market_code in ["SEHK", "HKS"]:
+        return "TTTS1003U"
+    if market_code in ["SZAA", "SZS"]:  # 심천
+        return "TTTS0306U"
+    if market_code in ["SHAA", "SHS"]:  # 상해
+        return "TTTS0302U"
+    if market_code in ["TKSE", "TSE"]:
+        return "TTTS0309U"
+    if market_code in ["HASE", "VNSE", "HSX", "HNX"]:
+        return "TTTS0312U"
+    raise RuntimeError(f"invalid market code: {market_code}")
+
+
 def get_currency_code_from_market_code(market_code: str) -> str:
     """
     거래소 코드를 입력 받아서 거래통화코드를 반환한다
@@ -60,6 +90,21 @@ def get_currency_code_from_market_code(market_code: str) -> str:
     raise RuntimeError(f"invalid market code: {market_code}")
 
 
+def get_kr_period_code(time_unit: str) -> str:
+    """
+    국내 주식 시세 조회의 기간 분류 코드를 반환한다.
+    time_unit: 기간 분류 (d/day-일, w/week-주, m/month-월, y/year-년)
+    """
+    time_unit = time_unit.upper()
+    aliases = {
+        "DAYS": "D", "DAY": "D",
+        "WEEKS": "W", "WEEK": "W",
+        "MONTHS": "M", "MONTH": "M",
+        "YEARS": "Y", "YEAR": "Y",
+    }
+    return aliases.get(time_unit, time_unit)
+
+
 def get_continuous_query_code(is_kr: bool) -> str:
     """
     연속 querry 에 필요한 지역 관련 코드를 반환한다
@@ -67,35 +112,140 @@ def get_continuous_query_code(is_kr: bool) -> str:
     return "100" if is_kr else "200"
 
 
-def send_continuous_query(request_function: Callable[[Json, Json], APIResponse],
+class ContinuationCursor(NamedTuple):
+    """
+    연속 조회의 다음 page 위치 (CTX_AREA_FK, CTX_AREA_NK)
+    """
+    fk: str
+    nk: str
+
+    def to_params(self, is_kr: bool) -> Json:
+        """
+        다음 page 조회에 사용할 query 파라미터를 반환한다.
+        """
+        query_code = get_continuous_query_code(is_kr)
+        return {
+            f"CTX_AREA_FK{query_code}": self.fk,
+            f"CTX_AREA_NK{query_code}": self.nk,
+        }
+
+
+class QueryPage(NamedTuple):
+    """
+    연속 조회 결과의 한 page
+    """
+    data: pd.DataFrame                      # page의 조회 결과
+    number: int                             # page 번호 (0부터 시작)
+    cursor: Optional[ContinuationCursor]    # 다음 page 위치. 마지막 page인 경우 None
+
+    def has_next(self) -> bool:
+        """
+        다음 page가 존재하는지 여부를 반환한다.
+        """
+        return self.cursor is not None
+
+
+# send_continuous_query가 조회하는 최대 page 수
+MAX_CONTINUOUS_QUERY_PAGES = 100
+
+
+def get_continuation_cursor(res: APIResponse, is_kr: bool) -> Optional[ContinuationCursor]:
+    """
+    연속 조회 응답에서 다음 page 위치를 반환한다. 다음 page가 없는 경우 None을 반환한다.
+    """
+    if res.header.get("tr_cont") not in ["F", "M"]:
+        return None
+    query_code = get_continuous_query_code(is_kr)
+    return ContinuationCursor(res.body[f"ctx_area_fk{query_code}"],
+                              res.body[f"ctx_area_nk{query_code}"])
+
+
+def _continuous_query_args(cursor: Optional[ContinuationCursor], is_kr: bool) -> Json:
+    """
+    cursor 위치의 page를 조회하기 위한 request_function의 인자를 반환한다.
+    """
+    if cursor is None:
+        return {"extra_header": {}, "extra_param": {}}
+    # tr_cont - 공백 : 초기 조회, N : 다음 데이터 조회
+    return {"extra_header": {"tr_cont": "N"}, "extra_param": cursor.to_params(is_kr)}
+
+
+def iter_continuous_query(request_function: Callable[..., APIResponse],
+                          to_dataframe: Callable[[APIResponse], pd.DataFrame],
+                          is_kr: bool = True,
+                          cursor: Optional[ContinuationCursor] = None,
+                          max_pages: Optional[int] = None) -> Iterator[QueryPage]:
+    """
+    연속 query의 결과를 page 단위로 조회하면서 하나씩 반환하는 generator.
+    cursor: 조회를 시작할 위치. 이전 조회에서 받은 QueryPage.cursor를 지정하면 이어서 조회한다.
+    max_pages: 조회할 최대 page 수. 도중에 멈춘 경우 마지막 page의 cursor는 None이 아니다.
+    """
+    number = 0
+    while max_pages is None or number < max_pages:
+        res = request_function(**_continuous_query_args(cursor, is_kr))
+        metrics.count_page(res)
+        cursor = get_continuation_cursor(res, is_kr)
+        yield QueryPage(to_dataframe(res), number, cursor)
+        if cursor is None:
+            return
+        number += 1
+
+
+async def aiter_continuous_query(request_function: Callable[..., Awaitable[APIResponse]],
+                                 to_dataframe: Callable[[APIResponse], pd.DataFrame],
+                                 is_kr: bool = True,
+                                 cursor: Optional[ContinuationCursor] = None,
+                                 max_pages: Optional[int] = None) -> AsyncIterator[QueryPage]:
+    """
+    iter_continuous_query의 asyncio 버전.
+    request_function으로 coroutine 함수를 받는다.
+    """
+    number = 0
+    while max_pages is None or number < max_pages:
+        res = await request_function(**_continuous_query_args(cursor, is_kr))
+        metrics.count_page(res)
+        cursor = get_continuation_cursor(res, is_kr)
+        yield QueryPage(to_dataframe(res), number, cursor)
+        if cursor is None:
+            return
+        number += 1
+
+
+def _concat_pages(pages: List[QueryPage]) -> pd.DataFrame:
+    """
+    연속 조회한 page들을 하나의 DataFrame으로 합친다. 조회가 도중에 멈춘 경우 경고한다.
+    """
+    if pages and pages[-1].has_next():
+        warnings.warn(f"연속 조회 결과가 {len(pages)} page를 넘어 일부 결과만 반환합니다. "
+                      "전체 결과는 iter_로 시작하는 method로 조회해주세요.",
+                      RuntimeWarning, stacklevel=3)
+    return pd.concat([page.data for page in pages])
+
+
+def send_continuous_query(request_function: Callable[..., APIResponse],
                           to_dataframe:
                           Callable[[APIResponse], pd.DataFrame],
                           is_kr: bool = True) -> pd.DataFrame:
     """
     조회 결과가 100건 이상 존재하는 경우 연속하여 query 후 전체 결과를 DataFrame으로 통합하여 반환한다.
+    최대 MAX_CONTINUOUS_QUERY_PAGES page까지 조회하며, 결과가 더 있는 경우 RuntimeWarning을 발생시킨다.
     """
-    max_count = 100
-    outputs = []
-    # 초기값
-    extra_header = {}
-    extra_param = {}
-    for i in range(max_count):
-        if i > 0:
-            extra_header = {"tr_cont": "N"}    # 공백 : 초기 조회, N : 다음 데이터 조회
-        res = request_function(
-            extra_header=extra_header,
-            extra_param=extra_param
-        )
-        output = to_dataframe(res)
-        outputs.append(output)
-        response_tr_cont = res.header["tr_cont"]
-        no_more_data = response_tr_cont not in ["F", "M"]
-        if no_more_data:
-            break
-        query_code = get_continuous_query_code(is_kr)
-        extra_param[f"CTX_AREA_FK{query_code}"] = res.body[f"ctx_area_fk{query_code}"]
-        extra_param[f"CTX_AREA_NK{query_code}"] = res.body[f"ctx_area_nk{query_code}"]
-    return pd.concat(outputs)
+    pages = list(iter_continuous_query(request_function, to_dataframe, is_kr,
+                                       max_pages=MAX_CONTINUOUS_QUERY_PAGES))
+    return _concat_pages(pages)
+
+
+async def send_continuous_query_async(request_function: Callable[..., Awaitable[APIResponse]],
+                                      to_dataframe:
+                                      Callable[[APIResponse], pd.DataFrame],
+                                      is_kr: bool = True) -> pd.DataFrame:
+    """
+    send_continuous_query의 asyncio 버전.
+    request_function으로 coroutine 함수를 받는다.
+    """
+    pages = [page async for page in aiter_continuous_query(
+        request_function, to_dataframe, is_kr, max_pages=MAX_CONTINUOUS_QUERY_PAGES)]
+    return _concat_pages(pages)
 
 
 def merge_json(datas: Iterable[Json]) -> Json:
@@ -123,3 +273,119 @@ def none_to_empty_dict(data: Optional[Json]) -> Json:
     입력 값이 None인 경우에 빈 dictionary를 반환한다.
     """
     return data if data is not None else {}
+
+
+def map_concurrently(function: Callable[[T], Any], items: Iterable[T],
+                     max_workers: int = 8, return_exceptions: bool = False) -> List[Any]:
+    """
+    items의 각 원소에 대해 function을 최대 max_workers개의 thread에서 동시에 실행하고,
+    결과를 items와 같은 순서의 list로 반환한다.
+    return_exceptions가 True인 경우 예외를 던지지 않고 결과 list에 예외 객체를 담는다.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item: T) -> Any:
+        try:
+            return function(item)
+        except Exception as error:  # pylint: disable=broad-except
+            if return_exceptions:
+                return error
+            raise
+
+    if len(items) == 1 or max_workers <= 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+async def gather_concurrently(function: Callable[[T], Awaitable[Any]], items: Iterable[T],
+                              max_workers: int = 100,
+                              return_exceptions: bool = False) -> List[Any]:
+    """
+    map_concurrently의 asyncio 버전.
+    items의 각 원소에 대해 function을 최대 max_workers개씩 동시에 실행하고,
+    결과를 items와 같은 순서의 list로 반환한다.
+    """
+    semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+    async def call(item: T) -> Any:
+        async with semaphore:
+            return await function(item)
+
+    return await asyncio.gather(*[call(item) for item in items],
+                                return_exceptions=return_exceptions)
+
+
+def concat_dataframes(datas: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    DataFrame들을 순서대로 합친다. 비어있는 DataFrame은 제외하며, 모두 비어있는 경우 빈 DataFrame을 반환한다.
+    """
+    datas = [data for data in datas if not data.empty]
+    if not datas:
+        return pd.DataFrame()
+    return pd.concat(datas)
+
+
+def to_date(value: DateLike) -> date:
+    """
+    날짜를 date 객체로 변환한다.
+    value: date, datetime 또는 날짜 문자열 (ex> "20240102", "2024-01-02")
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def to_seconds(value: TimeLike) -> int:
+    """
+    시각을 자정부터의 초로 변환한다.
+    value: time, datetime 또는 시각 문자열 (ex> "093000", "09:30", "09:30:00")
+    """
+    if isinstance(value, (time_of_day, datetime)):
+        return value.hour * 3600 + value.minute * 60 + value.second
+
+    digits = value.replace(":", "")
+    if len(digits) == 4:
+        digits += "00"
+    if len(digits) != 6 or not digits.isdigit():
+        raise RuntimeError(f"시각 형식이 올바르지 않습니다: {value}")
+    return int(digits[:2]) * 3600 + int(digits[2:4]) * 60 + int(digits[4:])
+
+
+def split_date_range(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """
+    start ~ end(포함) 기간을 최대 days일 길이의 겹치지 않는 구간들로 나누어 시간 순서대로 반환한다.
+    """
+    windows = []
+    step = timedelta(days=days)
+    while start <= end:
+        window_end = min(start + step - timedelta(days=1), end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def resample_ohlcv(data: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    OHLCV DataFrame을 interval 단위의 봉으로 집계한다.
+    data: Date를 index로 하는 DataFrame (Open, High, Low, Close, Volume)
+          (종목코드, Date)를 index로 하는 경우 종목별로 집계한다.
+    interval: 봉 간격 (pandas offset 문자열. ex> "5min", "15min", "60min", "1D")
+    return: 각 봉의 시작 시각을 index로 하는 DataFrame. 거래가 없는 봉은 생략된다.
+    """
+    aggregation = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    if data.empty:
+        return data
+
+    if isinstance(data.index, pd.MultiIndex):
+        groups = [pd.Grouper(level=0), pd.Grouper(level="Date", freq=interval)]
+        result = data.groupby(groups).agg(aggregation)
+    else:
+        result = data.resample(interval).agg(aggregation)
+
+    return result.dropna(subset=["Open"]).astype(data.dtypes.to_dict())
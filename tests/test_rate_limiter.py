@@ -0,0 +1,123 @@
+"""
+RateLimiter, TokenBucket(GCRA) 동작 확인
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from pykis import DomainInfo, RateLimiter
+from pykis import rate_limiter as rate_limiter_module
+from pykis.rate_limiter import TokenBucket
+from pykis.request_utility import APIRequestParameter
+
+QUOTE = APIRequestParameter("/uapi/domestic-stock/v1/quotations/inquire-price",
+                            "FHKST01010100", {})
+ACCOUNT = APIRequestParameter("/uapi/domestic-stock/v1/trading/inquire-balance",
+                              "TTTC8434R", {})
+ORDER = APIRequestParameter("/uapi/domestic-stock/v1/trading/order-cash", "TTTC0802U", {})
+TOKEN = APIRequestParameter("/oauth2/tokenP", None, {}, requires_authentication=False)
+HASHKEY = APIRequestParameter("/uapi/hashkey", None, {})
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    """
+    예약 시각을 정확히 비교할 수 있도록 RateLimiter가 보는 시각을 고정한다.
+    """
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: 1000.0)
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=10)
+    bucket.consume(bucket.earliest(100.0))
+    assert bucket.earliest(100.0) == pytest.approx(100.1)
+    bucket.consume(bucket.earliest(100.0))
+    assert bucket.earliest(100.0) == pytest.approx(100.2)
+
+    # 오래 쉬어도 token이 burst 이상 쌓이지 않는다.
+    assert bucket.earliest(200.0) == 200.0
+    bucket.consume(200.0)
+    assert bucket.earliest(200.0) == pytest.approx(200.1)
+
+
+def test_token_bucket_allows_burst():
+    bucket = TokenBucket(rate=10, burst=3)
+    times = []
+    for _ in range(5):
+        at = bucket.earliest(100.0)
+        bucket.consume(at)
+        times.append(at)
+    assert times == pytest.approx([100.0, 100.0, 100.0, 100.1, 100.2])
+
+
+def test_category():
+    assert RateLimiter.category(QUOTE) == "quote"
+    assert RateLimiter.category(ACCOUNT) == "account"
+    assert RateLimiter.category(ORDER) == "order"
+    assert RateLimiter.category(TOKEN) == "token"
+    assert RateLimiter.category(HASHKEY) == "hashkey"
+    assert RateLimiter.category(APIRequestParameter("/oauth2/Approval", None, {})) == "account"
+
+
+def test_reserve_schedules_requests_in_order():
+    limiter = RateLimiter(rates={"total": 10, "quote": 10})
+    delays = [limiter.reserve(QUOTE) for _ in range(4)]
+    assert delays == pytest.approx([0.0, 0.1, 0.2, 0.3])
+
+
+def test_total_rate_is_shared_across_categories():
+    limiter = RateLimiter(rates={"total": 10, "quote": 100, "account": 100})
+    delays = [limiter.reserve(req) for req in (QUOTE, ACCOUNT, QUOTE, ACCOUNT)]
+    assert delays == pytest.approx([0.0, 0.1, 0.2, 0.3])
+
+
+def test_category_rate_applies_below_total():
+    limiter = RateLimiter(rates={"total": 100, "quote": None, "order": 5})
+    # 주문 제한은 시세 조회에 적용되지 않는다.
+    assert [limiter.reserve(QUOTE) for _ in range(3)] == \
+        pytest.approx([0.0, 0.01, 0.02])
+    assert [limiter.reserve(ORDER) for _ in range(3)] == \
+        pytest.approx([0.03, 0.23, 0.43])
+
+
+def test_token_is_not_limited_by_total():
+    limiter = RateLimiter(rates={"total": 1})
+    limiter.reserve(QUOTE)
+    assert limiter.reserve(TOKEN) == 0.0
+    assert limiter.reserve(TOKEN) == pytest.approx(60.0)
+
+
+def test_virtual_domain_defaults():
+    limiter = RateLimiter(DomainInfo(kind="virtual"))
+    assert limiter.rate_of(QUOTE) == pytest.approx(2)
+    assert RateLimiter().rate_of(QUOTE) == pytest.approx(20)
+
+
+def test_try_acquire_does_not_reserve_when_busy():
+    limiter = RateLimiter(rates={"total": 10, "quote": 10})
+    assert limiter.try_acquire(QUOTE)
+    assert not limiter.try_acquire(QUOTE)
+    # 실패한 try_acquire는 예약을 남기지 않는다.
+    assert limiter.reserve(QUOTE) == pytest.approx(0.1)
+
+
+def test_unlimited():
+    limiter = RateLimiter.unlimited()
+    assert all(limiter.reserve(req) == 0.0 for req in [QUOTE, ORDER, TOKEN] * 10)
+    assert limiter.rate_of(QUOTE) is None
+    assert limiter.try_acquire(ORDER)
@@ -0,0 +1,329 @@
+"""
+RealtimeClient 동작 확인. localhost WebSocket stand-in 서버를 사용한다. (websockets 필요)
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+import pytest
+
+from pykis.realtime import RealtimeClient, KrTrade, KrOrderBook, SubscriptionError, \
+    parse_frame, TRADE_TR_ID, ORDER_BOOK_TR_ID
+
+websockets = pytest.importorskip("websockets")
+
+TIMEOUT = 10
+
+
+def trade_fields(ticker: str, price: int):
+    """
+    H0STCNT0 형식의 field 46개
+    """
+    fields = ["0"] * 46
+    fields[0], fields[1], fields[2] = ticker, "093000", str(price)
+    fields[4], fields[5] = "-100", "-0.14"
+    fields[7], fields[8], fields[9] = "70000", "71500", "69500"
+    fields[10], fields[11], fields[12] = str(price + 100), str(price), "10"
+    fields[13], fields[14], fields[21], fields[33] = "1000", "71000000", "1", "20240102"
+    return fields
+
+
+def order_book_fields(ticker: str):
+    """
+    H0STASP0 형식의 field 59개
+    """
+    fields = ["0"] * 59
+    fields[0], fields[1] = ticker, "093000"
+    fields[3:13] = [str(71000 + 100 * i) for i in range(10)]
+    fields[13:23] = [str(70900 - 100 * i) for i in range(10)]
+    fields[23:33] = [str(10 + i) for i in range(10)]
+    fields[33:43] = [str(20 + i) for i in range(10)]
+    fields[43], fields[44], fields[47], fields[48], fields[53] = "145", "245", "71000", "7", "999"
+    return fields
+
+
+def frame(tr_id: str, *records) -> str:
+    data = "^".join(field for fields in records for field in fields)
+    return f"0|{tr_id}|{len(records):03d}|{data}"
+
+
+class StandIn:
+    """
+    KIS 실시간 시세 서버를 흉내내는 WebSocket 서버.
+    연결마다 받은 등록 message를 기록하고, handler로 연결별 동작을 정한다.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.connections = []    # 연결별로 받은 등록 message 목록
+        self.server = None
+
+    async def _serve(self, connection, *_):
+        received = []
+        self.connections.append(received)
+        await self.handler(self, connection, received)
+
+    async def __aenter__(self):
+        self.server = await websockets.serve(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *args):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+
+async def receive_subscription(connection, received):
+    message = json.loads(await connection.recv())
+    received.append(message)
+    return message
+
+
+async def next_record(client):
+    return await client.__anext__()  # pylint: disable=unnecessary-dunder-call
+
+
+def run(coroutine):
+    asyncio.run(asyncio.wait_for(coroutine, TIMEOUT))
+
+
+def test_parse_frame():
+    records = parse_frame(frame(TRADE_TR_ID, trade_fields("005930", 71000),
+                                trade_fields("000660", 150000)))
+    assert [record.ticker for record in records] == ["005930", "000660"]
+    assert records[0].price == 71000 and records[0].side == "매수"
+    assert records[1].ask == 150100
+
+    book, = parse_frame(frame(ORDER_BOOK_TR_ID, order_book_fields("005930")))
+    assert book.ask_prices[0] == 71000 and book.bid_prices[-1] == 70000
+    assert book.total_bid_volume == 245 and book.accumulated_volume == 999
+
+    assert parse_frame("0|H0STCNI0|001|encrypted") == []
+    with pytest.raises(IndexError):
+        parse_frame(f"0|{TRADE_TR_ID}|001|005930^abc")
+    with pytest.raises(ValueError):
+        parse_frame(f"0|{TRADE_TR_ID}|001|" + "^".join(["x"] * 46))
+
+
+def test_frames_are_delivered_in_order():
+    async def handler(_, connection, received):
+        await receive_subscription(connection, received)
+        await receive_subscription(connection, received)
+        await connection.send(frame(TRADE_TR_ID, trade_fields("005930", 71000)))
+        await connection.send("0|H0STCNT0|001|broken^frame")      # 무시된다.
+        await connection.send("not json")                         # 무시된다.
+        await connection.send(frame(ORDER_BOOK_TR_ID, order_book_fields("005930")))
+        await connection.wait_closed()
+
+    async def main():
+        async with StandIn(handler) as server:
+            async with RealtimeClient(approval_key="key", url=server.url) as client:
+                await client.subscribe_trades("005930")
+                await client.subscribe_order_book("005930")
+                records = [await next_record(client) for _ in range(2)]
+
+        assert isinstance(records[0], KrTrade) and records[0].price == 71000
+        assert isinstance(records[1], KrOrderBook) and records[1].ask_volumes[0] == 10
+        subscriptions = [(message["body"]["input"]["tr_id"], message["header"]["tr_type"])
+                         for message in server.connections[0]]
+        assert subscriptions == [(TRADE_TR_ID, "1"), (ORDER_BOOK_TR_ID, "1")]
+
+    run(main())
+
+
+def test_resubscribe_after_reconnect():
+    async def handler(server, connection, received):
+        await receive_subscription(connection, received)
+        if len(server.connections) == 1:
+            await connection.close()     # 첫번째 연결은 등록 직후 끊는다.
+            return
+        await connection.send(frame(TRADE_TR_ID, trade_fields("005930", 72000)))
+        await connection.wait_closed()
+
+    async def main():
+        async with StandIn(handler) as server:
+            async with RealtimeClient(approval_key="key", url=server.url,
+                                      reconnect_delay=0.01) as client:
+                await client.subscribe_trades("005930")
+                record = await next_record(client)
+
+        assert record.price == 72000
+        assert len(server.connections) == 2
+        for received in server.connections:
+            assert received[0]["body"]["input"] == {"tr_id": TRADE_TR_ID, "tr_key": "005930"}
+            assert received[0]["header"]["approval_key"] == "key"
+
+    run(main())
+
+
+def test_backpressure_keeps_every_record():
+    count = 50
+
+    async def handler(_, connection, received):
+        await receive_subscription(connection, received)
+        for price in range(count):
+            await connection.send(frame(TRADE_TR_ID, trade_fields("005930", price)))
+        await connection.wait_closed()
+
+    async def main():
+        async with StandIn(handler) as server:
+            async with RealtimeClient(approval_key="key", url=server.url,
+                                      queue_size=5) as client:
+                await client.subscribe_trades("005930")
+                await asyncio.sleep(0.3)     # 소비하지 않는 동안 queue는 queue_size를 넘지 않는다.
+                assert client._get_queue().qsize() == 5  # pylint: disable=protected-access
+
+                prices = []
+                async for record in client:
+                    prices.append(record.price)
+                    if len(prices) == count:
+                        break
+
+        assert prices == list(range(count))
+
+    run(main())
+
+
+def test_callback_error_does_not_stop_delivery():
+    async def handler(_, connection, received):
+        await receive_subscription(connection, received)
+        for price in (1, 2, 3):
+            await connection.send(frame(TRADE_TR_ID, trade_fields("005930", price)))
+        await connection.wait_closed()
+
+    async def main():
+        prices = []
+        done = asyncio.Event()
+
+        def on_message(record):
+            prices.append(record.price)
+            if record.price == 3:
+                done.set()
+            if record.price == 1:
+                raise ValueError("callback error")
+
+        async with StandIn(handler) as server:
+            async with RealtimeClient(approval_key="key", url=server.url,
+                                      on_message=on_message) as client:
+                await client.subscribe_trades("005930")
+                await done.wait()
+
+        assert prices == [1, 2, 3]
+
+    run(main())
+
+
+def test_subscription_error_is_delivered():
+    async def handler(_, connection, received):
+        message = await receive_subscription(connection, received)
+        await connection.send(json.dumps({
+            "header": {"tr_id": TRADE_TR_ID, "tr_key": message["body"]["input"]["tr_key"]},
+            "body": {"rt_cd": "1", "msg1": "invalid tr_key"},
+        }))
+        await connection.wait_closed()
+
+    async def main():
+        async with StandIn(handler) as server:
+            async with RealtimeClient(approval_key="key", url=server.url) as client:
+                await client.subscribe_trades("999999")
+                record = await next_record(client)
+                assert record == SubscriptionError(TRADE_TR_ID, "999999", "invalid tr_key")
+                assert not client.subscriptions
+
+    run(main())
+
+
+class FailingApi:  # pylint: disable=too-few-public-methods
+    """
+    접속키 발급에 실패하는 api
+    """
+    domain = None
+
+    def get_approval_key(self):
+        raise RuntimeError("approval key error")
+
+
+class CountingApi:  # pylint: disable=too-few-public-methods
+    """
+    발급할 때마다 다른 접속키를 반환하는 api
+    """
+    domain = None
+
+    def __init__(self):
+        self.issued = 0
+
+    async def get_approval_key(self):
+        self.issued += 1
+        return f"key-{self.issued}"
+
+
+def test_fatal_error_ends_iteration():
+    async def main():
+        client = RealtimeClient(FailingApi(), url="ws://127.0.0.1:9")
+        async with client:
+            with pytest.raises(RuntimeError, match="approval key error"):
+                async for _ in client:
+                    pass
+        assert isinstance(client.error, RuntimeError)
+
+    run(main())
+
+
+def test_approval_key_is_refreshed_on_reconnect():
+    async def handler(server, connection, received):
+        await receive_subscription(connection, received)
+        if len(server.connections) < 3:
+            await connection.close()     # 접속키가 거부된 것처럼 데이터 없이 끊는다.
+            return
+        await connection.send(frame(TRADE_TR_ID, trade_fields("005930", 71000)))
+        await connection.wait_closed()
+
+    async def main():
+        api = CountingApi()
+        async with StandIn(handler) as server:
+            async with RealtimeClient(api, url=server.url, reconnect_delay=0.01) as client:
+                await client.subscribe_trades("005930")
+                await next_record(client)
+
+        keys = [received[0]["header"]["approval_key"] for received in server.connections]
+        assert keys == ["key-1", "key-2", "key-3"]
+
+    run(main())
+
+
+def test_max_reconnects_ends_iteration():
+    async def handler(_, connection, received):
+        await receive_subscription(connection, received)
+        await connection.close()
+
+    async def main():
+        async with StandIn(handler) as server:
+            client = RealtimeClient(approval_key="key", url=server.url,
+                                    reconnect_delay=0.01, max_reconnects=2)
+            async with client:
+                await client.subscribe_trades("005930")
+                with pytest.raises(RuntimeError):
+                    async for _ in client:
+                        pass
+        assert len(server.connections) == 3
+
+    run(main())
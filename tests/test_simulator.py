@@ -0,0 +1,192 @@
+"""
+SimulatedExchange 호가창 체결 확인. Api + SimulatorTransport로 주문을 보낸다.
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from pykis import Api, RateLimiter, SimulatedExchange, SimulatorTransport
+
+TICKER = "005930"
+ACCOUNT = "12345678-01"
+CASH = 10_000_000
+
+
+def create():
+    """
+    기준가 70000원 종목 하나와 예수금 CASH원인 계좌 하나를 가진 가상 거래소와 Api를 만든다.
+    """
+    exchange = SimulatedExchange(initial_cash=CASH)
+    exchange.add_ticker(TICKER, 70000)
+    api = Api({"appkey": "appkey", "appsecret": "appsecret"},
+              account_info={"account_code": "12345678", "product_code": "01"},
+              hash_mode="skip", transport=SimulatorTransport(exchange),
+              rate_limiter=RateLimiter.unlimited())
+    return exchange, api
+
+
+def add_seller(exchange, account_code, amount):
+    exchange.add_account(account_code, holdings={TICKER: amount})
+    return f"{account_code}-01"
+
+
+def test_price_time_priority():
+    exchange, api = create()
+    first = add_seller(exchange, "11111111", 5)
+    second = add_seller(exchange, "22222222", 10)
+    cheapest = add_seller(exchange, "33333333", 5)
+    exchange.submit_order(first, TICKER, False, 5, 70100)
+    exchange.submit_order(second, TICKER, False, 10, 70100)
+    exchange.submit_order(cheapest, TICKER, False, 5, 70000)
+
+    api.buy_kr_stock(TICKER, 15, 70100)
+
+    # 낮은 가격이 먼저, 같은 가격에서는 먼저 들어온 주문이 먼저 체결된다.
+    assert exchange.accounts[cheapest].positions[TICKER].amount == 0
+    assert exchange.accounts[first].positions[TICKER].amount == 0
+    assert exchange.accounts[second].positions[TICKER].amount == 5
+    assert exchange.accounts[second].cash == CASH + 5 * 70100
+
+    # 체결 가격은 먼저 호가창에 있던 주문의 가격이다.
+    buyer = exchange.accounts[ACCOUNT]
+    assert buyer.cash == CASH - (5 * 70000 + 10 * 70100)
+    assert buyer.positions[TICKER].amount == 15
+    assert buyer.reserved_cash == 0
+    assert exchange.order_book(TICKER).depth() == ([], [(70100, 5)])
+
+
+def test_partial_fill_rests_remainder():
+    exchange, api = create()
+    seller = add_seller(exchange, "11111111", 4)
+    exchange.submit_order(seller, TICKER, False, 4, 70000)
+
+    api.buy_kr_stock(TICKER, 10, 70000)
+
+    orders = api.get_kr_orders()
+    assert len(orders) == 1
+    assert orders.iloc[0]["주문수량"] == 10 and orders.iloc[0]["정정취소가능수량"] == 6
+    assert api.get_kr_stock_balance().loc[TICKER, "보유수량"] == 4
+
+    buyer = exchange.accounts[ACCOUNT]
+    assert buyer.cash == CASH - 4 * 70000
+    assert buyer.reserved_cash == 6 * 70000
+    assert exchange.order_book(TICKER).depth() == ([(70000, 6)], [])
+
+
+def test_market_order_remainder_is_cancelled():
+    exchange, api = create()
+    seller = add_seller(exchange, "11111111", 4)
+    exchange.submit_order(seller, TICKER, False, 4, 70500)
+
+    api.buy_kr_stock(TICKER, 10, 0)
+
+    assert api.get_kr_orders().empty
+    buyer = exchange.accounts[ACCOUNT]
+    assert buyer.positions[TICKER].amount == 4
+    assert buyer.cash == CASH - 4 * 70500
+    assert buyer.reserved_cash == 0      # 상한가로 묶어둔 금액도 모두 풀린다.
+    assert exchange.order_book(TICKER).depth() == ([], [])
+
+
+def test_revise_loses_queue_position():
+    exchange, api = create()
+    other = "22222222-01"
+    order_number = api.buy_kr_stock(TICKER, 5, 69900)["ODNO"]
+    exchange.submit_order(other, TICKER, True, 5, 69900)
+
+    # 같은 가격으로 정정해도 새 주문이 되어 뒤로 밀린다.
+    revised_number = api.revise_kr_order(order_number, 69900)["output"]["ODNO"]
+    orders = api.get_kr_orders()
+    assert list(orders.index) == [revised_number]
+    assert orders.loc[revised_number, "원번호"] == order_number
+
+    seller = add_seller(exchange, "33333333", 5)
+    exchange.submit_order(seller, TICKER, False, 5, 0)
+
+    assert exchange.accounts[other].positions[TICKER].amount == 5
+    assert TICKER not in exchange.accounts[ACCOUNT].positions
+    assert exchange.order_book(TICKER).depth() == ([(69900, 5)], [])
+
+
+def test_revise_to_crossing_price_fills():
+    exchange, api = create()
+    seller = add_seller(exchange, "11111111", 3)
+    exchange.submit_order(seller, TICKER, False, 3, 70100)
+    order_number = api.buy_kr_stock(TICKER, 5, 69900)["ODNO"]
+
+    api.revise_kr_order(order_number, 70100)
+
+    buyer = exchange.accounts[ACCOUNT]
+    assert buyer.positions[TICKER].amount == 3
+    assert buyer.reserved_cash == 2 * 70100
+    assert exchange.order_book(TICKER).depth() == ([(70100, 2)], [])
+
+
+def test_cancel_releases_reserved_cash():
+    exchange, api = create()
+    order_number = api.buy_kr_stock(TICKER, 10, 69900)["ODNO"]
+    buyer = exchange.accounts[ACCOUNT]
+    assert buyer.orderable_cash() == CASH - 10 * 69900
+
+    api.cancel_kr_order(order_number, 4)
+    assert buyer.reserved_cash == 6 * 69900
+    assert api.get_kr_orders().loc[order_number, "정정취소가능수량"] == 6
+
+    api.cancel_kr_order(order_number)
+    assert buyer.reserved_cash == 0 and buyer.cash == CASH
+    assert api.get_kr_orders().empty
+    assert exchange.order_book(TICKER).depth() == ([], [])
+
+
+def test_sell_reserves_and_releases_amount():
+    exchange, api = create()
+    exchange.add_account("12345678", holdings={TICKER: 5})
+    seller = exchange.accounts[ACCOUNT]
+
+    order_number = api.sell_kr_stock(TICKER, 3, 70100)["ODNO"]
+    assert seller.orderable_amount(TICKER) == 2
+    with pytest.raises(RuntimeError, match="주문가능수량"):
+        api.sell_kr_stock(TICKER, 3, 70100)
+
+    api.cancel_kr_order(order_number, 1)
+    assert seller.orderable_amount(TICKER) == 3
+
+    buyer = "22222222-01"
+    exchange.submit_order(buyer, TICKER, True, 2, 70100)
+    position = seller.positions[TICKER]
+    assert position.amount == 3 and position.cost == 3 * 70000
+    assert seller.cash == CASH + 2 * 70100
+    assert seller.reserved_amounts[TICKER] == 0
+    assert api.get_kr_orders().empty
+
+
+def test_buy_beyond_orderable_cash_is_rejected():
+    exchange, api = create()
+    api.buy_kr_stock(TICKER, 100, 69900)
+    with pytest.raises(RuntimeError, match="주문가능금액"):
+        api.buy_kr_stock(TICKER, 100, 69900)
+    assert exchange.accounts[ACCOUNT].reserved_cash == 100 * 69900
+
+
+def test_setup_methods_reject_unknown_ticker():
+    exchange, _ = create()
+    with pytest.raises(RuntimeError, match="추가하지 않은 종목"):
+        exchange.add_account("11111111", holdings={"XXXXXX": 1})
+    assert "11111111-01" not in exchange.accounts
+    with pytest.raises(RuntimeError, match="추가하지 않은 종목"):
+        exchange.submit_order(ACCOUNT, "XXXXXX", True, 1)
@@ -0,0 +1,131 @@
+"""
+TickRingBuffer, TickBuffer 동작 확인
+"""
+
+# Copyright 2022 Jueon Park
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=missing-function-docstring
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from pykis import TickBuffer
+from pykis.tick_buffer import TickRingBuffer, INITIAL_TICK_ALLOCATION, to_kst_ns
+
+START = datetime(2024, 1, 2, 9, 0)
+
+
+def fill(buffer: TickRingBuffer, count: int, seconds: float = 1.0) -> None:
+    """
+    START부터 seconds초 간격으로 가격이 0, 1, 2, ...인 tick을 count개 추가한다.
+    """
+    base = START.replace(tzinfo=timezone.utc).timestamp() - 9 * 3600
+    for i in range(count):
+        buffer.append(float(i), 1.0, bid=i - 0.5, ask=i + 0.5, timestamp=base + i * seconds)
+
+
+def test_to_kst_ns():
+    naive = to_kst_ns(START)
+    assert naive == np.datetime64("2024-01-02T09:00").astype("datetime64[ns]").view(np.int64)
+    assert to_kst_ns(datetime(2024, 1, 2, 0, 0, tzinfo=timezone.utc)) == naive
+
+
+def test_window_before_wrap():
+    buffer = TickRingBuffer(capacity=10)
+    fill(buffer, 4)
+    assert len(buffer) == 4 and buffer.total == 4
+    assert list(buffer.window().price) == [0, 1, 2, 3]
+    assert list(buffer.window(2).price) == [2, 3]
+    assert list(buffer.window(100).price) == [0, 1, 2, 3]
+    assert len(buffer.window(0)) == 0
+
+
+@pytest.mark.parametrize("capacity", [1, 7, INITIAL_TICK_ALLOCATION, 3000])
+def test_window_after_wrap_is_contiguous_and_ordered(capacity):
+    buffer = TickRingBuffer(capacity=capacity)
+    count = 2 * capacity + 5
+    fill(buffer, count)
+
+    assert len(buffer) == capacity and buffer.total == count
+    window = buffer.window()
+    assert list(window.price) == list(range(count - capacity, count))
+    assert list(window.bid) == [i - 0.5 for i in range(count - capacity, count)]
+    assert np.all(np.diff(window.timestamp.view(np.int64)) > 0)
+    assert list(buffer.window(3).price) == list(range(count - min(3, capacity), count))
+
+
+def test_grows_up_to_capacity():
+    capacity = 3 * INITIAL_TICK_ALLOCATION
+    for count in (INITIAL_TICK_ALLOCATION, INITIAL_TICK_ALLOCATION + 1,
+                  2 * INITIAL_TICK_ALLOCATION + 1, capacity + 1):
+        buffer = TickRingBuffer(capacity=capacity)
+        fill(buffer, count)
+        kept = min(count, capacity)
+        assert list(buffer.window().price) == list(range(count - kept, count))
+
+
+def test_window_is_read_only_view():
+    buffer = TickRingBuffer(capacity=5)
+    fill(buffer, 3)
+    window = buffer.window()
+    with pytest.raises(ValueError):
+        window.price[0] = 100.0
+
+
+def test_since():
+    buffer = TickRingBuffer(capacity=5)
+    fill(buffer, 8)
+    assert list(buffer.since(START.replace(second=5)).price) == [5, 6, 7]
+    assert list(buffer.since(START).price) == [3, 4, 5, 6, 7]
+    assert len(buffer.since(START.replace(minute=1))) == 0
+
+
+def test_to_ohlcv_after_wrap():
+    buffer = TickRingBuffer(capacity=150)
+    fill(buffer, 200)     # 09:00:00 ~ 09:03:19, 최근 150개는 09:00:50부터
+
+    bars = buffer.to_ohlcv("1min")
+    assert list(bars.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert [str(index) for index in bars.index] == [
+        "2024-01-02 09:00:00", "2024-01-02 09:01:00",
+        "2024-01-02 09:02:00", "2024-01-02 09:03:00"]
+    assert bars.iloc[0].tolist() == [50, 59, 50, 59, 10]
+    assert bars.iloc[1].tolist() == [60, 119, 60, 119, 60]
+    assert bars.iloc[3].tolist() == [180, 199, 180, 199, 20]
+
+
+def test_to_ohlcv_empty():
+    bars = TickRingBuffer(capacity=5).to_ohlcv()
+    assert bars.empty and list(bars.columns) == ["Open", "High", "Low", "Close", "Volume"]
+
+
+def test_invalid_capacity():
+    with pytest.raises(RuntimeError):
+        TickRingBuffer(capacity=0)
+
+
+def test_tick_buffer_creates_ring_per_ticker():
+    ticks = TickBuffer(capacity=3)
+    for price in range(5):
+        ticks.append("005930", price, timestamp=START)
+    ticks.append("000660", 100, timestamp=START)
+
+    assert sorted(ticks) == ["000660", "005930"] and len(ticks) == 2
+    assert "005930" in ticks and "035720" not in ticks
+    assert list(ticks["005930"].window().price) == [2, 3, 4]
+    assert ticks["005930"].total == 5
+    assert list(ticks["000660"].window().price) == [100]